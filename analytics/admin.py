@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import CourseDailyFact, RollupWatermark
+
+@admin.register(CourseDailyFact)
+class CourseDailyFactAdmin(admin.ModelAdmin):
+    list_display = ['course', 'date', 'new_enrollments', 'syllabus_completions', 'quiz_attempts', 'quiz_passes', 'submissions', 'average_progress']
+    list_filter = ['date']
+    search_fields = ['course__title']
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['source', 'last_id', 'last_timestamp', 'last_built_until']
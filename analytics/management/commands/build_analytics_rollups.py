@@ -0,0 +1,26 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.rollups import build_daily_facts
+
+
+class Command(BaseCommand):
+    help = "Roll enrollments, syllabus completions, quiz attempts and submissions into per-course daily facts (run nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--until', help="Roll up days before this date (YYYY-MM-DD); defaults to today.")
+
+    def handle(self, *args, **options):
+        cutoff = None
+        if options['until']:
+            try:
+                until = datetime.strptime(options['until'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("--until must be a date in YYYY-MM-DD format.")
+            cutoff = timezone.make_aware(datetime.combine(until, time.min))
+
+        added = build_daily_facts(cutoff=cutoff)
+        summary = ', '.join(f"{counter}: {count}" for counter, count in added.items())
+        self.stdout.write(self.style.SUCCESS(f"Built analytics rollups ({summary})."))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('course', '0014_course_syllabus_count_enrollment_completed_syllabi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('last_timestamp', models.DateTimeField(blank=True, null=True)),
+                ('last_built_until', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CourseDailyFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('new_enrollments', models.PositiveIntegerField(default=0)),
+                ('syllabus_completions', models.PositiveIntegerField(default=0)),
+                ('quiz_attempts', models.PositiveIntegerField(default=0)),
+                ('quiz_passes', models.PositiveIntegerField(default=0)),
+                ('submissions', models.PositiveIntegerField(default=0)),
+                ('total_enrollments', models.PositiveIntegerField(blank=True, null=True)),
+                ('completed_enrollments', models.PositiveIntegerField(blank=True, null=True)),
+                ('average_progress', models.FloatField(blank=True, null=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_facts', to='course.course')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('course', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import models
+from course.models import Course
+
+# Per-course, per-day fact table for admin reporting, built by analytics.rollups.build_daily_facts
+# (`manage.py build_analytics_rollups`). Daily counts are added incrementally from the watermarks
+# below; the enrollment snapshot columns are only known for days a build ran after, so they are nullable.
+class CourseDailyFact(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='daily_facts')
+    date = models.DateField()
+    new_enrollments = models.PositiveIntegerField(default=0)
+    syllabus_completions = models.PositiveIntegerField(default=0)
+    quiz_attempts = models.PositiveIntegerField(default=0)
+    quiz_passes = models.PositiveIntegerField(default=0)
+    submissions = models.PositiveIntegerField(default=0)
+    # Snapshot of the course's enrollments at the end of the day
+    total_enrollments = models.PositiveIntegerField(null=True, blank=True)
+    completed_enrollments = models.PositiveIntegerField(null=True, blank=True)
+    average_progress = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['course', 'date']
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.course_id} on {self.date}"
+
+    @property
+    def quiz_pass_rate(self):
+        return round(self.quiz_passes / self.quiz_attempts * 100, 2) if self.quiz_attempts else None
+
+# How far each source table has been rolled up: the last id for append-only tables, the last
+# timestamp for sources read by time (syllabus completions)
+class RollupWatermark(models.Model):
+    source = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    last_timestamp = models.DateTimeField(null=True, blank=True)
+    last_built_until = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.source} @ {self.last_id or self.last_timestamp}"
@@ -0,0 +1,142 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from assignment.models import AssignmentSubmission
+from course.models import Enrollment
+from progress.models import SyllabusProgress
+from quiz.models import QuizAttempt
+from .models import CourseDailyFact, RollupWatermark
+
+# Daily counters and the source rows they are counted from. Id-keyed sources are append-only, so each
+# build reads only rows past the watermark; only whole days (before the build cutoff) are ever counted.
+COUNTERS = ['new_enrollments', 'syllabus_completions', 'quiz_attempts', 'quiz_passes', 'submissions']
+
+
+def _enrollments(last_id, cutoff):
+    return (
+        Enrollment.objects.filter(id__gt=last_id, enrolled_at__lt=cutoff)
+        .annotate(day=TruncDate('enrolled_at')).values('course_id', 'day')
+        .annotate(new_enrollments=Count('id'), last_id=Max('id'))
+    )
+
+
+def _quiz_attempts(last_id, cutoff):
+    return (
+        QuizAttempt.objects.filter(id__gt=last_id, attempted_at__lt=cutoff, completed=True)
+        .annotate(course_id=Coalesce('quiz__course_id', 'quiz__batch__batch_specific_course_id'), day=TruncDate('attempted_at'))
+        .filter(course_id__isnull=False).values('course_id', 'day')
+        .annotate(
+            quiz_attempts=Count('id'),
+            quiz_passes=Count('id', filter=Q(score__gte=F('quiz__passing_marks'))),
+            last_id=Max('id'),
+        )
+    )
+
+
+def _submissions(last_id, cutoff):
+    return (
+        AssignmentSubmission.objects.filter(id__gt=last_id, submitted_at__lt=cutoff)
+        .annotate(course_id=F('assignment__course_id'), day=TruncDate('submitted_at')).values('course_id', 'day')
+        .annotate(submissions=Count('id'), last_id=Max('id'))
+    )
+
+
+ID_SOURCES = {
+    'enrollments': _enrollments,
+    'quiz_attempts': _quiz_attempts,
+    'submissions': _submissions,
+}
+
+
+def _syllabus_completions(since, cutoff):
+    # SyllabusProgress rows are updated in place, so they are read by completed_on rather than by id
+    completed = SyllabusProgress.objects.filter(is_completed=True, completed_on__lt=cutoff)
+    if since is not None:
+        completed = completed.filter(completed_on__gte=since)
+    return (
+        completed.annotate(course_id=F('syllabus__course_id'), day=TruncDate('completed_on'))
+        .values('course_id', 'day').annotate(syllabus_completions=Count('id'))
+    )
+
+
+def default_cutoff():
+    # Start of today: a nightly build rolls up every day that has ended
+    return timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+
+
+@transaction.atomic
+def build_daily_facts(cutoff=None):
+    """
+    Add every source row created since the last build (and before `cutoff`) to CourseDailyFact, and
+    snapshot each course's enrollments onto the day before `cutoff`. Re-running with the same cutoff
+    changes nothing. Returns {counter: rows added}.
+    """
+    cutoff = cutoff or default_cutoff()
+    watermarks = {
+        source: RollupWatermark.objects.select_for_update().get_or_create(source=source)[0]
+        for source in [*ID_SOURCES, 'syllabus_completions']
+    }
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    added = dict.fromkeys(COUNTERS, 0)
+    for source, rows in ID_SOURCES.items():
+        watermark = watermarks[source]
+        for row in rows(watermark.last_id, cutoff):
+            key = (row.pop('course_id'), row.pop('day'))
+            watermark.last_id = max(watermark.last_id, row.pop('last_id'))
+            for counter, value in row.items():
+                deltas[key][counter] += value
+                added[counter] += value
+
+    watermark = watermarks['syllabus_completions']
+    if watermark.last_timestamp is None or watermark.last_timestamp < cutoff:
+        for row in _syllabus_completions(watermark.last_timestamp, cutoff):
+            deltas[(row['course_id'], row['day'])]['syllabus_completions'] += row['syllabus_completions']
+            added['syllabus_completions'] += row['syllabus_completions']
+        watermark.last_timestamp = cutoff
+
+    # End-of-day enrollment snapshot for the last complete day
+    snapshot_day = timezone.localtime(cutoff).date() - timedelta(days=1)
+    snapshots = {
+        (row['course_id'], snapshot_day): row
+        for row in Enrollment.objects.filter(enrolled_at__lt=cutoff).values('course_id').annotate(
+            total=Count('id'), completed=Count('id', filter=Q(progress_percent__gte=100)), average=Avg('progress_percent'),
+        ).order_by()
+    }
+
+    keys = set(deltas) | set(snapshots)
+    facts = {
+        (fact.course_id, fact.date): fact
+        for fact in CourseDailyFact.objects.filter(
+            course_id__in={course_id for course_id, _ in keys}, date__in={day for _, day in keys}
+        )
+    }
+    to_create, to_update = [], []
+    for key in keys:
+        fact = facts.get(key)
+        if fact is None:
+            fact = CourseDailyFact(course_id=key[0], date=key[1])
+            to_create.append(fact)
+        else:
+            to_update.append(fact)
+        for counter, value in deltas.get(key, {}).items():
+            setattr(fact, counter, getattr(fact, counter) + value)
+        if key in snapshots:
+            snapshot = snapshots[key]
+            fact.total_enrollments = snapshot['total']
+            fact.completed_enrollments = snapshot['completed']
+            fact.average_progress = round(snapshot['average'] or 0, 2)
+
+    CourseDailyFact.objects.bulk_create(to_create, batch_size=500)
+    CourseDailyFact.objects.bulk_update(
+        to_update, COUNTERS + ['total_enrollments', 'completed_enrollments', 'average_progress'], batch_size=500
+    )
+    for watermark in watermarks.values():
+        watermark.last_built_until = cutoff
+        watermark.save()
+    return added
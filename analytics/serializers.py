@@ -0,0 +1,9 @@
+from rest_framework import serializers
+from .models import CourseDailyFact
+
+class CourseDailyFactSerializer(serializers.ModelSerializer):
+    quiz_pass_rate = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = CourseDailyFact
+        exclude = ['id']
@@ -0,0 +1,74 @@
+from datetime import datetime, time, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from content.models import Syllabus
+from course.models import Author, Category, Course, Enrollment
+from progress.models import SyllabusProgress
+from .models import CourseDailyFact, RollupWatermark
+from .rollups import build_daily_facts
+
+
+def start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class BuildDailyFactsTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name='Programming')
+        author = Author.objects.create(name='Ada')
+        self.course = Course.objects.create(category=category, author=author, title='Python', duration='10h')
+        self.syllabus = Syllabus.objects.create(course=self.course, title='Basics', order=1)
+        self.yesterday = timezone.localdate() - timedelta(days=1)
+        self.students = [
+            CustomUser.objects.create_user(email=f'student{i}@example.com', password='x', role='student', is_active=True)
+            for i in range(3)
+        ]
+
+    def enroll(self, student, day, progress_percent=0.0):
+        enrollment = Enrollment.objects.create(user=student, course=self.course, progress_percent=progress_percent)
+        Enrollment.objects.filter(pk=enrollment.pk).update(enrolled_at=start_of(day) + timedelta(hours=9))
+        return enrollment
+
+    def fact(self, day):
+        return CourseDailyFact.objects.get(course=self.course, date=day)
+
+    def test_counts_whole_days_before_the_cutoff(self):
+        self.enroll(self.students[0], self.yesterday, progress_percent=100.0)
+        self.enroll(self.students[1], self.yesterday)
+        self.enroll(self.students[2], timezone.localdate())
+        SyllabusProgress.objects.create(
+            student=self.students[0], syllabus=self.syllabus, is_completed=True,
+            completed_on=start_of(self.yesterday) + timedelta(hours=10),
+        )
+
+        added = build_daily_facts(cutoff=start_of(timezone.localdate()))
+        self.assertEqual((added['new_enrollments'], added['syllabus_completions']), (2, 1))
+        fact = self.fact(self.yesterday)
+        self.assertEqual((fact.new_enrollments, fact.syllabus_completions), (2, 1))
+        self.assertEqual((fact.total_enrollments, fact.completed_enrollments, fact.average_progress), (2, 1, 50.0))
+
+    def test_rerun_with_the_same_cutoff_changes_nothing(self):
+        self.enroll(self.students[0], self.yesterday)
+        cutoff = start_of(timezone.localdate())
+        build_daily_facts(cutoff=cutoff)
+        before = list(CourseDailyFact.objects.values())
+
+        self.assertEqual(set(build_daily_facts(cutoff=cutoff).values()), {0})
+        self.assertEqual(list(CourseDailyFact.objects.values()), before)
+
+    def test_later_builds_add_only_new_rows(self):
+        first = self.enroll(self.students[0], self.yesterday)
+        build_daily_facts(cutoff=start_of(timezone.localdate()))
+        self.assertEqual(RollupWatermark.objects.get(source='enrollments').last_id, first.id)
+
+        self.enroll(self.students[1], self.yesterday)    # Late row for an already built day
+        self.enroll(self.students[2], timezone.localdate())
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        added = build_daily_facts(cutoff=start_of(tomorrow))
+        self.assertEqual(added['new_enrollments'], 2)
+        self.assertEqual(self.fact(self.yesterday).new_enrollments, 2)
+        self.assertEqual(self.fact(timezone.localdate()).new_enrollments, 1)
+        self.assertEqual(self.fact(timezone.localdate()).total_enrollments, 3)
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import CourseDailyFactListView, CourseReportSummaryView
+
+app_name = "analytics"
+
+urlpatterns = [
+    path('courses/summary/', CourseReportSummaryView.as_view(), name='course-report-summary'),
+    path('courses/<int:course_id>/daily/', CourseDailyFactListView.as_view(), name='course-daily-facts'),
+]
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsAdmin
+from .models import CourseDailyFact
+from .serializers import CourseDailyFactSerializer
+
+# Admin reporting reads only the rollup tables (see analytics/rollups.py), never the source tables
+
+DEFAULT_DAYS = 30
+
+
+def get_date_range(request):
+    # ?since=YYYY-MM-DD&until=YYYY-MM-DD (inclusive); the last 30 days by default
+    try:
+        until = request.query_params.get('until')
+        since = request.query_params.get('since')
+        until = parse_date(until) if until else timezone.localdate()
+        since = parse_date(since) if since else (until and until - timedelta(days=DEFAULT_DAYS - 1))
+    except ValueError:
+        since = until = None
+    if since is None or until is None or since > until:
+        raise ValidationError({"error": "since / until must be dates (YYYY-MM-DD) with since <= until."})
+    return since, until
+
+
+# Daily facts of one course
+class CourseDailyFactListView(generics.ListAPIView):
+    serializer_class = CourseDailyFactSerializer
+    permission_classes = [IsAdmin]
+    keyset_ordering = ('date', 'id')
+
+    def get_queryset(self):
+        since, until = get_date_range(self.request)
+        return CourseDailyFact.objects.filter(course_id=self.kwargs['course_id'], date__range=(since, until))
+
+
+# Per-course totals over a date range, with the latest enrollment snapshot in it
+class CourseReportSummaryView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        since, until = get_date_range(request)
+        facts = CourseDailyFact.objects.filter(date__range=(since, until))
+        totals = (
+            facts.values('course_id', 'course__title')
+            .annotate(
+                new_enrollments=Sum('new_enrollments'),
+                syllabus_completions=Sum('syllabus_completions'),
+                quiz_attempts=Sum('quiz_attempts'),
+                quiz_passes=Sum('quiz_passes'),
+                submissions=Sum('submissions'),
+            )
+            .order_by('course_id')
+        )
+        snapshots = {}
+        for fact in facts.filter(total_enrollments__isnull=False).order_by('course_id', 'date').only(
+            'course_id', 'date', 'total_enrollments', 'completed_enrollments', 'average_progress'
+        ):
+            snapshots[fact.course_id] = fact     # Last one per course wins
+
+        courses = []
+        for row in totals:
+            snapshot = snapshots.get(row['course_id'])
+            courses.append({
+                "course_id": row['course_id'],
+                "title": row['course__title'],
+                "new_enrollments": row['new_enrollments'],
+                "syllabus_completions": row['syllabus_completions'],
+                "quiz_attempts": row['quiz_attempts'],
+                "quiz_pass_rate": round(row['quiz_passes'] / row['quiz_attempts'] * 100, 2) if row['quiz_attempts'] else None,
+                "submissions": row['submissions'],
+                "total_enrollments": snapshot.total_enrollments if snapshot else None,
+                "completed_enrollments": snapshot.completed_enrollments if snapshot else None,
+                "average_progress": snapshot.average_progress if snapshot else None,
+                "snapshot_date": snapshot.date if snapshot else None,
+            })
+        return Response({"since": since, "until": until, "courses": courses})
@@ -8,15 +8,17 @@ from .serializers import AnnouncementSerializer
 from .permissions import CanManageAnnouncements
 from course.models import Course
 from batch.models import Batch
+from lms.mixins import SparseFieldsetMixin
 
 # List Announcements
-class AnnouncementListView(generics.ListAPIView):
+class AnnouncementListView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = AnnouncementSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         user = self.request.user
-        qs = Announcement.objects.all().order_by("-created_at")
+        qs = Announcement.objects.select_related("sender", "batch", "course").order_by("-created_at")
 
         if user.is_superuser or user.role == "admin":
             return qs
@@ -1,5 +1,7 @@
 from django.contrib import admin
 from .models import Assignment, AssignmentSubmission
+from .serializers import SUBMISSION_EXPORT_FIELDS
+from lms.exports import export_admin_action
 
 @admin.register(Assignment)
 class AssignmentAdmin(admin.ModelAdmin):
@@ -13,3 +15,4 @@ class AssignmentSubmissionAdmin(admin.ModelAdmin):
     search_fields = ("assignment__title", "student__email")
     list_filter = ("submitted_at", "grade")
     readonly_fields = ("submitted_at",)
+    actions = [export_admin_action(SUBMISSION_EXPORT_FIELDS, "submissions")]
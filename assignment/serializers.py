@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Assignment, AssignmentSubmission
+from mediastore.serializers import UploadedFileField
 
 # 🔹 Assignment Serializer
 class AssignmentSerializer(serializers.ModelSerializer):
@@ -10,15 +11,31 @@ class AssignmentSerializer(serializers.ModelSerializer):
 
 # 🔹 Submission Serializer (used when student submits)
 class AssignmentSubmissionSerializer(serializers.ModelSerializer):
+    file = UploadedFileField(url_name="assignment-submission-file")    # A multipart file or the id of a completed resumable upload
+
     class Meta:
         model = AssignmentSubmission
-        fields = ["id", "assignment", "submitted_file", "submitted_text"]
+        fields = ["id", "assignment", "file"]
 
 # 🔹 Submission List Serializer (used for viewing submissions / grading)
 class AssignmentSubmissionListSerializer(serializers.ModelSerializer):
     student = serializers.StringRelatedField(read_only=True)
     assignment = serializers.StringRelatedField(read_only=True)
+    file = UploadedFileField(url_name="assignment-submission-file", read_only=True)
 
     class Meta:
         model = AssignmentSubmission
-        fields = ["id", "assignment", "student", "submitted_file", "submitted_text", "grade", "submitted_at"]
+        fields = ["id", "assignment", "student", "file", "grade", "submitted_at"]
+
+# 🔹 Column -> lookup projection for the streamed submission export (lms/exports.py)
+SUBMISSION_EXPORT_FIELDS = {
+    "id": "id",
+    "assignment_id": "assignment_id",
+    "assignment_title": "assignment__title",
+    "course_id": "assignment__course_id",
+    "student_id": "student_id",
+    "email": "student__email",
+    "file": "file",
+    "submitted_at": "submitted_at",
+    "grade": "grade",
+}
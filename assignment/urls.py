@@ -6,7 +6,9 @@ from .views import (
     AssignmentDeleteView,
     SubmitAssignmentView,
     MySubmissionsView,
+    SubmissionFileView,
     GradeAssignmentView,
+    AssignmentSubmissionExportView,
 )
 
 urlpatterns = [
@@ -19,7 +21,9 @@ urlpatterns = [
     # Student submissions
     path("assignments/submit/", SubmitAssignmentView.as_view(), name="assignment-submit"),
     path("assignments/my-submissions/", MySubmissionsView.as_view(), name="my-submissions"),
+    path("assignments/submissions/<int:pk>/file/", SubmissionFileView.as_view(), name="assignment-submission-file"),
 
     # Admin grading
     path("assignments/<int:pk>/grade/", GradeAssignmentView.as_view(), name="grade-assignment"),
+    path("assignments/submissions/export/", AssignmentSubmissionExportView.as_view(), name="assignment-submission-export"),
 ]
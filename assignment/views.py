@@ -1,5 +1,7 @@
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 
 from .models import Assignment, AssignmentSubmission
@@ -7,8 +9,11 @@ from .serializers import (
     AssignmentSerializer,
     AssignmentSubmissionSerializer,
     AssignmentSubmissionListSerializer,
+    SUBMISSION_EXPORT_FIELDS,
 )
 from course.models import Course, Enrollment
+from lms.exports import StreamingExportView
+from lms.media import serve_media
 
 
 # 🔹 Permission check for Admin only
@@ -66,8 +71,8 @@ class SubmitAssignmentView(generics.CreateAPIView):
         assignment = serializer.validated_data["assignment"]
 
         # check student is enrolled in course
-        if not Enrollment.objects.filter(student=user, course=assignment.course).exists():
-            raise PermissionError("You are not enrolled in this course")
+        if not Enrollment.objects.filter(user=user, course=assignment.course).exists():
+            raise PermissionDenied("You are not enrolled in this course")
 
         serializer.save(student=user)
 
@@ -80,6 +85,17 @@ class MySubmissionsView(generics.ListAPIView):
         return AssignmentSubmission.objects.filter(student=self.request.user)
 
 
+# Submitted file, for the student who submitted it and for admins grading it
+class SubmissionFileView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        submission = get_object_or_404(AssignmentSubmission.objects.only("id", "student_id", "file"), pk=pk)
+        if submission.student_id != request.user.id and request.user.role != "admin":
+            raise PermissionDenied("You cannot access this submission.")
+        return serve_media(request, submission.file)
+
+
 class GradeAssignmentView(generics.UpdateAPIView):
     queryset = AssignmentSubmission.objects.all()
     serializer_class = AssignmentSubmissionSerializer  # ✅ use correct serializer
@@ -99,3 +115,22 @@ class GradeAssignmentView(generics.UpdateAPIView):
             "assignment": submission.assignment.title,
             "grade": submission.grade
         })
+
+
+# ---------------- Submission Export ---------------- #
+
+# Streams submissions as CSV (or ?export=ndjson); ?assignment=<id> / ?course=<id> narrow it
+class AssignmentSubmissionExportView(StreamingExportView):
+    permission_classes = [IsAdmin]
+    export_filename = "assignment-submissions"
+    export_fields = SUBMISSION_EXPORT_FIELDS
+
+    def get_queryset(self):
+        queryset = AssignmentSubmission.objects.order_by("id")
+        assignment_id = self.request.query_params.get("assignment")
+        course_id = self.request.query_params.get("course")
+        if assignment_id:
+            queryset = queryset.filter(assignment_id=assignment_id)
+        if course_id:
+            queryset = queryset.filter(assignment__course_id=course_id)
+        return queryset
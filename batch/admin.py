@@ -2,6 +2,8 @@ from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
 from .models import Batch, BatchStudent, BatchStaff, ArchivedBatch, SuspendedBatchStudent
 from accounts.models import CustomUser
+from lms.exports import export_admin_action
+from .serializers import BATCH_ROSTER_EXPORT_FIELDS
 
 class BatchStaffInline(admin.TabularInline):
     model = BatchStaff
@@ -75,6 +77,7 @@ class ArchivedBatchAdmin(admin.ModelAdmin):
 @admin.register(BatchStudent)
 class BatchStudentAdmin(admin.ModelAdmin):
     list_display = ('id', 'batch', 'student')
+    actions = [export_admin_action(BATCH_ROSTER_EXPORT_FIELDS, 'batch-roster')]
 
     def get_queryset(self, request):
         # Show only non-suspended students
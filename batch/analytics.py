@@ -0,0 +1,117 @@
+from array import array
+
+from django.db.models import Subquery
+
+from content.models import Syllabus
+from progress.models import SyllabusProgress
+from .models import BatchStudent
+
+try:
+    import numpy as np
+except ImportError:     # Optional; the matrix falls back to a flat array.array
+    np = None
+
+# Student columns shared by the JSON, CSV and NDJSON outputs
+STUDENT_FIELDS = ['student_id', 'email', 'full_name', 'is_suspended', 'completed', 'progress_percent']
+
+
+class ProgressMatrix:
+    """
+    Students x syllabus completion grid of one batch: `cells[i, j]` is 1 when students[i] completed syllabi[j].
+    Backed by a uint8 NumPy array when NumPy is installed, else by a flat array('B').
+    """
+
+    def __init__(self, students, syllabi):
+        self.students = students    # [(student_id, email, full_name, is_suspended)]
+        self.syllabi = syllabi      # [(syllabus_id, title)]
+        self.shape = (len(students), len(syllabi))
+        if np is not None:
+            self.cells = np.zeros(self.shape, dtype=np.uint8)
+        else:
+            self.cells = array('B', bytes(self.shape[0] * self.shape[1]))
+
+    def mark(self, row, column):
+        if np is not None:
+            self.cells[row, column] = 1
+        else:
+            self.cells[row * self.shape[1] + column] = 1
+
+    def row(self, row):
+        if np is not None:
+            return self.cells[row].tolist()
+        width = self.shape[1]
+        return self.cells[row * width:(row + 1) * width].tolist()
+
+    def student_totals(self):
+        if np is not None:
+            return self.cells.sum(axis=1, dtype=np.int64).tolist()
+        return [sum(self.row(row)) for row in range(self.shape[0])]
+
+    def syllabus_totals(self):
+        if np is not None:
+            return self.cells.sum(axis=0, dtype=np.int64).tolist()
+        totals = [0] * self.shape[1]
+        for row in range(self.shape[0]):
+            for column, value in enumerate(self.row(row)):
+                totals[column] += value
+        return totals
+
+    def records(self):
+        # One dict per student, in student order
+        totals = self.student_totals()
+        for row, (student_id, email, full_name, is_suspended) in enumerate(self.students):
+            completed = totals[row]
+            yield {
+                'student_id': student_id,
+                'email': email,
+                'full_name': full_name,
+                'is_suspended': is_suspended,
+                'completed': completed,
+                'progress_percent': round(completed / self.shape[1] * 100, 2) if self.shape[1] else 0.0,
+                'cells': self.row(row),
+            }
+
+
+def build_progress_matrix(batch):
+    """
+    Completion matrix of `batch` in three queries (students, syllabi, completed syllabus progress).
+    """
+    batch_students = BatchStudent.objects.filter(batch=batch)
+    students = list(
+        batch_students.order_by('student_id')
+        .values_list('student_id', 'student__email', 'student__full_name', 'is_suspended')
+    )
+    syllabi = list(Syllabus.objects.filter(course_id=batch.batch_specific_course_id).order_by('order', 'id').values_list('id', 'title'))
+    matrix = ProgressMatrix(students, syllabi)
+
+    rows = {student[0]: position for position, student in enumerate(students)}
+    columns = {syllabus[0]: position for position, syllabus in enumerate(syllabi)}
+    completed = SyllabusProgress.objects.filter(
+        student_id__in=Subquery(batch_students.values('student_id')),
+        syllabus__course_id=batch.batch_specific_course_id,
+        is_completed=True,
+    ).values_list('student_id', 'syllabus_id')
+    for student_id, syllabus_id in completed.iterator():
+        if student_id in rows and syllabus_id in columns:
+            matrix.mark(rows[student_id], columns[syllabus_id])
+    return matrix
+
+
+def export_rows(matrix, export_format):
+    """
+    (header, rows) for lms.exports.streaming_export. CSV gets one 0/1 column per syllabus; NDJSON lines
+    stay self-contained by listing the ids of the completed syllabi instead.
+    """
+    if export_format == 'csv':
+        header = STUDENT_FIELDS + [title for _, title in matrix.syllabi]
+        rows = ([record[field] for field in STUDENT_FIELDS] + record['cells'] for record in matrix.records())
+        return header, rows
+
+    syllabus_ids = [syllabus_id for syllabus_id, _ in matrix.syllabi]
+    header = STUDENT_FIELDS + ['completed_syllabi']
+    rows = (
+        [record[field] for field in STUDENT_FIELDS]
+        + [[syllabus_id for syllabus_id, done in zip(syllabus_ids, record['cells']) if done]]
+        for record in matrix.records()
+    )
+    return header, rows
@@ -120,4 +120,16 @@ class BatchStaffSerializer(serializers.ModelSerializer):
 
         if BatchStaff.objects.filter(batch=batch, staff=staff).exists():
             raise serializers.ValidationError("This staff is already assigned to the batch.")
-        return data
\ No newline at end of file
+        return data
+
+# Column -> lookup projection for the streamed roster export (lms/exports.py)
+BATCH_ROSTER_EXPORT_FIELDS = {
+    'id': 'id',
+    'batch_id': 'batch_id',
+    'batch_code': 'batch__batch_code',
+    'batch_name': 'batch__batch_name',
+    'student_id': 'student_id',
+    'email': 'student__email',
+    'full_name': 'student__full_name',
+    'is_suspended': 'is_suspended',
+}
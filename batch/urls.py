@@ -7,7 +7,7 @@ from .views import (
     SuspendedBatchStudentListView,
     BatchStaffAssignView,
     SuspendStudentView, SuspendedStudentsInBatchView, BatchStaffListCreateView, BatchStaffDetailView,
-    ArchivedBatchListView, ActiveBatchListView,
+    ArchivedBatchListView, ActiveBatchListView, BatchProgressMatrixView,
 )
 
 urlpatterns = [
@@ -19,6 +19,7 @@ urlpatterns = [
     path('batch-suspended-students/', SuspendedBatchStudentListView.as_view(), name='suspended-students'),
     path('batch/<int:batch_id>/suspended-students/', SuspendedStudentsInBatchView.as_view(), name='suspended-students-in-batch'),
     path('batches/<int:batch_id>/assign-staff/', BatchStaffAssignView.as_view(), name='batch-assign-staff'),
+    path('batches/<int:batch_id>/progress-matrix/', BatchProgressMatrixView.as_view(), name='batch-progress-matrix'),
     path("batch-staff/", BatchStaffListCreateView.as_view(), name="batchstaff-list-create"),
     path("batch-staff/<int:pk>/", BatchStaffDetailView.as_view(), name="batchstaff-detail"),
     path('archived-batches/', ArchivedBatchListView.as_view(), name='archived-batch-list'),
@@ -1,5 +1,6 @@
 
 from django.db import models
+from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import generics, permissions
 from rest_framework.authentication import SessionAuthentication
@@ -7,10 +8,15 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.permissions import IsAdmin
+from lms.exports import EXPORT_FORMATS, StreamingExportMixin, streaming_export
+from lms.mixins import SparseFieldsetMixin
+from .analytics import build_progress_matrix, export_rows
 from .models import Batch, BatchStudent, BatchStaff
 from .permissions import IsAdminOrStaff
 from .serializers import BatchSerializer, BatchStudentSerializer, BatchStaffAssignSerializer, SuspendStudentSerializer, \
-    BatchStaffSerializer
+    BatchStaffSerializer, BATCH_ROSTER_EXPORT_FIELDS
 
 
 # List all batches and creating a new batch.
@@ -92,11 +98,15 @@ class BatchDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().destroy(request, *args, **kwargs)
 
 # List and create BatchStudent entries.
-class BatchStudentListCreateView(generics.ListCreateAPIView):
+class BatchStudentListCreateView(StreamingExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = BatchStudent.objects.select_related('batch', 'student')
     serializer_class = BatchStudentSerializer
     authentication_classes = [JWTAuthentication, SessionAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ('id',)
+    # ?export=csv|ndjson: the roster as a streamed download (see lms/exports.py)
+    export_filename = 'batch-roster'
+    export_fields = BATCH_ROSTER_EXPORT_FIELDS
 
 class BatchStudentDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = BatchStudent.objects.select_related('batch', 'student')
@@ -234,4 +244,33 @@ class ArchivedBatchListView(generics.ListAPIView):
         else:
             queryset = queryset.filter(batch_students__student=user)      # Students see only their enrolled batches
 
-        return queryset.distinct()
\ No newline at end of file
+        return queryset.distinct()
+
+
+# Students x syllabus completion matrix of a batch. ?export=csv or ?export=ndjson streams it as a download
+class BatchProgressMatrixView(APIView):
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAdminOrStaff | IsAdmin]
+
+    def get(self, request, batch_id):
+        batch = get_object_or_404(Batch, id=batch_id)
+        # Admins see every batch, staff only the batches they are assigned to
+        is_admin = request.user.is_superuser or request.user.role == "admin"
+        if not is_admin and not batch.batch_staff.filter(staff=request.user).exists():
+            raise PermissionDenied("You are not assigned to this batch.")
+
+        export = request.query_params.get('export')
+        if export and export not in EXPORT_FORMATS:
+            return Response({"error": f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}."}, status=400)
+
+        matrix = build_progress_matrix(batch)
+        if export:
+            header, rows = export_rows(matrix, export)
+            return streaming_export(header, rows, export, f'batch-{batch.batch_code}-progress')
+
+        return Response({
+            "batch": batch.id,
+            "syllabi": [{"id": syllabus_id, "title": title} for syllabus_id, title in matrix.syllabi],
+            "syllabus_completion": matrix.syllabus_totals(),
+            "students": list(matrix.records()),
+        })
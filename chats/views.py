@@ -6,12 +6,14 @@ from .models import ChatMessage
 from .serializers import ChatMessageSerializer
 from .permissions import IsBatchParticipant
 from batch.models import BatchStudent, BatchStaff
+from lms.mixins import SparseFieldsetMixin
 
 
 # List messages in a batch (only for participants)
-class ChatMessageListView(generics.ListAPIView):
+class ChatMessageListView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = ChatMessageSerializer
     permission_classes = [permissions.IsAuthenticated, IsBatchParticipant]
+    keyset_ordering = ('timestamp', 'id')
 
     def get_queryset(self):
         batch_id = self.kwargs["batch_id"]
@@ -20,7 +22,7 @@ class ChatMessageListView(generics.ListAPIView):
         # Check role of current user in the batch
         is_student = BatchStudent.objects.filter(batch_id=batch_id, student=user).exists()
         is_staff = BatchStaff.objects.filter(batch_id=batch_id, staff=user).exists()
-        qs = ChatMessage.objects.filter(batch_id=batch_id)
+        qs = ChatMessage.objects.filter(batch_id=batch_id).select_related("sender", "receiver")
 
         if is_student:
             # student ↔ staff only
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0003_module_livesession_module_syllabus_module_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syllabus',
+            name='video_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -48,6 +48,7 @@ class Syllabus(models.Model):
     title = models.CharField(max_length=255)        #name of the syllabus topic.
     order = models.PositiveIntegerField(help_text="Ordering of this topic in the course")       #display syllabus topics in proper sequence
     module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='syllabi', null=True, blank=True)
+    video_count = models.PositiveIntegerField(default=0)       #Denormalized number of videos, kept by progress.rollups
 
 
     def __str__(self):
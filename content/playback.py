@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Video
+
+# Cached, ordered playback sequence of a course's videos: syllabus order, then module order, then id.
+# Keys carry Course.content_version, which Video / Syllabus / Module changes bump (see content/signals.py),
+# so a changed course simply stops reading its old entry.
+PLAYBACK_INDEX_CACHE_TIMEOUT = 60 * 60
+
+
+class PlaybackIndex:
+    """
+    Video ids of one course in playback order, with a position map for O(1) neighbour lookups.
+    """
+
+    def __init__(self, video_ids):
+        self.video_ids = tuple(video_ids)
+        self.positions = {video_id: position for position, video_id in enumerate(self.video_ids)}
+
+    def __len__(self):
+        return len(self.video_ids)
+
+    def __contains__(self, video_id):
+        return video_id in self.positions
+
+    def first(self):
+        return self.video_ids[0] if self.video_ids else None
+
+    def previous(self, video_id):
+        position = self.positions.get(video_id)
+        return self.video_ids[position - 1] if position else None
+
+    def next(self, video_id):
+        position = self.positions.get(video_id)
+        if position is None or position + 1 >= len(self.video_ids):
+            return None
+        return self.video_ids[position + 1]
+
+    def first_unwatched(self, completed_ids):
+        # `completed_ids` is the learner's set of completed video ids
+        return next((video_id for video_id in self.video_ids if video_id not in completed_ids), None)
+
+
+def build_playback_index(course_id):
+    video_ids = Video.objects.filter(course_id=course_id).order_by(
+        F('syllabus__order').asc(nulls_last=True), F('module__order').asc(nulls_last=True), 'id'
+    ).values_list('id', flat=True)
+    return PlaybackIndex(video_ids)
+
+
+def get_playback_index(course):
+    key = f'playback_index:{course.pk}:{course.content_version}'
+    video_ids = cache.get(key)
+    if video_ids is None:
+        index = build_playback_index(course.pk)
+        cache.set(key, index.video_ids, PLAYBACK_INDEX_CACHE_TIMEOUT)
+        return index
+    return PlaybackIndex(video_ids)
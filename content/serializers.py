@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import LiveSession, Video, Syllabus, Module
 #from assignment.serializers import AssignmentMiniSerializer
 from .modules import ModuleMiniSerializer
+from mediastore.serializers import UploadedFileField
 
 
 class LiveSessionSerializer(serializers.ModelSerializer):
@@ -14,6 +15,7 @@ class LiveSessionSerializer(serializers.ModelSerializer):
 class VideoSerializer(serializers.ModelSerializer):
     module = ModuleMiniSerializer(read_only=True)
     module_id = serializers.PrimaryKeyRelatedField(queryset=Module.objects.all(), source='module', write_only=True)
+    video_file = UploadedFileField(url_name='video-stream')    # A multipart file or the id of a completed resumable upload
     class Meta:
         model = Video
         fields = '__all__'
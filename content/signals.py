@@ -0,0 +1,51 @@
+from django.db.models.signals import post_init,post_save,post_delete
+from django.dispatch import receiver
+from batch.models import Batch
+from course.models import Course
+from progress.rollups import schedule_rollup_rebuild
+from .models import LiveSession, Module, Syllabus, Video
+
+# Syllabus, video and module changes invalidate the course's ETag (see course/conditional.py),
+# its cached playback index (see content/playback.py) and dashboard (see course/dashboard.py)
+@receiver(post_save,sender=Module)
+@receiver(post_delete,sender=Module)
+@receiver(post_save,sender=Syllabus)
+@receiver(post_delete,sender=Syllabus)
+@receiver(post_save,sender=Video)
+@receiver(post_delete,sender=Video)
+def bump_course_content_version(sender,instance,**kwargs):
+    Course.bump_content_version([instance.course_id])
+
+# Live sessions are part of the cached learner dashboard (see course/dashboard.py)
+@receiver(post_save,sender=LiveSession)
+@receiver(post_delete,sender=LiveSession)
+def bump_batch_course_content_version(sender,instance,**kwargs):
+    Course.bump_content_version(Batch.objects.filter(pk=instance.batch_id).values('batch_specific_course_id'))
+
+# ...and, when a video or syllabus is added, removed or moved, the totals behind the completion rollups
+# (see progress/rollups.py). The placement each instance was loaded with is remembered, so an edit that
+# leaves it alone (a title, a new file) does not rebuild anything.
+_ROLLUP_FIELDS = {Video: ('course_id', 'syllabus_id'), Syllabus: ('course_id',)}
+
+def _placement(instance):
+    return tuple(instance.__dict__.get(attname) for attname in _ROLLUP_FIELDS[type(instance)])
+
+@receiver(post_init,sender=Syllabus)
+@receiver(post_init,sender=Video)
+def remember_rollup_placement(sender,instance,**kwargs):
+    instance._rollup_placement = _placement(instance)
+
+@receiver(post_save,sender=Syllabus)
+@receiver(post_save,sender=Video)
+def rebuild_moved_progress_rollups(sender,instance,created=False,**kwargs):
+    before, after = getattr(instance, '_rollup_placement', None), _placement(instance)
+    instance._rollup_placement = after
+    if created or before != after:
+        schedule_rollup_rebuild(instance.course_id)
+        if before and before[0] is not None and before[0] != instance.course_id:
+            schedule_rollup_rebuild(before[0])
+
+@receiver(post_delete,sender=Syllabus)
+@receiver(post_delete,sender=Video)
+def rebuild_course_progress_rollups(sender,instance,**kwargs):
+    schedule_rollup_rebuild(instance.course_id)
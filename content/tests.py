@@ -1,3 +1,101 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from course.models import Author, Category, Course, Enrollment
+from lms.media import parse_range
+from .models import Video
+
+
+class ParseRangeTests(TestCase):
+    def test_single_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        # Ends and suffixes past the file are clamped
+        self.assertEqual(parse_range('bytes=500-5000', 1000), (500, 999))
+        self.assertEqual(parse_range('bytes=-5000', 1000), (0, 999))
+
+    def test_whole_file_when_absent_malformed_or_multiple(self):
+        for header in (None, '', 'bytes=-', 'items=0-1', 'bytes=a-b', 'bytes=0-1,5-6'):
+            self.assertIsNone(parse_range(header, 1000), header)
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=1000-', 'bytes=1200-1300', 'bytes=10-5', 'bytes=-0'):
+            with self.assertRaises(ValueError):
+                parse_range(header, 1000)
+        with self.assertRaises(ValueError):
+            parse_range('bytes=-10', 0)
+
+
+class VideoStreamTests(TestCase):
+    content = bytes(range(256)) * 4
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        category = Category.objects.create(name='Programming')
+        author = Author.objects.create(name='Ada')
+        self.course = Course.objects.create(category=category, author=author, title='Python', duration='10h')
+        self.video = Video(course=self.course, title='Intro', duration=100)
+        self.video.video_file.save('intro.mp4', ContentFile(self.content))
+        self.student = CustomUser.objects.create_user(email='student@example.com', password='x', role='student', is_active=True)
+        Enrollment.objects.create(user=self.student, course=self.course)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.url = f'/content/videos/{self.video.pk}/stream/'
+
+    def get(self, **headers):
+        response = self.client.get(self.url, headers=headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        if hasattr(response, 'close'):
+            response.close()
+        return response, body
+
+    def test_whole_file(self):
+        response, body = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Length'], str(len(self.content)))
+
+    def test_partial_content(self):
+        response, body = self.get(Range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.content[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.content)}')
+        self.assertEqual(response['Content-Length'], '100')
+
+    def test_unsatisfiable_range(self):
+        response, _ = self.get(Range=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_if_range(self):
+        first, _ = self.get()
+        response, body = self.get(Range='bytes=0-9', **{'If-Range': first['ETag']})
+        self.assertEqual((response.status_code, body), (206, self.content[:10]))
+        response, _ = self.get(Range='bytes=0-9', **{'If-Range': first['Last-Modified']})
+        self.assertEqual(response.status_code, 206)
+
+        # A validator for another version of the file gets the whole file
+        response, body = self.get(Range='bytes=0-9', **{'If-Range': '"stale"'})
+        self.assertEqual((response.status_code, body), (200, self.content))
+        response, _ = self.get(Range='bytes=0-9', **{'If-Range': http_date(0)})
+        self.assertEqual(response.status_code, 200)
+
+    def test_requires_course_access(self):
+        outsider = CustomUser.objects.create_user(email='outsider@example.com', password='x', role='student', is_active=True)
+        self.client.force_authenticate(outsider)
+        response, _ = self.get(Range='bytes=0-9')
+        self.assertEqual(response.status_code, 403)
@@ -3,6 +3,8 @@ from rest_framework import generics
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.authentication import SessionAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from batch.models import BatchStudent
 from course.models import Enrollment, Course
@@ -11,7 +13,10 @@ from .serializers import LiveSessionSerializer, VideoSerializer, SyllabusWithVid
     SyllabusWithContentSerializer, VideoMiniSerializer
 from rest_framework.permissions import IsAuthenticated
 from .permissions import IsStaffOrReadOnly
-from course.utils import is_user_enrolled
+from .playback import get_playback_index
+from course.conditional import course_outline_validators, get_course_validator_row, not_modified_response, set_validators
+from course.utils import has_course_access, is_user_enrolled
+from lms.media import serve_media
 
 # LiveSession Views (with batch filtering + permission)
 class LiveSessionListCreateView(generics.ListCreateAPIView):
@@ -109,23 +114,31 @@ class CourseSyllabusWithVideosView(APIView):
 
     def get(self, request, course_id):
         user = request.user
+        row = get_course_validator_row(course_id)
 
         # Allow admin/staff by default
         if user.is_staff or user.role in ['admin', 'staff']:
             pass
         else:
-            from course.models import Course  # Avoid circular import
-            try:
-                course = Course.objects.get(id=course_id)
-            except Course.DoesNotExist:
+            if row is None:
                 return Response({"detail": "Course not found."}, status=404)
 
-            if not is_user_enrolled(user, course):
+            if not is_user_enrolled(user, course_id):
                 raise PermissionDenied("You are not enrolled in this course.")
 
+        # Answer polls with 304 before building the outline when the course content is unchanged
+        validators = course_outline_validators(row) if row is not None else None
+        if validators:
+            not_modified = not_modified_response(request, *validators)
+            if not_modified is not None:
+                return not_modified
+
         syllabus = Syllabus.objects.filter(course_id=course_id).prefetch_related('videos')
         serializer = SyllabusWithVideosSerializer(syllabus, many=True)
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        if validators:
+            set_validators(response, *validators)
+        return response
 
 class SyllabusContentView(APIView):
     permission_classes = [IsAuthenticated]
@@ -141,20 +154,35 @@ class VideoNavigationView(APIView):
 
     def get(self, request, course_id, video_id):
         course = get_object_or_404(Course, id=course_id)
-        videos = Video.objects.filter(course=course).order_by('syllabus__order')
-        current_video = get_object_or_404(Video, id=video_id)
-
-        video_list = list(videos)
-        try:
-            current_index = video_list.index(current_video)
-        except ValueError:
+        index = get_playback_index(course)
+        if video_id not in index:
             return Response({"detail": "Video not found in course."}, status=404)
 
-        previous_video = video_list[current_index - 1] if current_index > 0 else None
-        next_video = video_list[current_index + 1] if current_index < len(video_list) - 1 else None
+        # Neighbours come from the cached playback order; the three rows are fetched in one query
+        previous_id, next_id = index.previous(video_id), index.next(video_id)
+        videos = Video.objects.only('id', 'title', 'duration').in_bulk([video_id, previous_id, next_id])
+        current_video = videos.get(video_id)
+        if current_video is None:
+            return Response({"detail": "Video not found in course."}, status=404)
+        previous_video = videos.get(previous_id)
+        next_video = videos.get(next_id)
 
         return Response({
             "previous_video": VideoMiniSerializer(previous_video).data if previous_video else None,
             "current_video": VideoMiniSerializer(current_video).data,
             "next_video": VideoMiniSerializer(next_video).data if next_video else None,
-        })
\ No newline at end of file
+        })
+
+
+# Range-aware video delivery for enrolled learners (see lms/media.py); replaces the public /media/ URL for playback
+class VideoStreamView(APIView):
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        video = get_object_or_404(Video.objects.only('id', 'course_id', 'video_file'), pk=pk)
+        if not has_course_access(request.user, video.course_id):
+            raise PermissionDenied("You are not enrolled in this course.")
+        if not video.video_file:
+            return Response({"error": "This video has no file."}, status=404)
+        return serve_media(request, video.video_file)
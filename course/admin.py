@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import Category, Course, Review, FAQ, Author, Enrollment, CourseSection, CourseInclusion, LearningPoint
-from django.db.models import Avg
+from .models import Category, Course, Review, FAQ, Author, Enrollment, CourseSection, CourseInclusion, LearningPoint, \
+    CourseRanking
+from .serializers import ENROLLMENT_EXPORT_FIELDS
+from lms.exports import export_admin_action
 
 # ---------- CATEGORY ----------
 @admin.register(Category)
@@ -36,11 +38,6 @@ class CourseAdmin(admin.ModelAdmin):
     search_fields = ('title', 'author__name')
     ordering = ('-created_at',)
 
-    def average_rating(self, obj):
-        avg = obj.reviews.aggregate(avg=Avg('rating'))['avg']
-        return round(avg or 0, 1)
-    average_rating.short_description = 'Avg Rating'
-
 
 # ---------- REVIEW ----------
 @admin.register(Review)
@@ -65,6 +62,7 @@ class EnrollmentAdmin(admin.ModelAdmin):
     list_filter = ('enrolled_at',)
     search_fields = ('user__email', 'course__title')
     ordering = ('-enrolled_at',)
+    actions = [export_admin_action(ENROLLMENT_EXPORT_FIELDS, 'enrollments')]
 
 
 # ---------- LEARNING POINT ----------
@@ -85,4 +83,11 @@ class CourseInclusionAdmin(admin.ModelAdmin):
 @admin.register(CourseSection)
 class CourseSectionAdmin(admin.ModelAdmin):
     list_display = ('course', 'title')
-    search_fields = ('course__title', 'title')
\ No newline at end of file
+    search_fields = ('course__title', 'title')
+
+# ---------- COURSE RANKING ----------
+@admin.register(CourseRanking)
+class CourseRankingAdmin(admin.ModelAdmin):
+    list_display = ('ranking', 'rank', 'course', 'score', 'computed_at')
+    list_filter = ('ranking',)
+    ordering = ('ranking', 'rank')
@@ -0,0 +1,138 @@
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import Category
+
+# Public catalog responses are cached under a global catalog version. Any write to
+# Course, Review, Author, Category or FAQ bumps the version (see course.signals), so
+# stale entries are never read again and simply expire from the backend.
+CATALOG_CACHE_ALIAS = 'catalog'
+CATALOG_CACHE_TIMEOUT = 60 * 60
+CATALOG_VERSION_KEY = 'catalog:version'
+
+# How long a worker holds the build lock for a key, and how long others wait on it
+BUILD_LOCK_TIMEOUT = 10
+
+# Striped in-process locks so concurrent threads don't rebuild the same key
+_build_locks = [threading.Lock() for _ in range(64)]
+
+
+def get_catalog_cache():
+    return caches[CATALOG_CACHE_ALIAS]
+
+
+def get_catalog_version():
+    cache = get_catalog_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted version key never rolls back to an older value
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    cache = get_catalog_cache()
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), None)
+        return cache.get(CATALOG_VERSION_KEY)
+
+
+def catalog_cache_key(name, request=None):
+    key = f'catalog:v{get_catalog_version()}:{name}'
+    if request is not None:
+        # Absolute media URLs depend on the host, and list params on the query string
+        key += f':{request.get_host()}:{urlencode(sorted(request.query_params.items()))}'
+    return key
+
+
+def cached_catalog_response(name, builder, request=None, timeout=CATALOG_CACHE_TIMEOUT):
+    """
+    Return the cached payload for `name` at the current catalog version, calling `builder()` on a miss.
+    Misses are single-flight: one thread per process and one process per backend builds the payload,
+    the rest wait for it instead of stampeding the database.
+    `timeout` may be a callable taking the built payload, for payloads that go stale on their own.
+    """
+    cache = get_catalog_cache()
+    key = catalog_cache_key(name, request)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    with _build_locks[hash(key) % len(_build_locks)]:
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+        lock_key = f'{key}:lock'
+        if cache.add(lock_key, 1, BUILD_LOCK_TIMEOUT):
+            try:
+                data = builder()
+                cache.set(key, data, timeout(data) if callable(timeout) else timeout)
+            finally:
+                cache.delete(lock_key)
+            return data
+
+        # Another process is building this key; wait for its result
+        deadline = time.monotonic() + BUILD_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            data = cache.get(key)
+            if data is not None:
+                return data
+        return builder()
+
+
+def next_discount_change(end_dates, now=None):
+    # is_discount_active / discount_days_left_text change each time a whole day before an active
+    # discount's end passes, and at the end itself; None when no discount is running
+    now = now or timezone.now()
+    changes = [end - timedelta(days=(end - now).days) for end in end_dates if end is not None and end >= now]
+    return min(changes, default=None)
+
+
+def timeout_until(moment, timeout=CATALOG_CACHE_TIMEOUT):
+    # Cache timeout capped so an entry that goes stale with the clock expires right after `moment`
+    if moment is None:
+        return timeout
+    return max(1, min(timeout, int((moment - timezone.now()).total_seconds()) + 1))
+
+
+def get_category_list_payload():
+    """
+    Serialized categories with their non-archived course counts, built with one annotated query.
+    """
+    def build():
+        from .serializers import CategorySerializer  # avoid circular import
+
+        categories = Category.objects.annotate(
+            course_count=Count('courses', filter=Q(courses__is_archived=False))
+        ).order_by('id')
+        return CategorySerializer(categories, many=True).data
+
+    return cached_catalog_response('category_list', build)
+
+
+class CachedCatalogListMixin:
+    """
+    For generic list views: serve `list()` through the versioned catalog cache.
+    """
+    catalog_cache_name = None
+
+    def list(self, request, *args, **kwargs):
+        build_list = super().list
+        data = cached_catalog_response(
+            self.catalog_cache_name,
+            lambda: build_list(request, *args, **kwargs).data,
+            request=request,
+        )
+        return Response(data)
@@ -0,0 +1,83 @@
+import hashlib
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import Course, Enrollment
+
+# Everything in the course row that validators are derived from
+VALIDATOR_FIELDS = ['id', 'updated_at', 'content_version', 'content_updated_at', 'discount_end_date']
+
+
+def get_course_validator_row(course_id):
+    # One narrow query; None when the course does not exist
+    return Course.objects.filter(pk=course_id).values(*VALIDATOR_FIELDS).first()
+
+
+def _discount_changed_at(discount_end_date, now):
+    # is_discount_active / discount_days_left_text change with the clock: the text changes every
+    # whole day before the end date, and both change once more when the discount ends
+    if discount_end_date is None:
+        return None
+    if now >= discount_end_date:
+        return discount_end_date
+    days_left = (discount_end_date - now).days
+    return discount_end_date - timedelta(days=days_left + 1)
+
+
+def _tag(*parts):
+    return hashlib.sha1(':'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+
+
+def _last_modified(*moments):
+    moments = [moment for moment in moments if moment is not None]
+    return int(max(moments).timestamp()) if moments else None
+
+
+def course_detail_validators(row, user):
+    """
+    (etag, last_modified) for the course detail payload.
+    The shared part covers the course row, its content version and the clock-dependent discount fields;
+    the per-user part covers is_enrolled, so a user's enrollment change invalidates only their copy.
+    """
+    now = timezone.now()
+    discount_changed_at = _discount_changed_at(row['discount_end_date'], now)
+    shared = _tag(row['id'], row['updated_at'].isoformat(), row['content_version'], discount_changed_at)
+
+    enrolled_at = None
+    if user.is_authenticated:
+        enrolled_at = Enrollment.objects.filter(user=user, course_id=row['id']).values_list('enrolled_at', flat=True).first()
+    personal = _tag(user.pk, enrolled_at.isoformat() if enrolled_at else 'none')
+
+    etag = f'"{shared}.{personal}"'
+    return etag, _last_modified(row['updated_at'], row['content_updated_at'], discount_changed_at, enrolled_at)
+
+
+def course_outline_validators(row):
+    """
+    (etag, last_modified) for the syllabus/video outline, which only depends on the course content version.
+    """
+    etag = f'"{_tag(row["id"], "outline", row["content_version"])}"'
+    return etag, _last_modified(row['content_updated_at'], row['updated_at'])
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    A 304 response when the request's If-None-Match / If-Modified-Since validators still match, else None.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Per-user payloads: never share between users, always revalidate
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization', 'Cookie'])
+    return response
@@ -0,0 +1,120 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from content.models import LiveSession, Syllabus, Video
+from content.playback import get_playback_index
+from content.serializers import LiveSessionSerializer, VideoMiniSerializer, VideoSerializer
+from progress.models import SyllabusProgress, VideoProgress
+from progress.serializers import SyllabusProgressSerializer
+from progress.utils import get_learner_progress_version
+from .cache import get_catalog_cache
+
+# The learner course dashboard (DetailedCourseOverviewView) is assembled from two cached parts:
+#
+#     shared   course row, videos, syllabus outline, live sessions      per course version
+#     learner  last watched video, next unwatched, syllabus progress    per (user, course, progress version)
+#
+# Each data set is read once when a part is built. Content, module and live session changes bump
+# Course.content_version (see content/signals.py); progress writes bump the learner's progress version
+# (see progress.utils.bump_learner_progress_versions).
+DASHBOARD_CACHE_TIMEOUT = 60 * 60
+
+
+def _shared_key(course):
+    return f'dashboard:course:{course.pk}:{course.content_version}:{course.updated_at.timestamp()}'
+
+
+def _learner_key(course, user_id):
+    return f'dashboard:learner:{user_id}:{course.pk}:{course.content_version}:{get_learner_progress_version(user_id)}'
+
+
+def build_course_part(course):
+    videos = list(Video.objects.filter(course=course).select_related('module').order_by('id'))
+    syllabi = list(Syllabus.objects.filter(course=course).only('id', 'title'))
+    sessions = list(
+        LiveSession.objects.filter(batch__batch_specific_course=course).select_related('module').order_by('start_time', 'id')
+    )
+
+    videos_by_syllabus = defaultdict(list)
+    for video in videos:
+        if video.syllabus_id is not None:
+            videos_by_syllabus[video.syllabus_id].append(VideoMiniSerializer(video).data)
+
+    return {
+        'course': {'id': course.id, 'title': course.title, 'description': course.long_description},
+        'videos': VideoSerializer(videos, many=True).data,
+        'syllabus': [
+            {'id': syllabus.id, 'title': syllabus.title, 'videos': videos_by_syllabus[syllabus.id]} for syllabus in syllabi
+        ],
+        'live_sessions': LiveSessionSerializer(sessions, many=True).data,
+        # Upcoming sessions are picked at read time, so the part doesn't go stale with the clock
+        'live_session_starts': [session.start_time.timestamp() for session in sessions],
+    }
+
+
+def build_learner_part(course, user):
+    index = get_playback_index(course)
+    last_watched_id = (
+        VideoProgress.objects.filter(student=user, video__course=course)
+        .order_by('-last_watched_on').values_list('video_id', flat=True).first()
+    )
+    completed_ids = set(
+        VideoProgress.objects.filter(student=user, video__course=course, is_completed=True).values_list('video_id', flat=True)
+    )
+    progress = SyllabusProgress.objects.filter(student=user, syllabus__course=course).select_related('syllabus').order_by('-id').first()
+
+    current_id = last_watched_id if last_watched_id is not None else index.first()
+    return {
+        'last_watched_id': last_watched_id,
+        'current_id': current_id,
+        'next_id': index.next(current_id),
+        'next_unwatched_id': index.first_unwatched(completed_ids),
+        'syllabus_progress': SyllabusProgressSerializer(progress).data if progress else None,
+    }
+
+
+def _cached(key, builder, cache=cache):
+    payload = cache.get(key)
+    if payload is None:
+        payload = builder()
+        cache.set(key, payload, DASHBOARD_CACHE_TIMEOUT)
+    return payload
+
+
+def get_course_dashboard(course, user):
+    """
+    The DetailedCourseOverviewView payload for `user`. `course` needs id, title, long_description,
+    content_version and updated_at loaded.
+    """
+    shared = _cached(_shared_key(course), lambda: build_course_part(course))
+    # Next to the learner's progress version, in the cache shared by every worker
+    learner = _cached(_learner_key(course, user.pk), lambda: build_learner_part(course, user), get_catalog_cache())
+
+    videos = {video['id']: video for video in shared['videos']}
+
+    def full(video_id):
+        return videos.get(video_id)
+
+    def mini(video_id):
+        video = videos.get(video_id)
+        return {'id': video['id'], 'title': video['title'], 'duration': video['duration']} if video else None
+
+    upcoming = shared['live_sessions'][bisect_left(shared['live_session_starts'], timezone.now().timestamp()):]
+    return {
+        'course': {
+            **shared['course'],
+            'videos': shared['videos'],
+            'syllabus_progress': learner['syllabus_progress'],
+            'syllabus': shared['syllabus'],
+            'current_video': full(learner['last_watched_id']),
+            'next_video': full(learner['next_unwatched_id']),
+            'live_sessions': shared['live_sessions'],
+        },
+        'current_video': mini(learner['current_id']),
+        'next_video': mini(learner['next_id']),
+        'syllabus': shared['syllabus'],
+        'live_sessions': upcoming,
+    }
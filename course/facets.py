@@ -0,0 +1,155 @@
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .cache import cached_catalog_response, timeout_until
+from .models import Category, Course
+
+# Price bands over the effective price (discounted_price, else original_price): (key, label, low, high)
+PRICE_BANDS = [
+    ('free', 'Free', None, Decimal('0')),
+    ('under_1000', 'Under 1,000', Decimal('0'), Decimal('1000')),
+    ('1000_5000', '1,000 - 5,000', Decimal('1000'), Decimal('5000')),
+    ('over_5000', 'Over 5,000', Decimal('5000'), None),
+]
+# Overlapping "N stars & up" buckets: (key, label, minimum rating)
+RATING_BUCKETS = [
+    ('4.5_up', '4.5 & up', 4.5),
+    ('4_up', '4.0 & up', 4.0),
+    ('3.5_up', '3.5 & up', 3.5),
+    ('3_up', '3.0 & up', 3.0),
+]
+FACETS = ['category', 'price_band', 'rating', 'special_tag', 'discount']
+
+# Each ordering is (key function over a course row, reverse)
+ORDERINGS = {
+    'newest': (lambda row: row['id'], True),
+    'rating': (lambda row: (row['average_rating'], row['review_count']), True),
+    'price_asc': (lambda row: row['price'], False),
+    'price_desc': (lambda row: row['price'], True),
+}
+
+
+def _price_band(price):
+    for key, _, low, high in PRICE_BANDS:
+        if (low is None or price > low) and (high is None or price <= high):
+            return key
+
+
+def build_facet_index():
+    """
+    Bitset facet index over all non-archived courses, built from a single query.
+    Course i of the index is bit i; every facet value maps to the bitset of courses having it,
+    so filtering and counting are bitwise AND + popcount.
+    """
+    now = timezone.now()
+    rows = list(
+        Course.objects.filter(is_archived=False).values(
+            'id', 'category_id', 'original_price', 'discounted_price', 'average_rating',
+            'review_count', 'special_tag', 'discount_end_date',
+        ).order_by('id')
+    )
+
+    facets = {facet: {} for facet in FACETS}
+    next_discount_expiry = None
+    for position, row in enumerate(rows):
+        bit = 1 << position
+        row['price'] = row['discounted_price'] if row['discounted_price'] is not None else (row['original_price'] or Decimal('0'))
+
+        facets['category'][str(row['category_id'])] = facets['category'].get(str(row['category_id']), 0) | bit
+        band = _price_band(row['price'])
+        facets['price_band'][band] = facets['price_band'].get(band, 0) | bit
+        for key, _, minimum in RATING_BUCKETS:
+            if row['average_rating'] >= minimum:
+                facets['rating'][key] = facets['rating'].get(key, 0) | bit
+        if row['special_tag'] != 'none':
+            facets['special_tag'][row['special_tag']] = facets['special_tag'].get(row['special_tag'], 0) | bit
+        if row['discount_end_date'] and row['discount_end_date'] >= now:
+            facets['discount']['true'] = facets['discount'].get('true', 0) | bit
+            if next_discount_expiry is None or row['discount_end_date'] < next_discount_expiry:
+                next_discount_expiry = row['discount_end_date']
+
+    orders = {}
+    for name, (key, reverse) in ORDERINGS.items():
+        orders[name] = [position for position, _ in sorted(enumerate(rows), key=lambda item: key(item[1]), reverse=reverse)]
+
+    category_names = Category.objects.filter(id__in={row['category_id'] for row in rows}).values_list('id', 'name')
+    labels = {
+        'category': {str(category_id): name for category_id, name in category_names},
+        'price_band': {key: label for key, label, _, _ in PRICE_BANDS},
+        'rating': {key: label for key, label, _ in RATING_BUCKETS},
+        'special_tag': dict(Course.BADGE_CHOICES),
+        'discount': {'true': 'Discount active'},
+    }
+
+    return {
+        'ids': [row['id'] for row in rows],
+        'all': (1 << len(rows)) - 1,
+        'facets': facets,
+        'orders': orders,
+        'labels': labels,
+        'next_discount_expiry': next_discount_expiry,
+    }
+
+
+def _index_timeout(index):
+    # The discount facet depends on the clock; rebuild once the earliest active discount ends
+    return timeout_until(index['next_discount_expiry'])
+
+
+def get_facet_index():
+    # Rebuilt on every catalog version bump, i.e. whenever a course or review changes
+    return cached_catalog_response('facet_index', build_facet_index, timeout=_index_timeout)
+
+
+def search_facets(selected, ordering='newest', offset=0, limit=20):
+    """
+    `selected` maps facet name to a set of values; values within a facet are OR'ed, facets are AND'ed.
+    Returns (total, page of course ids, facet counts). Counts for a facet ignore that facet's own
+    selection, so the UI can show how many results each alternative value would give.
+    """
+    index = get_facet_index()
+
+    masks = {}
+    for facet in FACETS:
+        values = selected.get(facet)
+        if values:
+            mask = 0
+            for value in values:
+                mask |= index['facets'][facet].get(value, 0)
+            masks[facet] = mask
+
+    matches = index['all']
+    for mask in masks.values():
+        matches &= mask
+
+    counts = {}
+    for facet in FACETS:
+        base = index['all']
+        for other, mask in masks.items():
+            if other != facet:
+                base &= mask
+        counts[facet] = [
+            {
+                'value': value,
+                'label': index['labels'][facet].get(value, value),
+                'count': (base & bitset).bit_count(),
+                'selected': value in selected.get(facet, ()),
+            }
+            for value, bitset in index['facets'][facet].items()
+        ]
+
+    page = []
+    if matches:
+        bits = format(matches, 'b')[::-1]     # bits[i] == '1' if course i matches
+        skipped = 0
+        for position in index['orders'].get(ordering, index['orders']['newest']):
+            if position < len(bits) and bits[position] == '1':
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                page.append(index['ids'][position])
+                if len(page) >= limit:
+                    break
+
+    return matches.bit_count(), page, counts
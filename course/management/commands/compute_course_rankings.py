@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from course.ranking import RANKING_SIZE, TRENDING_WINDOW_DAYS, compute_rankings
+
+
+class Command(BaseCommand):
+    help = "Fold new enrollments/reviews into daily course activity and rebuild the trending and top-new rankings. Run periodically (e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window-days', type=int, default=TRENDING_WINDOW_DAYS)
+        parser.add_argument('--size', type=int, default=RANKING_SIZE)
+
+    def handle(self, *args, **options):
+        trending, top_new = compute_rankings(window_days=options['window_days'], size=options['size'])
+        self.stdout.write(self.style.SUCCESS(f"Ranked {trending} trending and {top_new} top-new course(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from course.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the course full-text search index from scratch."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt course search index using {type(backend).__name__}."))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from course.models import Course, Review
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored rating histogram, average_rating and review_count of every course and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Only report drifted courses.")
+
+    def handle(self, *args, **options):
+        # One grouped query for every (course, star) pair that has reviews
+        histograms = {}
+        for row in Review.objects.values('course_id', 'rating').annotate(count=Count('id')).order_by():
+            counts = histograms.setdefault(row['course_id'], dict.fromkeys(Course.RATING_COUNT_FIELDS, 0))
+            counts[f"rating_{row['rating']}_count"] = row['count']
+
+        fields = Course.RATING_COUNT_FIELDS + ['average_rating', 'review_count']
+        empty = dict.fromkeys(Course.RATING_COUNT_FIELDS, 0)
+
+        drifted = []
+        for course in Course.objects.only('id', *fields).iterator(chunk_size=options['batch_size']):
+            counts = histograms.get(course.id, empty)
+            expected = {**counts, **Course.rating_stats_from_counts(counts)}
+            stored = {field: getattr(course, field) for field in fields}
+            counts_drifted = any(stored[field] != expected[field] for field in fields[:-2] + ['review_count'])
+            if counts_drifted or abs(stored['average_rating'] - expected['average_rating']) > 1e-6:
+                for field, value in expected.items():
+                    setattr(course, field, value)
+                drifted.append(course)
+
+        if not options['dry_run'] and drifted:
+            Course.objects.bulk_update(drifted, fields, batch_size=options['batch_size'])
+
+        action = "Found" if options['dry_run'] else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"{action} {len(drifted)} course(s) with drifted rating stats."))
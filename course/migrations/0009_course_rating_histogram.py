@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_histogram(apps, schema_editor):
+    Course = apps.get_model('course', 'Course')
+    Review = apps.get_model('course', 'Review')
+
+    histograms = {}
+    for row in Review.objects.values('course_id', 'rating').annotate(count=Count('id')).order_by():
+        histograms.setdefault(row['course_id'], {})[f"rating_{row['rating']}_count"] = row['count']
+
+    for course_id, counts in histograms.items():
+        review_count = sum(counts.values())
+        total = sum(int(field.split('_')[1]) * count for field, count in counts.items())
+        Course.objects.filter(pk=course_id).update(
+            review_count=review_count,
+            average_rating=total / review_count,
+            **counts,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0008_merge_20261018_1910'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_histogram, migrations.RunPython.noop),
+    ]
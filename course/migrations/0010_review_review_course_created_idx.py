@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0009_course_rating_histogram'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['course', 'created_at'], name='review_course_created_idx'),
+        ),
+    ]
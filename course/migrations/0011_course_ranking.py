@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0010_review_review_course_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stream', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CourseActivityDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('enrollments', models.PositiveIntegerField(default=0)),
+                ('reviews', models.PositiveIntegerField(default=0)),
+                ('rating_total', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_days', to='course.course')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='activity_day_date_idx')],
+                'unique_together': {('course', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ranking', models.CharField(choices=[('trending', 'Trending'), ('top_new', 'Top New')], max_length=20)),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.FloatField(default=0.0)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='course.course')),
+            ],
+            options={
+                'ordering': ['ranking', 'rank'],
+                'unique_together': {('ranking', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# FTS5 inverted index used by course.search.SQLiteFTSBackend; rowid is the course id.
+# Other databases fall back to course.search.DatabaseSearchBackend and skip this table.
+CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS course_search_index USING fts5(
+    title, short_description, long_description, author, learning_points, category,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(CREATE_SQL)
+
+
+def populate_search_index(apps, schema_editor):
+    # Index the existing catalog, so courses are searchable without a manual rebuild_search_index
+    from course.search import get_search_backend
+    if schema_editor.connection.vendor == 'sqlite':
+        get_search_backend().rebuild(course_model=apps.get_model('course', 'Course'))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS course_search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0011_course_ranking'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0012_course_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='content_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0013_course_content_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='syllabus_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_syllabi',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
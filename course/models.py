@@ -1,6 +1,8 @@
 from datetime import timedelta
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf
 from django.conf import settings  # For linking to your custom User model
 from django.utils import timezone
 
@@ -61,6 +63,20 @@ class Course(models.Model):
     average_rating = models.FloatField(default=0.0)
     review_count = models.PositiveIntegerField(default=0)
 
+    # Per-star review counters (1-5), kept in step with average_rating/review_count
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+
+    # Bumped whenever content rendered with the course (syllabus, videos, reviews, ...) changes; see course/conditional.py
+    content_version = models.PositiveIntegerField(default=0)
+    content_updated_at = models.DateTimeField(null=True, blank=True)
+
+    # Denormalized number of syllabus topics, kept by progress.rollups
+    syllabus_count = models.PositiveIntegerField(default=0)
+
     is_archived = models.BooleanField(default=False)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,null=True,blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -76,12 +92,61 @@ class Course(models.Model):
         help_text="Special tag for the course (e.g., Top Author, Editor\'s Choice)"
     )
 
+    RATING_COUNT_FIELDS = [f'rating_{star}_count' for star in range(1, 6)]
+
     def update_rating_stats(self):
-        reviews = self.reviews.all()
-        self.review_count = reviews.count()
-        self.average_rating = reviews.aggregate(models.Avg('rating'))['rating__avg'] or 0
+        counts = dict.fromkeys(self.RATING_COUNT_FIELDS, 0)
+        for row in self.reviews.values('rating').annotate(count=models.Count('id')).order_by():
+            counts[f"rating_{row['rating']}_count"] = row['count']
+        for field, value in {**counts, **self.rating_stats_from_counts(counts)}.items():
+            setattr(self, field, value)
         self.save()
 
+    @classmethod
+    def apply_rating_delta(cls, course_id, added=None, removed=None):
+        # O(1) update of the stored rating histogram and aggregates for a single review write.
+        # The counters move in the database (F expressions), so concurrent reviews never overwrite
+        # each other; the aggregates are then derived from the stored counters.
+        # Drift is repaired by `manage.py reconcile_course_ratings`.
+        if added == removed:
+            return
+        counts = {}
+        if removed is not None:
+            field = f'rating_{removed}_count'
+            counts[field] = Greatest(models.F(field) - 1, 0)
+        if added is not None:
+            field = f'rating_{added}_count'
+            counts[field] = models.F(field) + 1
+
+        review_count = sum((models.F(field) for field in cls.RATING_COUNT_FIELDS), Value(0))
+        total = sum((star * models.F(f'rating_{star}_count') for star in range(1, 6)), Value(0))
+        with transaction.atomic():
+            cls.objects.filter(pk=course_id).update(**counts)
+            cls.objects.filter(pk=course_id).update(
+                review_count=review_count,
+                average_rating=Coalesce(
+                    Cast(total, models.FloatField()) / NullIf(review_count, 0), Value(0.0), output_field=models.FloatField(),
+                ),
+            )
+
+    @staticmethod
+    def rating_stats_from_counts(counts):
+        review_count = sum(counts.values())
+        total = sum(star * counts[f'rating_{star}_count'] for star in range(1, 6))
+        return {
+            'review_count': review_count,
+            'average_rating': total / review_count if review_count else 0.0,
+        }
+
+    @classmethod
+    def bump_content_version(cls, course_ids):
+        cls.objects.filter(pk__in=course_ids).update(
+            content_version=models.F('content_version') + 1, content_updated_at=timezone.now()
+        )
+
+    def get_rating_distribution(self):
+        return {star: getattr(self, f'rating_{star}_count') for star in range(5, 0, -1)}
+
     def is_discount_active(self):
         return self.discount_end_date and timezone.now() < self.discount_end_date
 
@@ -143,6 +208,19 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['course', 'created_at'], name='review_course_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored course/rating so signals can apply rating deltas
+        instance._loaded_course_id = instance.__dict__.get('course_id')
+        instance._loaded_rating = instance.__dict__.get('rating')
+        return instance
+
     def __str__(self):
         return f"{self.user} - {self.course} ({self.rating})"
 
@@ -165,6 +243,7 @@ class Enrollment(models.Model):
     is_active = models.BooleanField(default=True)
 
     progress_percent = models.FloatField(default=0.0)       #Used to show completion status on My Learnings page
+    completed_syllabi = models.PositiveIntegerField(default=0)      #Rollup counter behind progress_percent, kept by progress.rollups
     last_watched_video = models.ForeignKey('content.Video', on_delete=models.SET_NULL, null=True, blank=True)     #Used to resume where left off
 
     class Meta:
@@ -174,3 +253,52 @@ class Enrollment(models.Model):
         return f"{self.user} enrolled in {self.course}"
 
 
+
+
+#Daily per-course activity, rolled up incrementally from the enrollment and review streams
+class CourseActivityDay(models.Model):
+    course = models.ForeignKey(Course, related_name='activity_days', on_delete=models.CASCADE)
+    date = models.DateField()
+    enrollments = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('course', 'date')
+        indexes = [
+            models.Index(fields=['date'], name='activity_day_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.course} - {self.date}"
+
+#Last processed row id per source stream of the ranking job
+class RankingWatermark(models.Model):
+    stream = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.stream} @ {self.last_id}"
+
+#Precomputed course rankings read by the trending and top-new endpoints
+class CourseRanking(models.Model):
+    TRENDING = 'trending'
+    TOP_NEW = 'top_new'
+    RANKING_CHOICES = [
+        (TRENDING, 'Trending'),
+        (TOP_NEW, 'Top New'),
+    ]
+
+    ranking = models.CharField(max_length=20, choices=RANKING_CHOICES)
+    rank = models.PositiveIntegerField()
+    course = models.ForeignKey(Course, related_name='rankings', on_delete=models.CASCADE)
+    score = models.FloatField(default=0.0)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('ranking', 'rank')
+        ordering = ['ranking', 'rank']
+
+    def __str__(self):
+        return f"{self.get_ranking_display()} #{self.rank} - {self.course}"
@@ -0,0 +1,11 @@
+from lms.pagination import KeysetPagination
+
+
+class ReviewCursorPagination(KeysetPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+    Backed by the (course, created_at) index, so deep pages cost the same as the first.
+    """
+    page_size = 10
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
@@ -0,0 +1,173 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .models import Course, CourseActivityDay, CourseRanking, Enrollment, RankingWatermark, Review
+
+# Scoring weights for the trending ranking
+ENROLLMENT_WEIGHT = 1.0
+RATING_WEIGHT = 2.0             # Applied to recent rating points / 5, i.e. rating velocity
+COMPLETION_WEIGHT = 3.0
+TRENDING_FLAG_BOOST = 5.0       # Editorial boost for courses hand-flagged with is_trending
+
+TRENDING_WINDOW_DAYS = 14
+HALF_LIFE_DAYS = 3              # Activity loses half its weight every HALF_LIFE_DAYS
+TOP_NEW_WINDOW_DAYS = 30
+TOP_NEW_MIN_RATING = 4
+RANKING_SIZE = 50
+
+
+def _advance_stream(stream, queryset, date_field, count_field, extra=None):
+    """
+    Fold rows of `queryset` past the stored watermark into CourseActivityDay and move the watermark.
+    The row count per (course, day) is added to `count_field`; `extra` maps further
+    CourseActivityDay fields to aggregates over the new rows.
+    """
+    watermark, _ = RankingWatermark.objects.select_for_update().get_or_create(stream=stream)
+    new_rows = queryset.filter(id__gt=watermark.last_id)
+    high_id = new_rows.aggregate(high=Max('id'))['high']
+    if high_id is None:
+        return 0
+
+    grouped = (
+        new_rows.filter(id__lte=high_id)
+        .annotate(day=TruncDate(date_field))
+        .values('course_id', 'day')
+        .annotate(rows=Count('id'), **(extra or {}))
+        .order_by()
+    )
+    deltas = {(row['course_id'], row['day']): row for row in grouped}
+
+    existing = {
+        (day.course_id, day.date): day
+        for day in CourseActivityDay.objects.filter(
+            course_id__in={course_id for course_id, _ in deltas},
+            date__in={day for _, day in deltas},
+        )
+    }
+    fields = [count_field, *(extra or {})]
+
+    to_create, to_update = [], []
+    for (course_id, day), row in deltas.items():
+        activity = existing.get((course_id, day))
+        if activity is None:
+            activity = CourseActivityDay(course_id=course_id, date=day)
+            to_create.append(activity)
+        else:
+            to_update.append(activity)
+        setattr(activity, count_field, getattr(activity, count_field) + row['rows'])
+        for field in extra or {}:
+            setattr(activity, field, getattr(activity, field) + (row[field] or 0))
+
+    CourseActivityDay.objects.bulk_create(to_create, batch_size=500)
+    CourseActivityDay.objects.bulk_update(to_update, fields, batch_size=500)
+
+    watermark.last_id = high_id
+    watermark.save(update_fields=['last_id', 'updated_at'])
+    return len(deltas)
+
+
+def ingest_activity():
+    """
+    Process new enrollments and reviews since the last run. Only rows past each stream's watermark are read.
+    """
+    with transaction.atomic():
+        enrollment_days = _advance_stream('enrollments', Enrollment.objects.all(), 'enrolled_at', 'enrollments')
+        review_days = _advance_stream(
+            'reviews', Review.objects.all(), 'created_at', 'reviews', extra={'rating_total': Sum('rating')}
+        )
+    return enrollment_days, review_days
+
+
+def _trending_scores(today, window_days):
+    from progress.models import SyllabusProgress  # avoid circular import
+
+    since = today - timedelta(days=window_days)
+    scores = defaultdict(float)
+
+    for activity in CourseActivityDay.objects.filter(date__gt=since).only('course_id', 'date', 'enrollments', 'rating_total'):
+        decay = 0.5 ** ((today - activity.date).days / HALF_LIFE_DAYS)
+        scores[activity.course_id] += decay * (
+            ENROLLMENT_WEIGHT * activity.enrollments + RATING_WEIGHT * activity.rating_total / 5
+        )
+
+    completions = (
+        SyllabusProgress.objects.filter(is_completed=True, completed_on__date__gt=since)
+        .values('syllabus__course_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for row in completions:
+        scores[row['syllabus__course_id']] += COMPLETION_WEIGHT * row['count']
+
+    for course_id in Course.objects.filter(is_trending=True).values_list('id', flat=True):
+        scores[course_id] += TRENDING_FLAG_BOOST
+
+    return scores
+
+
+def _replace_ranking(ranking, ranked, now):
+    CourseRanking.objects.filter(ranking=ranking).delete()
+    CourseRanking.objects.bulk_create([
+        CourseRanking(ranking=ranking, rank=rank, course_id=course_id, score=score, computed_at=now)
+        for rank, (course_id, score) in enumerate(ranked, start=1)
+    ])
+
+
+def compute_rankings(window_days=TRENDING_WINDOW_DAYS, size=RANKING_SIZE):
+    """
+    Ingest new activity, then rewrite the trending and top-new ranking tables.
+    """
+    now = timezone.now()
+    ingest_activity()
+
+    scores = _trending_scores(now.date(), window_days)
+    active_ids = set(
+        Course.objects.filter(id__in=scores.keys(), is_archived=False).values_list('id', flat=True)
+    )
+    trending = sorted(
+        ((course_id, score) for course_id, score in scores.items() if course_id in active_ids and score > 0),
+        key=lambda item: (-item[1], item[0]),
+    )[:size]
+
+    new_courses = Course.objects.filter(
+        created_at__gte=now - timedelta(days=TOP_NEW_WINDOW_DAYS),
+        average_rating__gte=TOP_NEW_MIN_RATING,
+        is_archived=False,
+    ).values_list('id', 'average_rating')
+    top_new = sorted(
+        ((course_id, average_rating) for course_id, average_rating in new_courses),
+        key=lambda item: (-item[1], -scores.get(item[0], 0), item[0]),
+    )[:size]
+
+    with transaction.atomic():
+        _replace_ranking(CourseRanking.TRENDING, trending, now)
+        _replace_ranking(CourseRanking.TOP_NEW, top_new, now)
+
+    bump_catalog_version()
+    return len(trending), len(top_new)
+
+
+def _unranked_courses(ranking):
+    # The lists as they were before the ranking job, until compute_course_rankings has written a ranking
+    if ranking == CourseRanking.TRENDING:
+        return Course.objects.filter(is_trending=True).select_related('author').order_by('-average_rating')
+    return Course.objects.select_related('author').filter(
+        created_at__gte=timezone.now() - timedelta(days=TOP_NEW_WINDOW_DAYS), average_rating__gte=TOP_NEW_MIN_RATING,
+    ).order_by('-average_rating')
+
+
+def ranked_courses(ranking):
+    # Single indexed query over the ranking table, joined to the course and author
+    if not CourseRanking.objects.filter(ranking=ranking).exists():
+        return _unranked_courses(ranking)
+    return (
+        Course.objects.filter(rankings__ranking=ranking)
+        .select_related('author')
+        .order_by('rankings__rank')
+    )
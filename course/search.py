@@ -0,0 +1,169 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Q, Value, When
+from django.utils.module_loading import import_string
+
+from .models import Course
+
+SEARCH_TABLE = 'course_search_index'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Column weights for BM25, in table column order
+BM25_WEIGHTS = {
+    'title': 10.0,
+    'short_description': 4.0,
+    'long_description': 1.0,
+    'author': 5.0,
+    'learning_points': 2.0,
+    'category': 3.0,
+}
+SEARCH_COLUMNS = list(BM25_WEIGHTS)
+
+
+def build_documents(course_ids=None, course_model=Course):
+    """
+    Yield (course_id, {column: text}) for every non-archived course, or only for `course_ids`.
+    `course_model` lets migrations pass their historical Course.
+    """
+    courses = course_model.objects.filter(is_archived=False).select_related('author', 'category').prefetch_related('learning_points')
+    if course_ids is not None:
+        courses = courses.filter(id__in=course_ids)
+
+    for course in courses.order_by('id').iterator(chunk_size=500):
+        yield course.id, {
+            'title': course.title,
+            'short_description': course.short_description or '',
+            'long_description': course.long_description or '',
+            'author': course.author.name,
+            'learning_points': '\n'.join(point.point for point in course.learning_points.all()),
+            'category': course.category.name,
+        }
+
+
+class BaseSearchBackend:
+    """
+    Course search index. Backends keep one document per non-archived course.
+    """
+
+    def index_courses(self, course_ids):
+        raise NotImplementedError
+
+    def remove_courses(self, course_ids):
+        raise NotImplementedError
+
+    def rebuild(self, course_model=Course):
+        raise NotImplementedError
+
+    def search(self, query, limit=20, prefix=True):
+        """
+        Return [(course_id, title)] best match first.
+        """
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 inverted index (table created in course/migrations/0012_course_search_index.py).
+    The course id is the FTS rowid; ranking uses bm25() with per-column weights.
+    """
+
+    def _write(self, documents):
+        rows = [(course_id, *(doc[column] for column in SEARCH_COLUMNS)) for course_id, doc in documents]
+        if not rows:
+            return
+        placeholders = ', '.join(['%s'] * (len(SEARCH_COLUMNS) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES ({placeholders})",
+                rows,
+            )
+
+    def index_courses(self, course_ids):
+        course_ids = list(course_ids)
+        self.remove_courses(course_ids)
+        self._write(build_documents(course_ids))
+
+    def remove_courses(self, course_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(course_id,) for course_id in course_ids])
+
+    def rebuild(self, course_model=Course):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        batch = []
+        for document in build_documents(course_model=course_model):
+            batch.append(document)
+            if len(batch) >= 500:
+                self._write(batch)
+                batch = []
+        self._write(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+
+    @staticmethod
+    def to_match_expression(query, prefix):
+        # Quote every token so user input can't inject FTS5 syntax; the last one is a prefix for type-ahead
+        tokens = ['"%s"' % token for token in TOKEN_RE.findall(query)]
+        if prefix and tokens:
+            tokens[-1] += '*'
+        return ' '.join(tokens)
+
+    def search(self, query, limit=20, prefix=True):
+        expression = self.to_match_expression(query, prefix)
+        if not expression:
+            return []
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS.values())
+        # Every match is scored and the limit applies to the ranked result (a bounded top-N sort in SQLite),
+        # so broad type-ahead prefixes still return the best matches rather than the lowest course ids
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, title FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+                f"ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s",
+                [expression, limit],
+            )
+            return cursor.fetchall()
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Index-free fallback for databases without FTS5: icontains over the same fields, title matches first.
+    """
+
+    def index_courses(self, course_ids):
+        pass
+
+    def remove_courses(self, course_ids):
+        pass
+
+    def rebuild(self, course_model=Course):
+        pass
+
+    def search(self, query, limit=20, prefix=True):
+        tokens = TOKEN_RE.findall(query)
+        if not tokens:
+            return []
+        courses = Course.objects.filter(is_archived=False)
+        for token in tokens:
+            courses = courses.filter(
+                Q(title__icontains=token) | Q(short_description__icontains=token) |
+                Q(long_description__icontains=token) | Q(author__name__icontains=token) |
+                Q(learning_points__point__icontains=token) | Q(category__name__icontains=token)
+            )
+        title_matches = Q()
+        for token in tokens:
+            title_matches &= Q(title__icontains=token)
+        courses = courses.annotate(title_rank=Case(When(title_matches, then=Value(0)), default=Value(1)))
+        return list(courses.distinct().order_by('title_rank', 'title').values_list('id', 'title')[:limit])
+
+
+_backend = None
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        backend_path = getattr(settings, 'COURSE_SEARCH_BACKEND', 'course.search.SQLiteFTSBackend')
+        _backend = import_string(backend_path)()
+    return _backend
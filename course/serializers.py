@@ -2,17 +2,17 @@ from django.utils import timezone
 from rest_framework import serializers
 from .models import Review, FAQ, Category, Course, Author, Enrollment, LearningPoint, CourseInclusion, CourseSection
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
-from content.serializers import VideoMiniSerializer, VideoSerializer
+from content.serializers import VideoMiniSerializer
 from content.models import Video
-from progress.models import SyllabusProgress
-from progress.serializers import SyllabusProgressSerializer
-from progress.utils import calculate_course_progress_percent
 from batch.serializers import BatchMiniSerializer
+from mediastore.serializers import ImageVariantsField, UploadedFileField
 
 
 User = get_user_model()
 
+# Number of most recent reviews embedded in course detail; the rest are paged via /reviews/
+LATEST_REVIEWS_LIMIT = 5
+
 class CourseMiniSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
@@ -20,6 +20,9 @@ class CourseMiniSerializer(serializers.ModelSerializer):
 
 # ---------- Category ----------
 class CategorySerializer(serializers.ModelSerializer):
+    course_count = serializers.IntegerField(read_only=True)     # Annotated, see course.cache
+    icon = ImageVariantsField('category-icon', required=False, allow_null=True)
+
     class Meta:
         model = Category
         exclude = ["created_at"]
@@ -29,8 +32,33 @@ class CategorySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Category name must be unique.")
         return value
 
+# ---------- Rating Summary ----------
+class CourseRatingSummarySerializer(serializers.ModelSerializer):
+    average_rating = serializers.SerializerMethodField()
+    distribution = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Course
+        fields = ['id', 'average_rating', 'review_count', 'distribution']
+
+    def get_average_rating(self, obj):
+        return round(obj.average_rating or 0, 1)
+
+    def get_distribution(self, obj):
+        # Read from the stored per-star counters, never from the review table
+        return [
+            {
+                'rating': star,
+                'count': count,
+                'percent': round(count * 100 / obj.review_count, 1) if obj.review_count else 0,
+            }
+            for star, count in obj.get_rating_distribution().items()
+        ]
+
 # ---------- Author ----------
 class AuthorSerializer(serializers.ModelSerializer):
+    image = ImageVariantsField('author-image', required=False, allow_null=True)
+
     class Meta:
         model = Author
         fields = ['id', 'name', 'bio', 'image', 'organization']
@@ -40,6 +68,7 @@ class CourseFilterSerializer(serializers.ModelSerializer):
     rating_count = serializers.SerializerMethodField()
     special_tag = serializers.SerializerMethodField()
     author = AuthorSerializer(read_only=True)
+    thumbnail = ImageVariantsField('course-thumbnail', read_only=True)
 
     class Meta:
         model = Course
@@ -57,71 +86,16 @@ class CourseFilterSerializer(serializers.ModelSerializer):
         ]
 
     def get_rating(self, obj):
-        avg_rating = obj.reviews.aggregate(avg=Avg('rating'))['avg']
-        return round(avg_rating or 0, 1)
+        return round(obj.average_rating or 0, 1)
 
     def get_rating_count(self, obj):
-        return obj.reviews.count()
+        return obj.review_count
 
     def get_special_tag(self, obj):
         tag = obj.get_special_tag_display()
         return tag if obj.special_tag != 'none' else None
 
 
-class CourseOverviewSerializer(serializers.ModelSerializer):
-    videos = serializers.SerializerMethodField()
-    syllabus_progress = serializers.SerializerMethodField()
-    syllabus = serializers.SerializerMethodField()      # Full chapter-wise structure (modules with videos).
-    current_video = serializers.SerializerMethodField() # Last watched video by the student.
-    next_video = serializers.SerializerMethodField()    # The next unwatched video in the course.
-    live_sessions = serializers.SerializerMethodField() # All sessions related to the course.
-
-    class Meta:
-        model = Course
-        fields = ['id', 'title', 'description', 'videos', 'syllabus_progress', 'syllabus', 'current_video', 'next_video', 'live_sessions']
-
-    def get_videos(self, obj):
-        videos = Video.objects.filter(course=obj)
-        return VideoSerializer(videos, many=True).data
-
-    def get_syllabus_progress(self, obj):
-        user = self.context['request'].user
-        try:
-            progress = SyllabusProgress.objects.get(syllabus__course=obj, student=user)
-            return SyllabusProgressSerializer(progress).data
-        except SyllabusProgress.DoesNotExist:
-            return None
-
-    def get_syllabus(self, obj):
-        from content.models import Syllabus
-        from content.serializers import SyllabusWithVideosSerializer
-        syllabus_qs = Syllabus.objects.filter(course=obj).prefetch_related('videos')
-        return SyllabusWithVideosSerializer(syllabus_qs, many=True).data
-
-    def get_current_video(self, obj):
-        user = self.context['request'].user
-        from progress.models import VideoProgress
-        vp = VideoProgress.objects.filter(video__course=obj, student=user).order_by('-last_watched_on').first()
-        if vp:
-            return VideoSerializer(vp.video).data
-        return None
-
-    def get_next_video(self, obj):
-        user = self.context['request'].user
-        all_videos = Video.objects.filter(course=obj).order_by('id')
-        from progress.models import VideoProgress
-        watched = VideoProgress.objects.filter(student=user, video__in=all_videos, is_completed=True).values_list('video_id', flat=True)
-        next_video = all_videos.exclude(id__in=watched).first()
-        if next_video:
-            return VideoSerializer(next_video).data
-        return None
-
-    def get_live_sessions(self, obj):
-        from content.models import LiveSession
-        from content.serializers import LiveSessionSerializer
-        return LiveSessionSerializer(LiveSession.objects.filter(batch__batch_specific_course=obj), many=True).data
-
-
 # ---------- User ----------
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -179,6 +153,8 @@ class CourseInclusionSerializer(serializers.ModelSerializer):
         fields = ['item']
 
 class CourseSectionSerializer(serializers.ModelSerializer):
+    file = UploadedFileField(url_name='course-section-file', required=False, allow_null=True)     # A multipart file or the id of a completed resumable upload
+
     class Meta:
         model = CourseSection
         fields = ['title', 'description', 'file']
@@ -187,16 +163,18 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(slug_field='name', queryset=Category.objects.all())
     author = AuthorSerializer(read_only=True)
     author_id = serializers.PrimaryKeyRelatedField(source='author', queryset=Author.objects.all(), write_only=True)
+    thumbnail = ImageVariantsField('course-thumbnail', required=False)
 
     learning_points = LearningPointSerializer(many=True, required=True)
     inclusions = CourseInclusionSerializer(many=True, required=True)
     sections = CourseSectionSerializer(many=True, required=True)
 
-    reviews = ReviewSerializer(many=True, read_only=True)
+    reviews = serializers.SerializerMethodField()
     faqs = FAQSerializer(many=True, read_only=True)
 
     average_rating = serializers.SerializerMethodField()
     review_count = serializers.SerializerMethodField()
+    rating_distribution = serializers.SerializerMethodField()
     special_tag = serializers.ChoiceField(choices=Course.BADGE_CHOICES,default='none')
     is_enrolled = serializers.SerializerMethodField()
     is_discount_active = serializers.SerializerMethodField()
@@ -204,7 +182,7 @@ class CourseDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Course
-        exclude = ['created_at', 'updated_at']
+        exclude = ['created_at', 'updated_at', 'content_version', 'content_updated_at', 'syllabus_count', *Course.RATING_COUNT_FIELDS]
 
     def create(self, validated_data):
         learning_points_data = validated_data.pop('learning_points')
@@ -228,11 +206,17 @@ class CourseDetailSerializer(serializers.ModelSerializer):
         return instance
 
     def get_average_rating(self, obj):
-        avg_rating = obj.reviews.aggregate(avg=Avg('rating'))['avg']
-        return round(avg_rating or 0, 1)
+        return round(obj.average_rating or 0, 1)
 
     def get_review_count(self, obj):
-        return obj.reviews.count()
+        return obj.review_count
+
+    def get_reviews(self, obj):
+        latest = obj.reviews.select_related('user').order_by('-created_at', '-id')[:LATEST_REVIEWS_LIMIT]
+        return ReviewSerializer(latest, many=True).data
+
+    def get_rating_distribution(self, obj):
+        return CourseRatingSummarySerializer(obj).data['distribution']
 
     #def get_special_tag(self, obj):
     #    return obj.get_special_tag_display() if hasattr(obj, 'get_special_tag_display') else None
@@ -267,22 +251,13 @@ class EnrollmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Enrollment
+        # progress_percent is the stored rollup maintained by progress.rollups
         fields = ['id', 'user', 'course', 'batch', 'enrolled_at', 'progress_percent', 'last_watched_video']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        # Dynamically calculate progress
-        data['progress_percent'] = calculate_course_progress_percent(
-            user=instance.user,
-            course=instance.course
-        )
-        return data
-
 # Updating the progress of a student enrolled in a course.
 class EnrollmentProgressUpdateSerializer(serializers.Serializer):
     enrollment = serializers.IntegerField()
-    progress_percent = serializers.FloatField(min_value=0, max_value=100)
-    last_watched_video = serializers.IntegerField()
+    last_watched_video = serializers.IntegerField()     # progress_percent is the rollup kept by progress.rollups, never client input
 
     def validate(self, attrs):
         request = self.context['request']
@@ -316,11 +291,9 @@ class EnrollmentProgressUpdateSerializer(serializers.Serializer):
     def save(self, **kwargs):
         enrollment = self.validated_data['enrollment']
         video = self.validated_data['video']
-        progress_percent = self.validated_data['progress_percent']
 
-        enrollment.progress_percent = progress_percent
         enrollment.last_watched_video = video
-        enrollment.save()
+        enrollment.save(update_fields=['last_watched_video'])
         return enrollment
 
     enrolled_at = serializers.DateTimeField(read_only=True)
@@ -337,6 +310,7 @@ class CourseListSerializer(serializers.ModelSerializer):
     is_discount_active = serializers.SerializerMethodField()
     discount_days_left_text = serializers.SerializerMethodField()
     special_tag = serializers.SerializerMethodField()
+    thumbnail = ImageVariantsField('course-thumbnail', read_only=True)
 
     class Meta:
         model = Course
@@ -350,11 +324,10 @@ class CourseListSerializer(serializers.ModelSerializer):
         ]
 
     def get_average_rating(self, obj):
-        avg_rating = obj.reviews.aggregate(avg=Avg('rating'))['avg']
-        return round(avg_rating or 0, 1)
+        return round(obj.average_rating or 0, 1)
 
     def get_review_count(self, obj):
-        return obj.reviews.count()
+        return obj.review_count
 
     def get_is_discount_active(self, obj):
         return obj.discount_end_date and obj.discount_end_date >= timezone.now()
@@ -366,4 +339,19 @@ class CourseListSerializer(serializers.ModelSerializer):
         return ""
 
     def get_special_tag(self, obj):
-        return obj.get_special_tag_display() if hasattr(obj, 'get_special_tag_display') else None
\ No newline at end of file
+        return obj.get_special_tag_display() if hasattr(obj, 'get_special_tag_display') else None
+
+# ---------- Exports ----------
+# Column -> lookup projections for the streamed enrollment export (lms/exports.py)
+ENROLLMENT_EXPORT_FIELDS = {
+    'id': 'id',
+    'user_id': 'user_id',
+    'email': 'user__email',
+    'full_name': 'user__full_name',
+    'course_id': 'course_id',
+    'course_title': 'course__title',
+    'enrolled_at': 'enrolled_at',
+    'progress_percent': 'progress_percent',
+    'completed_syllabi': 'completed_syllabi',
+    'last_watched_video_id': 'last_watched_video_id',
+}
@@ -1,11 +1,86 @@
+from django.db import transaction
 from django.db.models.signals import post_save,post_delete
 from django.dispatch import receiver
-from .models import Review
+from .cache import bump_catalog_version
+from .models import Author, Category, Course, CourseInclusion, CourseSection, FAQ, LearningPoint, Review
+from .search import get_search_backend
 
 @receiver(post_save,sender=Review)
-def update_course_rating_on_save(sender,instance,**kwargs):
-    instance.course.update_rating_stats()
+def update_course_rating_on_save(sender,instance,created,**kwargs):
+    old_course_id = getattr(instance, '_loaded_course_id', None)
+    old_rating = getattr(instance, '_loaded_rating', None)
+
+    if created:
+        Course.apply_rating_delta(instance.course_id, added=instance.rating)
+    elif old_course_id is None:
+        # Instance was not loaded from the database, so the previous rating is unknown
+        instance.course.update_rating_stats()
+    elif old_course_id != instance.course_id:
+        Course.apply_rating_delta(old_course_id, removed=old_rating)
+        Course.apply_rating_delta(instance.course_id, added=instance.rating)
+    elif old_rating != instance.rating:
+        Course.apply_rating_delta(instance.course_id, added=instance.rating, removed=old_rating)
+
+    instance._loaded_course_id = instance.course_id
+    instance._loaded_rating = instance.rating
 
 @receiver(post_delete,sender=Review)
 def update_course_rating_on_delete(sender,instance,**kwargs):
-    instance.course.update_rating_stats()
\ No newline at end of file
+    course_id = getattr(instance, '_loaded_course_id', None) or instance.course_id
+    rating = getattr(instance, '_loaded_rating', None) or instance.rating
+    Course.apply_rating_delta(course_id, removed=rating)
+
+
+@receiver(post_save,sender=Category)
+@receiver(post_delete,sender=Category)
+@receiver(post_save,sender=Course)
+@receiver(post_delete,sender=Course)
+@receiver(post_save,sender=Review)
+@receiver(post_delete,sender=Review)
+@receiver(post_save,sender=Author)
+@receiver(post_delete,sender=Author)
+@receiver(post_save,sender=FAQ)
+@receiver(post_delete,sender=FAQ)
+def invalidate_catalog_cache(sender,**kwargs):
+    # After commit, so a concurrent reader can't cache pre-commit rows under the new version
+    transaction.on_commit(bump_catalog_version)
+
+
+# ---------- Search index ----------
+@receiver(post_save,sender=Course)
+def index_course(sender,instance,**kwargs):
+    get_search_backend().index_courses([instance.id])
+
+@receiver(post_delete,sender=Course)
+def unindex_course(sender,instance,**kwargs):
+    get_search_backend().remove_courses([instance.id])
+
+@receiver(post_save,sender=Author)
+@receiver(post_save,sender=Category)
+def reindex_related_courses(sender,instance,created,**kwargs):
+    if not created:
+        get_search_backend().index_courses(instance.courses.values_list('id', flat=True))
+
+@receiver(post_save,sender=LearningPoint)
+@receiver(post_delete,sender=LearningPoint)
+def reindex_learning_point_course(sender,instance,**kwargs):
+    get_search_backend().index_courses([instance.course_id])
+
+
+# ---------- Content version (ETag / Last-Modified, see conditional.py) ----------
+@receiver(post_save,sender=Review)
+@receiver(post_delete,sender=Review)
+@receiver(post_save,sender=LearningPoint)
+@receiver(post_delete,sender=LearningPoint)
+@receiver(post_save,sender=CourseInclusion)
+@receiver(post_delete,sender=CourseInclusion)
+@receiver(post_save,sender=CourseSection)
+@receiver(post_delete,sender=CourseSection)
+def bump_course_content_version(sender,instance,**kwargs):
+    Course.bump_content_version([instance.course_id])
+
+@receiver(post_save,sender=Author)
+@receiver(post_save,sender=Category)
+def bump_related_courses_content_version(sender,instance,created,**kwargs):
+    if not created:
+        Course.bump_content_version(instance.courses.values('id'))
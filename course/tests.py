@@ -0,0 +1,141 @@
+from django.test import TestCase
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from accounts.models import CustomUser
+from .models import Author, Category, Course, Review
+from .pagination import ReviewCursorPagination
+
+
+def make_course(title='Python'):
+    category, _ = Category.objects.get_or_create(name='Programming')
+    author, _ = Author.objects.get_or_create(name='Ada')
+    return Course.objects.create(category=category, author=author, title=title, duration='10h')
+
+
+class CourseRatingDeltaTests(TestCase):
+    def setUp(self):
+        self.course = make_course()
+        self.users = [
+            CustomUser.objects.create_user(email=f'student{i}@example.com', password='x', role='student', is_active=True)
+            for i in range(3)
+        ]
+
+    def review(self, user, rating, course=None):
+        return Review.objects.create(user=user, course=course or self.course, rating=rating, feedback='ok')
+
+    def assertStats(self, course, histogram, review_count, average):
+        course.refresh_from_db()
+        self.assertEqual([getattr(course, field) for field in Course.RATING_COUNT_FIELDS], histogram)
+        self.assertEqual(course.review_count, review_count)
+        self.assertAlmostEqual(course.average_rating, average, places=2)
+
+    def test_create_updates_histogram_and_average(self):
+        self.review(self.users[0], 5)
+        self.review(self.users[1], 3)
+        self.assertStats(self.course, [0, 0, 1, 0, 1], 2, 4.0)
+
+    def test_edit_moves_one_count_between_stars(self):
+        review = self.review(self.users[0], 5)
+        self.review(self.users[1], 4)
+
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 2
+        review.save()
+        self.assertStats(self.course, [0, 1, 0, 1, 0], 2, 3.0)
+
+        # Saving again without a change is a no-op
+        review.save()
+        self.assertStats(self.course, [0, 1, 0, 1, 0], 2, 3.0)
+
+    def test_moving_review_to_another_course(self):
+        other = make_course('Django')
+        review = self.review(self.users[0], 4)
+        self.review(self.users[1], 2)
+
+        review = Review.objects.get(pk=review.pk)
+        review.course = other
+        review.save()
+        self.assertStats(self.course, [0, 1, 0, 0, 0], 1, 2.0)
+        self.assertStats(other, [0, 0, 0, 1, 0], 1, 4.0)
+
+    def test_delete_removes_count_and_resets_average(self):
+        first = self.review(self.users[0], 1)
+        second = self.review(self.users[1], 5)
+
+        Review.objects.get(pk=first.pk).delete()
+        self.assertStats(self.course, [0, 0, 0, 0, 1], 1, 5.0)
+        second.delete()
+        self.assertStats(self.course, [0, 0, 0, 0, 0], 0, 0.0)
+
+    def test_removal_never_drives_counter_negative(self):
+        Course.apply_rating_delta(self.course.id, removed=3)
+        self.assertStats(self.course, [0, 0, 0, 0, 0], 0, 0.0)
+
+    def test_delta_matches_full_recount(self):
+        for user, rating in zip(self.users, (5, 4, 4)):
+            self.review(user, rating)
+        self.course.refresh_from_db()
+        incremental = (self.course.review_count, self.course.average_rating)
+
+        self.course.update_rating_stats()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.review_count, incremental[0])
+        self.assertAlmostEqual(self.course.average_rating, incremental[1], places=2)
+
+
+class ReviewKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.course = make_course()
+        users = [
+            CustomUser.objects.create_user(email=f'reader{i}@example.com', password='x', role='student', is_active=True)
+            for i in range(25)
+        ]
+        self.reviews = [Review.objects.create(user=user, course=self.course, rating=4, feedback='ok') for user in users]
+        self.client = APIClient()
+
+    def request(self, **params):
+        return Request(APIRequestFactory().get('/courses/reviews/', params))
+
+    def test_cursor_round_trip(self):
+        paginator = ReviewCursorPagination()
+        queryset = Review.objects.all()
+        ordering = paginator.get_ordering(None, queryset, None)
+        self.assertEqual(ordering, ['-created_at', '-id'])
+
+        review = self.reviews[3]
+        cursor = paginator.encode_cursor([paginator.value_of(review, 'created_at'), review.id])
+        self.assertNotIn('=', cursor)
+        self.assertEqual(paginator.decode_cursor(self.request(cursor=cursor), queryset, ordering), [review.created_at, review.id])
+
+    def test_pk_tie_breaker_follows_last_direction(self):
+        paginator = ReviewCursorPagination()
+        paginator.ordering = ('created_at',)
+        self.assertEqual(paginator.get_ordering(None, Review.objects.all(), None), ['created_at', 'pk'])
+
+    def test_invalid_cursor_is_not_found(self):
+        paginator = ReviewCursorPagination()
+        queryset = Review.objects.all()
+        ordering = paginator.get_ordering(None, queryset, None)
+        for cursor in ('not-base64!', paginator.encode_cursor([1]), paginator.encode_cursor({'id': 1}),
+                       paginator.encode_cursor(['yesterday', 1])):
+            with self.assertRaises(NotFound):
+                paginator.decode_cursor(self.request(cursor=cursor), queryset, ordering)
+
+        response = self.client.get('/courses/reviews/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_seek_walks_every_row_once(self):
+        seen = []
+        response = self.client.get('/courses/reviews/', {'course_id': self.course.id})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen += [row['id'] for row in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        expected = list(Review.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 25)
@@ -12,6 +12,7 @@ from .views import (
     TrendingCourseDetailAPIView,
     ReviewListCreateView,
     ReviewDetailView,
+    CourseRatingSummaryAPIView,
     FAQListCreateView,
     FAQDetailView,
 
@@ -23,6 +24,11 @@ from .views import (
     EnrollCourseAPIView, UserEnrollmentListAPIView, MyEnrollmentsAPIView, EnrollmentProgressUpdateView,
     CourseArchiveAPIView,
 
+    #Course materials
+    CourseSectionFileView,
+
+    #Search
+    CourseSearchAPIView, CourseFacetFilterAPIView,
 )
 
 urlpatterns = [
@@ -47,6 +53,7 @@ urlpatterns = [
     # Reviews
     path('reviews/', ReviewListCreateView.as_view(), name='review-list-create'),
     path('reviews/<int:pk>/', ReviewDetailView.as_view(), name='review-detail'),
+    path('courses/<int:pk>/rating-summary/', CourseRatingSummaryAPIView.as_view(), name='course-rating-summary'),
 
     # FAQs
     path('faqs/', FAQListCreateView.as_view(), name='faq-list-create'),
@@ -64,7 +71,14 @@ urlpatterns = [
     #My Learnings
     path('my-learnings/', MyEnrollmentsAPIView.as_view(), name='my-learnings'),
 
+    #Search
+    path('search/', CourseSearchAPIView.as_view(), name='course-search'),
+    path('filter/', CourseFacetFilterAPIView.as_view(), name='course-facet-filter'),
+
     #Archive Course
     path('courses/<int:pk>/archive/',CourseArchiveAPIView.as_view(),name='course-archive'),
+
+    # Course materials (range-aware, enrolled learners only)
+    path('sections/<int:pk>/file/', CourseSectionFileView.as_view(), name='course-section-file'),
 ]
 
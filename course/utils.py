@@ -1,4 +1,16 @@
 from course.models import Enrollment
 
 def is_user_enrolled(user, course):
-    return Enrollment.objects.filter(user=user, course=course).exists()
\ No newline at end of file
+    return Enrollment.objects.filter(user=user, course=course).exists()
+
+def has_course_access(user, course_id):
+    # Staff and admins see every course; learners need an enrollment or an active seat in one of its batches
+    from batch.models import BatchStudent  # avoid circular import
+    if user.is_staff or user.role in ['admin', 'staff']:
+        return True
+    return (
+        Enrollment.objects.filter(user=user, course_id=course_id).exists()
+        or BatchStudent.objects.filter(
+            student=user, batch__batch_specific_course_id=course_id, is_suspended=False
+        ).exists()
+    )
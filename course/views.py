@@ -4,23 +4,36 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.authentication import SessionAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.utils import timezone
-from datetime import timedelta, datetime
-from django.db.models import Avg
+from datetime import timedelta
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from accounts.permissions import IsAdmin, IsStaff
-from content.models import Video, Syllabus, LiveSession
-from content.serializers import VideoMiniSerializer, SyllabusWithVideosSerializer, LiveSessionSerializer
-from progress.models import VideoProgress
+from lms.exports import StreamingExportMixin
+from lms.media import serve_media
+from lms.mixins import SparseFieldsetMixin
+from content.models import Syllabus
 from progress.serializers import SyllabusProgressDetailSerializer
-from .models import Category, Course, Review, FAQ, Enrollment, Author
+from progress.utils import annotate_syllabus_progress
+from .cache import (
+    CachedCatalogListMixin, cached_catalog_response, get_category_list_payload, next_discount_change, timeout_until,
+)
+from .dashboard import get_course_dashboard
+from .conditional import course_detail_validators, get_course_validator_row, not_modified_response, set_validators
+from .facets import FACETS, ORDERINGS, search_facets
+from .models import Category, Course, Review, FAQ, Enrollment, Author, CourseRanking, CourseSection
+from .pagination import ReviewCursorPagination
+from .ranking import ranked_courses
+from .search import get_search_backend
 from .permissions import canArchiveCourse, canDeleteCourse, IsCourseManager, IsAdminUser
 from .serializers import (
     CategorySerializer,
     CourseDetailSerializer,
     CourseFilterSerializer,
-    CourseOverviewSerializer,
     ReviewSerializer,
     CreateReviewSerializer,
     FAQSerializer,
@@ -29,8 +42,10 @@ from .serializers import (
     AuthorSerializer,
     EnrollmentProgressUpdateSerializer,
     CourseListSerializer,
+    CourseRatingSummarySerializer,
+    ENROLLMENT_EXPORT_FIELDS,
 )
-from .utils import is_user_enrolled
+from .utils import has_course_access, is_user_enrolled
 
 
 User = get_user_model()
@@ -41,14 +56,7 @@ class CategoryListCreateAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        categories = Category.objects.all()
-        data = []
-        for category in categories:
-            serializer = CategorySerializer(category)
-            category_data = serializer.data
-            category_data['course_count'] = category.courses.count()
-            data.append(category_data)
-        return Response(data)
+        return Response(get_category_list_payload())
 
     def post(self, request):
         serializer = CategorySerializer(data=request.data)
@@ -62,15 +70,10 @@ class CategoryDetailAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, pk):
-        try:
-            category = Category.objects.get(pk=pk)
-        except Category.DoesNotExist:
-            return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
-
-        serializer = CategorySerializer(category)
-        data = serializer.data
-        data['course_count'] = category.courses.count()
-        return Response(data)
+        for category_data in get_category_list_payload():
+            if category_data['id'] == pk:
+                return Response(category_data)
+        return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
 
     def put(self, request, pk):
         try:
@@ -105,13 +108,11 @@ class TopNewCourseListAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        courses = Course.objects.annotate(avg_rating=Avg('reviews__rating')).filter(
-            created_at__gte=thirty_days_ago, avg_rating__gte=4
-        ).order_by('-avg_rating')
+        def build():
+            courses = ranked_courses(CourseRanking.TOP_NEW)
+            return CourseFilterSerializer(courses, many=True).data
 
-        serializer = CourseFilterSerializer(courses, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(cached_catalog_response('top_new', build), status=status.HTTP_200_OK)
 
 class TopNewCourseDetailAPIView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -162,10 +163,11 @@ class TrendingCourseAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        trending_courses = Course.objects.filter(is_trending=True).annotate(
-            avg_rating=Avg('reviews__rating')).order_by('-avg_rating')
-        serializer = CourseFilterSerializer(trending_courses, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def build():
+            trending_courses = ranked_courses(CourseRanking.TRENDING)
+            return CourseFilterSerializer(trending_courses, many=True).data
+
+        return Response(cached_catalog_response('trending', build), status=status.HTTP_200_OK)
 
 class TrendingCourseDetailAPIView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -183,13 +185,91 @@ class TrendingCourseDetailAPIView(APIView):
         serializer = CourseDetailSerializer(course, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+# ---------------- SEARCH ----------------
+
+# Full-text course search. ?q=... ; ?suggest=true returns id/title only for type-ahead
+class CourseSearchAPIView(APIView):
+    permission_classes = [permissions.AllowAny]
+    default_limit = 20
+    max_limit = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Query parameter q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', self.default_limit)), self.max_limit))
+        except ValueError:
+            return Response({'error': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.query_params.get('suggest') in ['true', 'True', '1']:
+            hits = get_search_backend().search(query, limit=limit)
+            return Response([{'id': course_id, 'title': title} for course_id, title in hits])
+
+        hits = get_search_backend().search(query, limit=limit)
+
+        courses = Course.objects.filter(id__in=[course_id for course_id, _ in hits], is_archived=False).select_related('author')
+        courses_by_id = {course.id: course for course in courses}
+        ordered = [courses_by_id[course_id] for course_id, _ in hits if course_id in courses_by_id]
+        return Response(CourseFilterSerializer(ordered, many=True, context={'request': request}).data)
+
+# ---------------- FACETED FILTER ----------------
+
+# Storefront filter: one page of courses plus per-facet counts, served from the precomputed facet index.
+# Facets: category, price_band, rating, special_tag, discount (comma-separated or repeated values).
+class CourseFacetFilterAPIView(APIView):
+    permission_classes = [permissions.AllowAny]
+    default_page_size = 20
+    max_page_size = 100
+
+    def get(self, request):
+        selected = {}
+        for facet in FACETS:
+            values = {value for raw in request.query_params.getlist(facet) for value in raw.split(',') if value}
+            if values:
+                selected[facet] = values
+
+        ordering = request.query_params.get('ordering', 'newest')
+        if ordering not in ORDERINGS:
+            return Response({'error': f"ordering must be one of: {', '.join(ORDERINGS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = max(1, min(int(request.query_params.get('page_size', self.default_page_size)), self.max_page_size))
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        total, course_ids, facet_counts = search_facets(
+            selected, ordering=ordering, offset=(page - 1) * page_size, limit=page_size
+        )
+
+        courses = Course.objects.filter(id__in=course_ids).select_related('category', 'author')
+        courses_by_id = {course.id: course for course in courses}
+        ordered = [courses_by_id[course_id] for course_id in course_ids if course_id in courses_by_id]
+
+        return Response({
+            'count': total,
+            'page': page,
+            'page_size': page_size,
+            'results': CourseListSerializer(ordered, many=True, context={'request': request}).data,
+            'facets': facet_counts,
+        })
+
 # ---------------- REVIEW VIEWS ----------------
 
+# Star breakdown served from the stored per-course counters
+class CourseRatingSummaryAPIView(RetrieveAPIView):
+    queryset = Course.objects.only('id', 'average_rating', 'review_count', *Course.RATING_COUNT_FIELDS)
+    serializer_class = CourseRatingSummarySerializer
+    permission_classes = [permissions.AllowAny]
+
 class ReviewListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = ReviewCursorPagination
 
     def get_queryset(self):
-        queryset = Review.objects.all()
+        queryset = Review.objects.select_related('user')
         course_id = self.request.query_params.get('course_id')
         if course_id:
             queryset = queryset.filter(course_id=course_id)
@@ -220,7 +300,8 @@ class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # ---------------- FAQ VIEWS ----------------
 
-class FAQListCreateView(generics.ListCreateAPIView):
+class FAQListCreateView(CachedCatalogListMixin, generics.ListCreateAPIView):
+    catalog_cache_name = 'faqs'
     queryset = FAQ.objects.filter(is_active=True).order_by('-created_at')
     serializer_class = FAQSerializer
     permission_classes = [permissions.AllowAny]
@@ -236,9 +317,18 @@ class CourseListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        courses = Course.objects.filter(is_archived=False)
-        serializer = CourseListSerializer(courses, many=True, context={'request': request})
-        return Response(serializer.data, status=200)
+        next_change = []
+
+        def build():
+            courses = list(Course.objects.filter(is_archived=False).select_related('category', 'author'))
+            next_change.append(next_discount_change(course.discount_end_date for course in courses))
+            return CourseListSerializer(courses, many=True, context={'request': request}).data
+
+        # The discount fields change with the clock, so the list is not kept past their next change
+        data = cached_catalog_response(
+            'course_list', build, request=request, timeout=lambda data: timeout_until(next_change[0]),
+        )
+        return Response(data, status=200)
 
     def post(self, request):
         if not IsCourseManager().has_permission(request, self) and not IsAdminUser().has_permission(request,self):
@@ -257,7 +347,16 @@ class CourseDetailAPIView(APIView):
         return get_object_or_404(Course, pk=pk)
 
     def get(self, request, pk):
-        course = self.get_object(pk)
+        # Validators come from one narrow query, so unchanged polls get a 304 before any serializer runs
+        row = get_course_validator_row(pk)
+        if row is None:
+            raise Http404('No Course matches the given query.')
+        etag, last_modified = course_detail_validators(row, request.user)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        course = get_object_or_404(Course.objects.select_related('category', 'author'), pk=pk)
 
         # user = request.user
 
@@ -266,7 +365,7 @@ class CourseDetailAPIView(APIView):
         #         return Response({'detail': 'Access denied. You are not enrolled in this course.'}, status=status.HTTP_403_FORBIDDEN)
 
         serializer = CourseDetailSerializer(course, context={'request': request})
-        return Response(serializer.data)
+        return set_validators(Response(serializer.data), etag, last_modified)
 
     def put(self, request, pk):
         course = self.get_object(pk)
@@ -313,48 +412,25 @@ class CourseOverviewView(generics.ListAPIView):
             if not enrollment:
                 raise PermissionDenied("You are not enrolled in this course.")
 
-        return Syllabus.objects.filter(course=course).order_by('order')
+        return annotate_syllabus_progress(Syllabus.objects.filter(course=course).order_by('order'), user)
 
 class DetailedCourseOverviewView(APIView):
     permission_classes = [IsAuthenticated]
 
+    # Assembled from cached shared / per-learner parts (see course/dashboard.py)
     def get(self, request, course_id):
         user = request.user
-        course = get_object_or_404(Course, id=course_id)
+        course = get_object_or_404(
+            Course.objects.only('id', 'title', 'long_description', 'content_version', 'updated_at')
+            .annotate(is_enrolled=Exists(Enrollment.objects.filter(user=user, course=OuterRef('pk')))),
+            id=course_id,
+        )
 
         is_staff = user.is_staff or user.is_superuser
-        is_enrolled = Enrollment.objects.filter(user=user, course=course).exists()
-        if not is_staff and not is_enrolled:
+        if not is_staff and not course.is_enrolled:
             return Response({"detail": "You are not enrolled in this course."}, status=status.HTTP_403_FORBIDDEN)
 
-        course_data = CourseOverviewSerializer(course, context={"request": request}).data
-
-        last_progress = VideoProgress.objects.filter(student=user, video__course=course).order_by('-last_watched_on').first()
-        current_video = last_progress.video if last_progress else Video.objects.filter(course=course).first()
-        current_video_data = VideoMiniSerializer(current_video).data if current_video else None
-
-        all_videos = list(Video.objects.filter(course=course).order_by('id'))
-        try:
-            index = all_videos.index(current_video)
-            next_video = all_videos[index + 1] if index + 1 < len(all_videos) else None
-        except Exception:
-            next_video = None
-        next_video_data = VideoMiniSerializer(next_video).data if next_video else None
-
-        syllabus = Syllabus.objects.filter(course=course).prefetch_related('videos')
-        syllabus_data = SyllabusWithVideosSerializer(syllabus, many=True).data
-
-        now = datetime.now()
-        live_sessions = LiveSession.objects.filter(batch__batch_specific_course=course, start_time__gte=now).order_by('start_time')
-        live_sessions_data = LiveSessionSerializer(live_sessions, many=True).data
-
-        return Response({
-            "course": course_data,
-            "current_video": current_video_data,
-            "next_video": next_video_data,
-            "syllabus": syllabus_data,
-            "live_sessions": live_sessions_data
-        })
+        return Response(get_course_dashboard(course, user))
 
 # Enroll in a course
 class EnrollCourseAPIView(APIView):
@@ -377,16 +453,20 @@ class MyEnrollmentsAPIView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Enrollment.objects.filter(user=self.request.user).select_related('course', 'last_watched_video')
+        return Enrollment.objects.filter(user=self.request.user).select_related('user', 'course__author', 'last_watched_video')
 
 # List enrolled courses for the admin and staff
-class UserEnrollmentListAPIView(generics.ListAPIView):
+class UserEnrollmentListAPIView(StreamingExportMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = EnrollmentSerializer
     permission_classes = [IsAdmin | IsStaff]
+    keyset_ordering = ('-enrolled_at', '-id')
+    # ?export=csv|ndjson streams every enrollment (see lms/exports.py)
+    export_filename = 'enrollments'
+    export_fields = ENROLLMENT_EXPORT_FIELDS
 
     def get_queryset(self):
         if self.request.user.role in ['admin', 'staff']:
-            return Enrollment.objects.select_related('course', 'user').all()
+            return Enrollment.objects.select_related('course__author', 'user', 'last_watched_video').all()
         raise PermissionDenied("Only staff or admin can view enrollments.")
 
 # To update a student's progress in a course they are enrolled in.
@@ -404,7 +484,8 @@ class EnrollmentProgressUpdateView(APIView):
 
 # ---------------- AUTHOR VIEWS ----------------
 
-class AuthorListCreateAPIView(generics.ListCreateAPIView):
+class AuthorListCreateAPIView(CachedCatalogListMixin, generics.ListCreateAPIView):
+    catalog_cache_name = 'authors'
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [permissions.AllowAny]
@@ -424,4 +505,18 @@ class CourseArchiveAPIView(APIView):
 
         course.is_archived = True
         course.save()
-        return Response({'message': 'Course archived successfully.'})
\ No newline at end of file
+        return Response({'message': 'Course archived successfully.'})
+
+# ---------------- COURSE MATERIALS ----------------
+
+class CourseSectionFileView(APIView):
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        section = get_object_or_404(CourseSection.objects.only('id', 'course_id', 'file'), pk=pk)
+        if not has_course_access(request.user, section.course_id):
+            raise PermissionDenied("You are not enrolled in this course.")
+        if not section.file:
+            return Response({'error': 'This section has no file.'}, status=404)
+        return serve_media(request, section.file)
@@ -0,0 +1,142 @@
+import io
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+# Protected media delivery. Views do the access check and hand the FieldFile to serve_media(), which either
+# tells the front proxy to send the file (X-Accel-Redirect / X-Sendfile) or streams it from Django with
+# single-range support. FileResponse keeps the fileno reachable, so WSGI servers with wsgi.file_wrapper
+# (gunicorn, uWSGI) send it with os.sendfile.
+MEDIA_OFFLOAD = getattr(settings, 'MEDIA_OFFLOAD', None)
+MEDIA_ACCEL_PREFIX = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+MEDIA_CACHE_CONTROL = 'private, max-age=3600'
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangedFile:
+    """
+    Read-only view of `length` bytes of an open file starting at `start`. The underlying file is positioned
+    at `start`, so sendfile-based file wrappers (which read from the current offset for Content-Length
+    bytes) and plain read() loops both stop at the end of the range.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        self.name = getattr(file, 'name', '')
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single `bytes=` range, inclusive, clamped to `size`. None when the header is absent,
+    malformed or asks for several ranges (the whole file is sent instead); ValueError when unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _size_and_mtime(file, field_file):
+    try:
+        stat = os.fstat(file.fileno())
+        return stat.st_size, int(stat.st_mtime)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        # Non-local storage: no file descriptor, so no validators either
+        return field_file.size, None
+
+
+def _if_range_matches(request, etag, mtime):
+    # A stale If-Range means "send the whole (changed) file" rather than a range of it
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if mtime is None:
+        return False
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == mtime
+
+
+def _offload(field_file, content_type, filename):
+    response = HttpResponse(content_type=content_type)
+    if MEDIA_OFFLOAD == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + field_file.name.lstrip('/')
+    else:
+        response['X-Sendfile'] = field_file.path
+    # Ranges, validators and Content-Length come from the proxy serving the file
+    response['Content-Disposition'] = content_disposition_header(False, filename)
+    response['Cache-Control'] = MEDIA_CACHE_CONTROL
+    return response
+
+
+def serve_media(request, field_file):
+    """
+    Response for a FieldFile the caller has already authorized: offloaded to the front proxy when
+    MEDIA_OFFLOAD is set, else a (partial) FileResponse honouring Range / If-Range.
+    """
+    filename = os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    if MEDIA_OFFLOAD:
+        return _offload(field_file, content_type, filename)
+
+    file = field_file.storage.open(field_file.name, 'rb')
+    size, mtime = _size_and_mtime(file, field_file)
+    etag = f'"{size:x}-{mtime:x}"' if mtime is not None else None
+
+    try:
+        byte_range = parse_range(request.headers.get('Range'), size)
+    except ValueError:
+        file.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range and _if_range_matches(request, etag, mtime):
+        start, end = byte_range
+        response = FileResponse(
+            RangedFile(file, start, end - start + 1), status=206, content_type=content_type, filename=filename,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    else:
+        response = FileResponse(file, content_type=content_type, filename=filename)
+        response['Content-Length'] = size
+    response['Accept-Ranges'] = 'bytes'
+    if mtime is not None:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(mtime)
+    response['Cache-Control'] = MEDIA_CACHE_CONTROL
+    return response
@@ -0,0 +1,110 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=id,title,...` on GET list/detail views: only the requested serializer fields are rendered,
+    and the queryset only selects the columns backing them (plus pk, ordering and select_related keys).
+    Falls back to selecting every column when a requested field is computed (method fields, `source='*'`,
+    properties), since its inputs can't be known. `fieldset_dependencies` maps such output fields
+    to the model columns they read, so they can still be narrowed (relations listed there are not joined).
+    """
+    fields_query_param = 'fields'
+    fieldset_dependencies = {}
+
+    def get_requested_fields(self):
+        if self.request is None or self.request.method != 'GET':
+            return None
+        raw = self.request.query_params.get(self.fields_query_param)
+        if not raw:
+            return None
+        return {name.strip() for name in raw.split(',') if name.strip()}
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested:
+            target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+            for name in list(target.fields):
+                if name not in requested:
+                    target.fields.pop(name)
+        return serializer
+
+    @staticmethod
+    def _select_related_paths(tree, prefix=''):
+        # {'video': {'course': {}}} -> ['video', 'video__course']
+        paths = []
+        for name, children in tree.items():
+            paths.append(prefix + name)
+            paths.extend(SparseFieldsetMixin._select_related_paths(children, prefix + name + '__'))
+        return paths
+
+    def get_fieldset_columns(self, queryset, requested):
+        """
+        Return (columns for `.only()`, select_related relations still needed), or None to load everything.
+        """
+        model = queryset.model
+        select_related = queryset.query.select_related
+        related = set(select_related) if isinstance(select_related, dict) else set()
+        ordering = getattr(self, 'keyset_ordering', None) or queryset.query.order_by or model._meta.ordering
+
+        columns = {model._meta.pk.name}
+        columns.update(field.lstrip('-').split('__')[0] for field in ordering if isinstance(field, str))
+        joins, whole_rows, related_columns = set(), set(), set()
+
+        fields = self.get_serializer_class()(context=self.get_serializer_context()).fields
+        for name in requested & set(fields):
+            field = fields[name]
+            computed = isinstance(field, serializers.SerializerMethodField) or field.source == '*'
+            if name in self.fieldset_dependencies:
+                columns.update(self.fieldset_dependencies[name])
+                if computed:
+                    continue
+            elif computed:
+                return None
+            attrs = field.source.split('.')
+            try:
+                model_field = model._meta.get_field(attrs[0])
+            except FieldDoesNotExist:
+                return None
+            if model_field.many_to_many or model_field.one_to_many or not model_field.concrete:
+                return None
+            columns.add(attrs[0])
+            if attrs[0] not in related:
+                continue
+            # A joined relation: narrow it to the one column read ("video.title" -> video__title) when possible
+            joins.add(attrs[0])
+            leaf = None
+            if len(attrs) == 2 and not isinstance(field, serializers.BaseSerializer):
+                try:
+                    leaf = model_field.related_model._meta.get_field(attrs[1])
+                except FieldDoesNotExist:
+                    pass
+            if leaf is not None and leaf.concrete and not leaf.is_relation:
+                related_columns.add((attrs[0], leaf.name))
+            else:
+                whole_rows.add(attrs[0])
+
+        columns.update(f'{relation}__{column}' for relation, column in related_columns if relation not in whole_rows)
+        columns.discard('pk')
+        return columns, joins
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = self.get_requested_fields()
+        if requested:
+            narrowed = self.get_fieldset_columns(queryset, requested)
+            if narrowed is not None:
+                columns, joins = narrowed
+                select_related = queryset.query.select_related
+                if isinstance(select_related, dict):
+                    paths = [
+                        path for path in self._select_related_paths(select_related)
+                        if path.split('__')[0] in joins
+                    ]
+                    queryset = queryset.select_related(None)
+                    if paths:
+                        queryset = queryset.select_related(*paths)
+                queryset = queryset.only(*columns)
+        return queryset
@@ -0,0 +1,140 @@
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Project-wide keyset (seek) pagination with opaque cursors.
+
+    Rows are ordered by the view's `keyset_ordering`, else the queryset's own ordering, else `-pk`,
+    always with the primary key appended as a tie-breaker so the order is total and stable.
+    The cursor holds the ordering values of the last row served; the next page is fetched with
+    `WHERE (a, b, pk) > (x, y, z)` expanded into plain comparisons, so page N costs the same as page 1.
+    Ordering fields must be non-null.
+    """
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    ordering = None
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = (
+            getattr(view, 'keyset_ordering', None) or self.ordering or
+            queryset.query.order_by or queryset.model._meta.ordering or ['-pk']
+        )
+        ordering = [field for field in ordering if isinstance(field, str)]
+        pk_name = queryset.model._meta.pk.name
+        if not any(field.lstrip('-') in ('pk', pk_name) for field in ordering):
+            descending = ordering[-1].startswith('-') if ordering else True
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, values):
+        raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, queryset, ordering):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            return [self.to_python(queryset.model, field.lstrip('-'), value) for field, value in zip(ordering, values)]
+        except (TypeError, ValueError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _resolve_field(model, path):
+        field = None
+        for name in path.split('__'):
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            if field.is_relation:
+                model = field.related_model
+        return field
+
+    def to_python(self, model, path, value):
+        field = self._resolve_field(model, path)
+        if field.is_relation:
+            field = field.target_field
+        return field.to_python(value)
+
+    @staticmethod
+    def value_of(instance, path):
+        for name in path.split('__'):
+            instance = getattr(instance, name)
+        return getattr(instance, 'pk', instance)
+
+    def seek_filter(self, ordering, values):
+        # (a, b, c) after (x, y, z)  ==  a > x  OR  (a = x AND b > y)  OR  (a = x AND b = y AND c > z)
+        clauses = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {ordering[i].lstrip('-'): values[i] for i in range(index)}
+            clauses.append(Q(**equal, **{f'{name}__{lookup}': values[index]}))
+        return reduce(or_, clauses)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.ordering_fields = self.get_ordering(request, queryset, view)
+
+        queryset = queryset.order_by(*self.ordering_fields)
+        values = self.decode_cursor(request, queryset, self.ordering_fields)
+        if values is not None:
+            queryset = queryset.filter(self.seek_filter(self.ordering_fields, values))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        cursor = self.encode_cursor([self.value_of(last, field.lstrip('-')) for field in self.ordering_fields])
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'first': self.get_first_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'first': {'type': 'string', 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
@@ -52,6 +54,8 @@ INSTALLED_APPS = [
     'chats',
     'announcements',
     'myprofile',
+    'analytics',
+    'mediastore',
 ]
 
 REST_FRAMEWORK = {
@@ -62,6 +66,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Keyset pagination with opaque cursors for every generic list view
+    'DEFAULT_PAGINATION_CLASS': 'lms.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 
 
@@ -111,6 +118,46 @@ DATABASES = {
 }
 
 
+# Cache
+# The 'catalog' cache holds versioned public catalog responses (see course/cache.py). The version key
+# lives in it too, so it must be shared by every worker: file (default, one host) or redis (several
+# hosts). locmem is per process and only suits a single-process dev server.
+CATALOG_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CATALOG_CACHE_BACKEND = os.environ.get('CATALOG_CACHE_BACKEND', 'file')
+CATALOG_CACHE_LOCATIONS = {
+    'locmem': 'lms-catalog',
+    'file': str(BASE_DIR / 'cache' / 'catalog'),
+    'redis': 'redis://127.0.0.1:6379/1',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalog': {
+        'BACKEND': CATALOG_CACHE_BACKENDS[CATALOG_CACHE_BACKEND],
+        'LOCATION': os.environ.get('CATALOG_CACHE_LOCATION', CATALOG_CACHE_LOCATIONS[CATALOG_CACHE_BACKEND]),
+        'KEY_PREFIX': 'lms',
+    },
+}
+
+
+# Course search index backend (see course/search.py). Use course.search.DatabaseSearchBackend
+# on databases without SQLite FTS5.
+COURSE_SEARCH_BACKEND = 'course.search.SQLiteFTSBackend'
+
+# Video watch heartbeats are buffered in-process and flushed as bulk upserts (see progress/heartbeats.py).
+# An interval of 0 writes every heartbeat through immediately.
+VIDEO_HEARTBEAT_FLUSH_INTERVAL = int(os.environ.get('VIDEO_HEARTBEAT_FLUSH_INTERVAL', 5))
+VIDEO_HEARTBEAT_MAX_PENDING = 10000
+# Days of raw watch events kept after compaction into daily aggregates (`manage.py compact_watch_events`)
+WATCH_EVENT_RETENTION_DAYS = 7
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -167,10 +214,40 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
-}
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
+
+# Uploads are deduplicated by content under MEDIA_ROOT/blobs/ (see mediastore/storage.py);
+# `manage.py gc_media_blobs` deletes blobs unreferenced for longer than MEDIA_BLOB_GRACE_HOURS
+STORAGES = {
+    'default': {'BACKEND': 'mediastore.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_BLOB_GRACE_HOURS = 24
+
+# Resumable chunked uploads (see mediastore/uploads.py); `manage.py clear_upload_sessions` drops idle ones
+RESUMABLE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+RESUMABLE_UPLOAD_MAX_SIZE = 5 * 1024 ** 3
+RESUMABLE_UPLOAD_TTL_HOURS = 24
+
+# Threads building resized image variants after uploads (see mediastore/images.py)
+IMAGE_DERIVATIVE_WORKERS = 2
+
+# Protected media (videos, course materials, submissions, resumes) is served by lms/media.py after an
+# access check; only image derivatives and public images are reachable under MEDIA_URL (see
+# mediastore.views.public_media), so a front proxy should publish MEDIA_ROOT/derivatives/ and keep blobs/ internal.
+# None streams it from Django; 'x-accel-redirect' (nginx, internal location at MEDIA_ACCEL_PREFIX
+# aliased to MEDIA_ROOT) or 'x-sendfile' (Apache / lighttpd) hands the transfer to the front proxy.
+MEDIA_OFFLOAD = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+
+# Test runs (`manage.py test`). The migration graph has conflicting leaves in accounts, assignment and
+# quiz that do not merge cleanly, so the test database is created straight from the models; the FTS5
+# search table comes from a migration and is therefore replaced by the index-free backend.
+if len(sys.argv) > 1 and sys.argv[1] == 'test':
+    MIGRATION_MODULES = {app: None for app in INSTALLED_APPS if '.' not in app and app not in ('rest_framework', 'corsheaders')}
+    CACHES['catalog'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'lms-catalog-test'}
+    COURSE_SEARCH_BACKEND = 'course.search.DatabaseSearchBackend'
+    VIDEO_HEARTBEAT_FLUSH_INTERVAL = 0
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
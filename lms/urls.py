@@ -19,6 +19,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
+from mediastore.views import public_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls')),  # All authentication-related routes from the accounts app
@@ -32,4 +34,8 @@ urlpatterns = [
     path('chats/',include('chats.urls')),
     path('announcements/',include('announcements.urls')),
     path('myprofile/',include('myprofile.urls')),
-]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    path('analytics/', include('analytics.urls')),
+    path('', include('mediastore.urls')),     # uploads/ and images/
+]
+# With DEBUG only, and restricted to public images; videos, section files, submissions and resumes have access-checked views
+urlpatterns += static(settings.MEDIA_URL, view=public_media, document_root=settings.MEDIA_ROOT)
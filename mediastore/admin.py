@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import MediaBlob, UploadSession
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'created_at', 'last_uploaded_at']
+    search_fields = ['name', 'sha256']
+    readonly_fields = ['name', 'sha256', 'size', 'ref_count', 'created_at', 'last_uploaded_at']
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ['id', 'owner', 'filename', 'size', 'received', 'status', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['filename', 'owner__email']
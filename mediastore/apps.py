@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class MediastoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'mediastore'
+
+    def ready(self):
+        from .signals import connect_image_derivatives, connect_reference_counting
+        connect_reference_counting()
+        connect_image_derivatives()
@@ -0,0 +1,143 @@
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+from .refs import get_blob_storage
+from .storage import DERIVATIVE_PREFIX, derivative_dir
+
+logger = logging.getLogger(__name__)
+
+# Fixed-size WebP variants of the catalog and profile images, cropped to fill. They are written next to each
+# other under derivatives/<source>/ (see storage.derivative_dir); blob names never change content, so a
+# variant never goes stale. Built after each upload by a small thread pool (Pillow releases the GIL while
+# resizing and encoding), by `manage.py build_image_derivatives`, or on first request of a missing variant.
+IMAGE_VARIANTS = {
+    'course-thumbnail': {
+        'field': ('course.Course', 'thumbnail'),
+        'sizes': {'sm': (320, 180), 'md': (640, 360), 'lg': (1280, 720)},
+        'default': 'md',
+    },
+    'category-icon': {
+        'field': ('course.Category', 'icon'),
+        'sizes': {'sm': (48, 48), 'md': (96, 96)},
+        'default': 'sm',
+    },
+    'author-image': {
+        'field': ('course.Author', 'image'),
+        'sizes': {'sm': (96, 96), 'md': (192, 192)},
+        'default': 'sm',
+    },
+    'profile-image': {
+        'field': ('accounts.CustomUser', 'profile_image'),
+        'sizes': {'sm': (64, 64), 'md': (128, 128), 'lg': (256, 256)},
+        'default': 'md',
+    },
+}
+# Images shown to anyone as they are; every other upload (videos, section files, submissions, resumes) is
+# only served by an access-checked view
+PUBLIC_IMAGE_FIELDS = [spec['field'] for spec in IMAGE_VARIANTS.values()] + [('myprofile.Badge', 'image')]
+DERIVATIVE_FORMAT = 'WEBP'
+DERIVATIVE_EXTENSION = '.webp'
+DERIVATIVE_QUALITY = 80
+WORKERS = getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2)
+
+_executor = None
+_in_flight = set()
+_lock = threading.Lock()
+
+
+def derivative_name(name, variant):
+    return f'{derivative_dir(name)}{variant}{DERIVATIVE_EXTENSION}'
+
+
+def has_derivatives(kind, name):
+    # Variants are written in declaration order, so the last one existing means they all do
+    storage = get_blob_storage()
+    return storage.exists(derivative_name(name, list(IMAGE_VARIANTS[kind]['sizes'])[-1]))
+
+
+def build_derivatives(kind, name):
+    """
+    Write every variant of image `name`; returns False when the source is missing or not an image.
+    """
+    storage = get_blob_storage()
+    try:
+        with storage.open(name, 'rb') as source:
+            image = ImageOps.exif_transpose(Image.open(source))
+            image.load()
+    except (OSError, Image.DecompressionBombError) as exc:
+        logger.warning("Cannot build image derivatives of %s: %s", name, exc)
+        return False
+    image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    for variant, size in IMAGE_VARIANTS[kind]['sizes'].items():
+        buffer = BytesIO()
+        ImageOps.fit(image, size, Image.Resampling.LANCZOS).save(buffer, DERIVATIVE_FORMAT, quality=DERIVATIVE_QUALITY)
+        path = storage.path(derivative_name(name, variant))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(buffer.getvalue())
+        os.replace(temp_path, path)
+    return True
+
+
+def _build_in_background(kind, name):
+    try:
+        build_derivatives(kind, name)
+    except Exception:
+        logger.exception("Building image derivatives of %s failed", name)
+    finally:
+        with _lock:
+            _in_flight.discard((kind, name))
+
+
+def schedule_derivatives(kind, name):
+    # Queue a build on the worker pool unless the variants exist or one is already queued
+    global _executor
+    if not name or has_derivatives(kind, name):
+        return
+    with _lock:
+        if (kind, name) in _in_flight:
+            return
+        _in_flight.add((kind, name))
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='image-derivatives')
+    _executor.submit(_build_in_background, kind, name)
+
+
+def image_variant_urls(kind, name):
+    """
+    {variant: url}. Variants not built yet point at the lazy endpoint, which builds them on first request;
+    a build is queued either way so later responses link the files directly.
+    """
+    storage = get_blob_storage()
+    if has_derivatives(kind, name):
+        return {variant: storage.url(derivative_name(name, variant)) for variant in IMAGE_VARIANTS[kind]['sizes']}
+    schedule_derivatives(kind, name)
+    return {
+        variant: reverse('mediastore:image-variant', kwargs={'kind': kind, 'variant': variant, 'name': name})
+        for variant in IMAGE_VARIANTS[kind]['sizes']
+    }
+
+
+def get_image_model_field(kind):
+    label, field_name = IMAGE_VARIANTS[kind]['field']
+    return apps.get_model(label), field_name
+
+
+def is_public_media(name):
+    if name.startswith(DERIVATIVE_PREFIX):
+        return True
+    return any(
+        apps.get_model(label)._base_manager.filter(**{field_name: name}).exists()
+        for label, field_name in PUBLIC_IMAGE_FIELDS
+    )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from mediastore.refs import adopt_existing_files
+
+
+class Command(BaseCommand):
+    help = "Move media saved under upload_to paths into the content-addressed blob store, merging duplicates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Count the files that would be moved without moving them.")
+
+    def handle(self, *args, **options):
+        adopted, updated = adopt_existing_files(dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Would adopt {adopted} file(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Adopted {adopted} file(s); repointed {updated} row(s)."))
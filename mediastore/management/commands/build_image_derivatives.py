@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mediastore.images import IMAGE_VARIANTS, WORKERS, build_derivatives, get_image_model_field, has_derivatives
+
+
+class Command(BaseCommand):
+    help = "Build the resized image variants of every course thumbnail, category icon, author image and avatar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=WORKERS, help=f"Images processed in parallel (default {WORKERS}).")
+        parser.add_argument('--force', action='store_true', help="Rebuild variants that already exist.")
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1.")
+        jobs = []
+        for kind in IMAGE_VARIANTS:
+            model, field_name = get_image_model_field(kind)
+            names = (
+                model._base_manager.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                .values_list(field_name, flat=True).distinct().order_by()
+            )
+            jobs += [(kind, name) for name in names if options['force'] or not has_derivatives(kind, name)]
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            built = sum(pool.map(lambda job: build_derivatives(*job), jobs))
+        self.stdout.write(self.style.SUCCESS(f"Built variants of {built} image(s); {len(jobs) - built} could not be read."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mediastore.uploads import SESSION_TTL_HOURS, clear_stale_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete resumable upload sessions (and their partial files) that have not been touched for a while."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl-hours', type=int, default=SESSION_TTL_HOURS,
+                            help=f"Delete sessions idle for longer than this (default {SESSION_TTL_HOURS}).")
+
+    def handle(self, *args, **options):
+        if options['ttl_hours'] < 1:
+            raise CommandError("--ttl-hours must be at least 1.")
+        deleted = clear_stale_sessions(ttl_hours=options['ttl_hours'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} stale upload session(s)."))
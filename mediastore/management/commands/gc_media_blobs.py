@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mediastore.refs import GRACE_HOURS, collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Recount references to content-addressed media blobs and delete the ones no row points at."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=int, default=GRACE_HOURS,
+                            help=f"Keep unreferenced blobs uploaded within this many hours (default {GRACE_HOURS}).")
+        parser.add_argument('--dry-run', action='store_true', help="Report what would be deleted without deleting it.")
+
+    def handle(self, *args, **options):
+        if options['grace_hours'] < 0:
+            raise CommandError("--grace-hours cannot be negative.")
+        removed, freed = collect_garbage(grace_hours=options['grace_hours'], dry_run=options['dry_run'])
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {removed} orphaned blob(s), {freed} byte(s)."))
@@ -0,0 +1,43 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+# One row per blob written by mediastore.storage.ContentAddressedStorage. `ref_count` is the number of
+# FileField values pointing at the blob; it is kept by mediastore.signals and re-derived from the tables
+# by `manage.py gc_media_blobs`, which also deletes blobs nobody has referenced for the grace period.
+class MediaBlob(models.Model):
+    name = models.CharField(max_length=100, unique=True)   # Storage name: blobs/ab/cd/<sha256><ext>
+    sha256 = models.CharField(max_length=64, db_index=True)      # Hash chain for multi-chunk uploads (see uploads.py)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_uploaded_at = models.DateTimeField(auto_now=True)     # Refreshed whenever an upload dedups onto it
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+# A resumable upload in progress (see mediastore/uploads.py). Chunks are appended in order to a part file
+# under MEDIA_ROOT/blobs/uploads/, and `checksum` holds the running hash chain over them, so completing the
+# upload only moves the file into the blob store. `manage.py clear_upload_sessions` drops stale sessions.
+class UploadSession(models.Model):
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('complete', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    blob_name = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
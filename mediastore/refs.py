@@ -0,0 +1,138 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, F, FileField
+from django.utils import timezone
+
+from .models import MediaBlob
+from .storage import BLOB_PREFIX, ContentAddressedStorage, is_blob_name
+
+# Blobs nobody references are kept this long, so an upload whose row is not saved yet is never collected
+GRACE_HOURS = getattr(settings, 'MEDIA_BLOB_GRACE_HOURS', 24)
+
+
+def blob_fields():
+    """
+    (model, field) for every FileField / ImageField stored in a ContentAddressedStorage.
+    """
+    return [
+        (model, field)
+        for model in apps.get_models()
+        if not model._meta.proxy
+        for field in model._meta.local_concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def adjust_ref_counts(names, delta):
+    counts = Counter(name for name in names if is_blob_name(name))
+    for times in set(counts.values()):
+        MediaBlob.objects.filter(name__in=[name for name, count in counts.items() if count == times]).update(
+            ref_count=F('ref_count') + delta * times
+        )
+
+
+def count_references():
+    # Mark phase: blob name -> number of rows pointing at it, across every blob field
+    counts = Counter()
+    for model, field in blob_fields():
+        rows = (
+            model._base_manager.filter(**{f'{field.attname}__startswith': BLOB_PREFIX})
+            .values(field.attname).annotate(references=Count('pk')).order_by()
+        )
+        for row in rows:
+            counts[row[field.attname]] += row['references']
+    return counts
+
+
+def sync_reference_counts():
+    """
+    Re-derive every MediaBlob.ref_count from the tables; bulk updates and deletes skip the signals
+    that keep it incrementally. Returns the number of blobs whose count was corrected.
+    """
+    counts = count_references()
+    stale = []
+    for blob in MediaBlob.objects.only('id', 'name', 'ref_count').iterator():
+        if blob.ref_count != counts.get(blob.name, 0):
+            blob.ref_count = counts.get(blob.name, 0)
+            stale.append(blob)
+    MediaBlob.objects.bulk_update(stale, ['ref_count'], batch_size=500)
+    return len(stale)
+
+
+def collect_garbage(grace_hours=GRACE_HOURS, dry_run=False):
+    """
+    Delete blobs (rows and files) with no references that nobody uploaded within the grace period,
+    plus temporary files left by interrupted uploads. Returns (blobs removed, bytes freed).
+    """
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    with transaction.atomic():
+        sync_reference_counts()
+        orphans = list(
+            MediaBlob.objects.select_for_update()
+            .filter(ref_count__lte=0, last_uploaded_at__lt=cutoff).values_list('id', 'name', 'size')
+        )
+        if not dry_run:
+            MediaBlob.objects.filter(id__in=[blob_id for blob_id, _, _ in orphans]).delete()
+
+    if not dry_run:
+        storage = get_blob_storage()
+        for _, name, _ in orphans:
+            storage.purge(name)
+        _remove_stale_temp_files(storage, cutoff)
+    return len(orphans), sum(size for _, _, size in orphans)
+
+
+def adopt_existing_files(dry_run=False):
+    """
+    Move files saved before the content-addressed storage into blobs: each distinct old path is stored
+    once, every row pointing at it is repointed, and the old file is removed. Returns (paths adopted, rows updated).
+    """
+    adopted, updated = {}, 0
+    storage = get_blob_storage()
+    for model, field in blob_fields():
+        old_names = (
+            model._base_manager.exclude(**{f'{field.attname}__startswith': BLOB_PREFIX})
+            .exclude(**{field.attname: ''}).exclude(**{f'{field.attname}__isnull': True})
+            .values_list(field.attname, flat=True).distinct().order_by()
+        )
+        for old_name in list(old_names):
+            if old_name not in adopted:
+                if not storage.exists(old_name):
+                    continue
+                if dry_run:
+                    adopted[old_name] = None
+                    continue
+                with storage.open(old_name, 'rb') as old_file:
+                    adopted[old_name] = storage.save(old_name, File(old_file))
+            if not dry_run:
+                # queryset.update() skips the reference-count signals; the sync below accounts for it
+                updated += model._base_manager.filter(**{field.attname: old_name}).update(
+                    **{field.attname: adopted[old_name]}
+                )
+    if not dry_run:
+        # Old paths go only once every field pointing at them has been repointed
+        for old_name in adopted:
+            storage.purge(old_name)
+        sync_reference_counts()
+    return len(adopted), updated
+
+
+def get_blob_storage():
+    # The storage every blob field shares (the default storage)
+    fields = blob_fields()
+    return fields[0][1].storage if fields else ContentAddressedStorage()
+
+
+def _remove_stale_temp_files(storage, cutoff):
+    temp_dir = storage.path(os.path.join(BLOB_PREFIX, 'tmp'))
+    if not os.path.isdir(temp_dir):
+        return
+    for entry in os.scandir(temp_dir):
+        if entry.is_file() and entry.stat().st_mtime < cutoff.timestamp():
+            os.unlink(entry.path)
@@ -0,0 +1,66 @@
+from django.urls import reverse
+from rest_framework import serializers
+from .models import UploadSession
+from .images import IMAGE_VARIANTS, image_variant_urls
+from .uploads import CHUNK_SIZE, MAX_CHUNK_SIZE, MAX_UPLOAD_SIZE, MIN_CHUNK_SIZE, resolve_upload
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.IntegerField(default=CHUNK_SIZE, min_value=MIN_CHUNK_SIZE, max_value=MAX_CHUNK_SIZE)
+    size = serializers.IntegerField(min_value=1, max_value=MAX_UPLOAD_SIZE)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'chunk_size', 'received', 'checksum', 'status', 'created_at', 'updated_at']
+        read_only_fields = ['received', 'checksum', 'status', 'created_at', 'updated_at']
+
+
+class UploadedFileField(serializers.FileField):
+    """
+    FileField that also accepts the id of a completed resumable upload (see mediastore/uploads.py) owned by
+    the requesting user; the upload's blob is attached as is, without copying it. With `url_name`, the file is
+    rendered as that access-checked view (reversed with the row's pk) instead of its /media/ URL.
+    """
+
+    def __init__(self, url_name=None, **kwargs):
+        self.url_name = url_name
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            return resolve_upload(data, self.context['request'].user)
+        return super().to_internal_value(data)
+
+    def to_representation(self, value):
+        if not value or self.url_name is None:
+            return super().to_representation(value)
+        url = reverse(self.url_name, kwargs={'pk': value.instance.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+class ImageVariantsField(serializers.ImageField):
+    """
+    ImageField that renders the pre-generated variants of the image (see mediastore/images.py) instead of the
+    original file: {"src": default variant, "srcset": "<url> <width>w, ...", "variants": {name: url}}.
+    Uploads are accepted as before.
+    """
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        spec = IMAGE_VARIANTS[self.kind]
+        request = self.context.get('request')
+        urls = {
+            variant: request.build_absolute_uri(url) if request is not None else url
+            for variant, url in image_variant_urls(self.kind, value.name).items()
+        }
+        return {
+            'src': urls[spec['default']],
+            'srcset': ', '.join(f'{urls[variant]} {width}w' for variant, (width, _) in spec['sizes'].items()),
+            'variants': urls,
+        }
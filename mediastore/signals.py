@@ -0,0 +1,78 @@
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .images import IMAGE_VARIANTS, schedule_derivatives
+
+from .refs import adjust_ref_counts, blob_fields
+
+# Incremental MediaBlob.ref_count upkeep for every blob-backed FileField. The names loaded with an
+# instance are remembered on it, so a save only touches the counters of the files that changed.
+_STASH = '_mediastore_names'
+
+
+def _field_name(instance, field):
+    value = instance.__dict__.get(field.attname)
+    return getattr(value, 'name', value) or None
+
+
+def _remember_names(sender, instance, **kwargs):
+    setattr(instance, _STASH, {
+        field.attname: _field_name(instance, field)
+        for field in sender._mediastore_fields if field.attname in instance.__dict__
+    })
+
+
+def _count_saved_names(sender, instance, created=False, update_fields=None, **kwargs):
+    # A new row referenced nothing before, whatever it was constructed with
+    remembered = {} if created else getattr(instance, _STASH, {})
+    added, removed = [], []
+    for field in sender._mediastore_fields:
+        # Deferred fields that were never loaded, or left out of update_fields, were not written
+        if field.attname not in instance.__dict__ or (update_fields is not None and field.name not in update_fields):
+            continue
+        old, new = remembered.get(field.attname), _field_name(instance, field)
+        if old != new:
+            added.append(new)
+            removed.append(old)
+        remembered[field.attname] = new
+    setattr(instance, _STASH, remembered)
+    adjust_ref_counts(added, 1)
+    adjust_ref_counts(removed, -1)
+
+
+def _count_deleted_names(sender, instance, **kwargs):
+    remembered = getattr(instance, _STASH, {})
+    adjust_ref_counts(
+        [remembered.get(field.attname, _field_name(instance, field)) for field in sender._mediastore_fields], -1
+    )
+
+
+def connect_reference_counting():
+    fields_by_model = {}
+    for model, field in blob_fields():
+        fields_by_model.setdefault(model, []).append(field)
+    for model, fields in fields_by_model.items():
+        model._mediastore_fields = fields
+        post_init.connect(_remember_names, sender=model, dispatch_uid=f'mediastore-init-{model._meta.label}')
+        post_save.connect(_count_saved_names, sender=model, dispatch_uid=f'mediastore-save-{model._meta.label}')
+        post_delete.connect(_count_deleted_names, sender=model, dispatch_uid=f'mediastore-delete-{model._meta.label}')
+
+
+def _schedule_image_derivatives(sender, instance, **kwargs):
+    for kind, attname in sender._mediastore_images:
+        name = _field_name(instance, sender._meta.get_field(attname))
+        if name:
+            transaction.on_commit(partial(schedule_derivatives, kind, name))
+
+
+def connect_image_derivatives():
+    images_by_model = {}
+    for kind, spec in IMAGE_VARIANTS.items():
+        label, field_name = spec['field']
+        images_by_model.setdefault(apps.get_model(label), []).append((kind, field_name))
+    for model, images in images_by_model.items():
+        model._mediastore_images = images
+        post_save.connect(_schedule_image_derivatives, sender=model, dispatch_uid=f'mediastore-images-{model._meta.label}')
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+# Uploads are stored by content: blobs/ab/cd/<sha256><ext>. The two-level shard keeps every directory
+# under 65k entries, a byte-identical re-upload resolves to the existing blob instead of a renamed copy,
+# and a blob never changes once written, so backups only have to pick up new files.
+BLOB_PREFIX = 'blobs/'
+DERIVATIVE_PREFIX = 'derivatives/'
+MAX_EXTENSION_LENGTH = 16
+
+
+def blob_name(digest, extension='', parts=None):
+    # Chunked uploads are addressed by a hash chain over their parts (see mediastore/uploads.py), marked -<parts>
+    suffix = f'-{parts}' if parts else ''
+    return f'{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{suffix}{extension}'
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(BLOB_PREFIX)
+
+
+def derivative_dir(name):
+    # Resized variants of an image live beside each other, keyed by the source name (see mediastore/images.py)
+    stem = os.path.splitext(name[len(BLOB_PREFIX):] if is_blob_name(name) else name)[0]
+    return f'{DERIVATIVE_PREFIX}{stem}/'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that ignores the upload path and files each upload under the SHA-256 of its bytes,
+    hashed while it is streamed to a temporary file. The original extension is kept so content types can
+    still be guessed from the name. delete() leaves blobs alone: they may be shared, and unreferenced ones
+    are removed by mediastore.refs.collect_garbage.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is decided from the content in _save(); never rename to avoid a collision
+        return name
+
+    def _save(self, name, content):
+        temp_dir = self.path(os.path.join(BLOB_PREFIX, 'tmp'))
+        os.makedirs(temp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+                    size += len(chunk)
+            return self.save_hashed(temp_path, digest.hexdigest(), size, name)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def save_hashed(self, path, digest, size, original_name, parts=None):
+        """
+        Move a file that was hashed while it was written (at `path`, under MEDIA_ROOT) into the store without
+        reading it again, and register its blob. Returns the blob name.
+        """
+        from .models import MediaBlob     # Storages are built before the app registry is ready
+
+        extension = os.path.splitext(original_name)[1].lower()
+        extension = extension if len(extension) <= MAX_EXTENSION_LENGTH else ''
+        name = blob_name(digest, extension, parts)
+        target = self.path(name)
+        if os.path.exists(target):
+            os.unlink(path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+            # Same filesystem, so the blob appears atomically and concurrent identical uploads are harmless
+            os.replace(path, target)
+
+        blob, created = MediaBlob.objects.get_or_create(name=name, defaults={'sha256': digest, 'size': size})
+        if not created:
+            # Keeps a blob that is about to be referenced again out of the current GC grace window
+            MediaBlob.objects.filter(pk=blob.pk).update(last_uploaded_at=timezone.now())
+        return name
+
+    def delete(self, name):
+        if not is_blob_name(name):
+            super().delete(name)
+
+    def purge(self, name):
+        # Physically remove a blob and its image derivatives; only the garbage collector calls this
+        super().delete(name)
+        shutil.rmtree(self.path(derivative_dir(name)), ignore_errors=True)
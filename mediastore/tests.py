@@ -0,0 +1,216 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from content.models import Video
+from course.models import Author, Category, Course
+from .models import MediaBlob, UploadSession
+from .refs import collect_garbage, get_blob_storage, sync_reference_counts
+from .storage import blob_name
+from .uploads import UploadOffsetConflict, complete_upload, part_path, resolve_upload, write_chunk
+
+
+class MediaStoreTestCase(TestCase):
+    """
+    Runs against a throwaway MEDIA_ROOT.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.storage = get_blob_storage()
+
+
+class BlobReferenceTests(MediaStoreTestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Programming')
+        author = Author.objects.create(name='Ada')
+        self.course = Course.objects.create(category=category, author=author, title='Python', duration='10h')
+
+    def video(self, content, filename='lesson.MP4'):
+        video = Video(course=self.course, title=filename, duration=60)
+        video.video_file.save(filename, ContentFile(content))
+        return video
+
+    def blob(self, name):
+        return MediaBlob.objects.get(name=name)
+
+    def test_identical_uploads_share_one_blob(self):
+        digest = hashlib.sha256(b'same bytes').hexdigest()
+        first = self.video(b'same bytes', 'first.MP4')
+        second = self.video(b'same bytes', 'second.mp4')
+
+        self.assertEqual(first.video_file.name, blob_name(digest, '.mp4'))
+        self.assertEqual(first.video_file.name, f'blobs/{digest[:2]}/{digest[2:4]}/{digest}.mp4')
+        self.assertEqual(second.video_file.name, first.video_file.name)
+        self.assertEqual(MediaBlob.objects.count(), 1)
+        blob = self.blob(first.video_file.name)
+        self.assertEqual((blob.sha256, blob.size, blob.ref_count), (digest, 10, 2))
+
+    def test_replacing_and_deleting_move_the_counts(self):
+        video = self.video(b'old')
+        old_name = video.video_file.name
+        video = Video.objects.get(pk=video.pk)
+        video.video_file.save('new.mp4', ContentFile(b'new'))
+        self.assertEqual(self.blob(old_name).ref_count, 0)
+        self.assertEqual(self.blob(video.video_file.name).ref_count, 1)
+
+        # Saving again without touching the file changes nothing
+        video.title = 'Renamed'
+        video.save()
+        self.assertEqual(self.blob(video.video_file.name).ref_count, 1)
+
+        name = video.video_file.name
+        video.delete()
+        self.assertEqual(self.blob(name).ref_count, 0)
+        # Blobs are only removed by the garbage collector
+        self.assertTrue(self.storage.exists(name))
+
+    def test_sync_repairs_counts_skipped_by_bulk_updates(self):
+        video = self.video(b'bulk')
+        name = video.video_file.name
+        Video.objects.filter(pk=video.pk).update(video_file='')
+        self.assertEqual(self.blob(name).ref_count, 1)
+
+        self.assertEqual(sync_reference_counts(), 1)
+        self.assertEqual(self.blob(name).ref_count, 0)
+        self.assertEqual(sync_reference_counts(), 0)
+
+    def test_garbage_collection_respects_references_and_grace(self):
+        kept = self.video(b'kept').video_file.name
+        orphan = self.video(b'orphan')
+        recent = self.video(b'recent')
+        orphan_name, recent_name = orphan.video_file.name, recent.video_file.name
+        orphan.delete()
+        recent.delete()
+        MediaBlob.objects.exclude(name=recent_name).update(last_uploaded_at=timezone.now() - timedelta(hours=48))
+
+        self.assertEqual(collect_garbage(grace_hours=24, dry_run=True), (1, 6))
+        self.assertTrue(self.storage.exists(orphan_name))
+
+        self.assertEqual(collect_garbage(grace_hours=24), (1, 6))
+        self.assertFalse(MediaBlob.objects.filter(name=orphan_name).exists())
+        self.assertFalse(os.path.exists(self.storage.path(orphan_name)))
+        self.assertTrue(self.storage.exists(kept))
+        self.assertTrue(self.storage.exists(recent_name))
+        self.assertEqual(collect_garbage(grace_hours=24), (0, 0))
+
+
+class ResumableUploadTests(MediaStoreTestCase):
+    chunk_size = 256 * 1024
+
+    def setUp(self):
+        super().setUp()
+        self.owner = CustomUser.objects.create_user(email='staff@example.com', password='x', role='staff', is_active=True)
+        self.content = os.urandom(self.chunk_size * 2 + 1000)
+        self.chunks = [self.content[i:i + self.chunk_size] for i in range(0, len(self.content), self.chunk_size)]
+        self.session = UploadSession.objects.create(
+            owner=self.owner, filename='lecture.mp4', size=len(self.content), chunk_size=self.chunk_size,
+        )
+
+    def write(self, index, body=None):
+        chunk = self.chunks[index]
+        return write_chunk(self.session, index * self.chunk_size, len(chunk), io.BytesIO(chunk if body is None else body))
+
+    def expected_checksum(self):
+        checksum = None
+        for chunk in self.chunks:
+            digest = hashlib.sha256(chunk).digest()
+            checksum = hashlib.sha256(bytes.fromhex(checksum) + digest).hexdigest() if checksum else digest.hex()
+        return checksum
+
+    def test_chunks_then_complete(self):
+        for index in range(len(self.chunks)):
+            self.session = self.write(index)
+        self.assertEqual(self.session.received, len(self.content))
+        self.assertEqual(self.session.checksum, self.expected_checksum())
+
+        session = complete_upload(self.session, checksum=self.session.checksum.upper())
+        self.assertEqual(session.status, 'complete')
+        self.assertEqual(session.blob_name, blob_name(self.expected_checksum(), '.mp4', parts=3))
+        with self.storage.open(session.blob_name, 'rb') as blob:
+            self.assertEqual(blob.read(), self.content)
+        self.assertFalse(os.path.exists(part_path(session)))
+        self.assertEqual(resolve_upload(session.pk, self.owner), session.blob_name)
+        # Completing twice is a no-op
+        self.assertEqual(complete_upload(session).blob_name, session.blob_name)
+
+    def test_single_chunk_upload_dedups_with_regular_uploads(self):
+        self.session = UploadSession.objects.create(owner=self.owner, filename='notes.pdf', size=1000, chunk_size=self.chunk_size)
+        write_chunk(self.session, 0, 1000, io.BytesIO(self.content[:1000]))
+        session = complete_upload(self.session)
+        self.assertEqual(session.blob_name, blob_name(hashlib.sha256(self.content[:1000]).hexdigest(), '.pdf'))
+
+    def test_wrong_offset_is_a_conflict(self):
+        with self.assertRaises(UploadOffsetConflict):
+            self.write(1)
+        self.session = self.write(0)
+        with self.assertRaises(UploadOffsetConflict):
+            self.write(0)
+        self.assertEqual(UploadSession.objects.get(pk=self.session.pk).received, self.chunk_size)
+
+    def test_chunk_length_must_match_chunk_size(self):
+        with self.assertRaises(ValidationError):
+            write_chunk(self.session, 0, 1000, io.BytesIO(self.content[:1000]))
+        self.assertEqual(UploadSession.objects.get(pk=self.session.pk).received, 0)
+
+    def test_short_body_leaves_the_session_where_it_was(self):
+        self.session = self.write(0)
+        with self.assertRaises(ValidationError):
+            self.write(1, body=self.chunks[1][:1000])
+        session = UploadSession.objects.get(pk=self.session.pk)
+        self.assertEqual(session.received, self.chunk_size)
+        self.assertEqual(os.path.getsize(part_path(session)), self.chunk_size)
+
+        # The resent chunk overwrites the partial one
+        self.write(1)
+        self.session = self.write(2)
+        self.assertEqual(complete_upload(self.session, checksum=self.expected_checksum()).status, 'complete')
+
+    def test_incomplete_or_mismatched_uploads_cannot_complete(self):
+        self.session = self.write(0)
+        with self.assertRaises(ValidationError):
+            complete_upload(self.session)
+        self.write(1)
+        self.write(2)
+        with self.assertRaises(ValidationError):
+            complete_upload(self.session, checksum='0' * 64)
+
+    def test_put_chunks_over_http(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        url = f'/uploads/{self.session.pk}/'
+
+        def put(index, start=None):
+            start = index * self.chunk_size if start is None else start
+            end = start + len(self.chunks[index]) - 1
+            return client.generic('PUT', url, self.chunks[index], content_type='application/octet-stream',
+                                  headers={'Content-Range': f'bytes {start}-{end}/{len(self.content)}'})
+
+        self.assertEqual(client.generic('PUT', url, b'x', content_type='application/octet-stream').status_code, 400)
+        self.assertEqual(put(0).data['received'], self.chunk_size)
+        response = put(0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(int(response.data['received']), self.chunk_size)
+        put(1)
+        put(2)
+        response = client.post(f'/uploads/{self.session.pk}/complete/', {'checksum': self.expected_checksum()}, format='json')
+        self.assertEqual(response.data['status'], 'complete')
+
+        stranger = CustomUser.objects.create_user(email='other@example.com', password='x', role='staff', is_active=True)
+        client.force_authenticate(stranger)
+        self.assertEqual(client.get(url).status_code, 404)
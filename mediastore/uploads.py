@@ -0,0 +1,141 @@
+import hashlib
+import math
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import UploadSession
+from .refs import get_blob_storage
+from .storage import BLOB_PREFIX
+
+# Resumable uploads: create a session, PUT its chunks in order (each one `chunk_size` bytes except the last),
+# then complete it. Every chunk is streamed straight into the session's part file while being hashed, and
+# the session's checksum is a hash chain over the chunk digests:
+#     checksum_1 = sha256(chunk_1),  checksum_n = sha256(checksum_{n-1} || sha256(chunk_n))
+# so it is always up to date in 32 bytes of state. A single-chunk upload's checksum is its plain SHA-256 and
+# dedups with regular uploads; multi-chunk blobs are named <checksum>-<chunks>.
+CHUNK_SIZE = getattr(settings, 'RESUMABLE_UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+MAX_UPLOAD_SIZE = getattr(settings, 'RESUMABLE_UPLOAD_MAX_SIZE', 5 * 1024 ** 3)
+SESSION_TTL_HOURS = getattr(settings, 'RESUMABLE_UPLOAD_TTL_HOURS', 24)
+UPLOAD_DIR = f'{BLOB_PREFIX}uploads/'
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class UploadOffsetConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Chunk does not start at the next expected offset."
+
+
+def part_path(session):
+    return get_blob_storage().path(f'{UPLOAD_DIR}{session.pk}.part')
+
+
+def chunk_count(session):
+    return math.ceil(session.size / session.chunk_size)
+
+
+def write_chunk(session, start, length, stream):
+    """
+    Write the `length` bytes read from `stream` at `start`, which must be the session's next offset.
+    A chunk cut short leaves the session where it was, so the client can simply resend it.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.status != 'open':
+            raise ValidationError({"error": "This upload is already complete."})
+        if start != session.received:
+            raise UploadOffsetConflict({"error": "Chunk does not start at the next expected offset.", "received": session.received})
+        if length != min(session.chunk_size, session.size - start):
+            raise ValidationError({"error": f"Chunks must be {session.chunk_size} bytes, except the last one."})
+
+        path = part_path(session)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        digest = hashlib.sha256()
+        written = 0
+        with open(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b') as part:
+            part.truncate(start)    # Drops whatever an interrupted attempt at this chunk left behind
+            part.seek(start)
+            while written < length:
+                block = stream.read(min(READ_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                part.write(block)
+                digest.update(block)
+                written += len(block)
+            if written != length:
+                part.truncate(start)
+                raise ValidationError({"error": "Chunk body is shorter than its Content-Range.", "received": session.received})
+
+        chunk_digest = digest.digest()
+        session.checksum = (
+            hashlib.sha256(bytes.fromhex(session.checksum) + chunk_digest).hexdigest() if session.checksum
+            else chunk_digest.hex()
+        )
+        session.received += length
+        session.save(update_fields=['checksum', 'received', 'updated_at'])
+    return session
+
+
+def complete_upload(session, checksum=None):
+    """
+    Move the finished part file into the blob store under its checksum; no byte is read again.
+    Completing an already complete session is a no-op.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.status == 'complete':
+            return session
+        if session.received != session.size:
+            raise ValidationError({"error": "The upload is not finished yet.", "received": session.received})
+        if checksum and checksum.lower() != session.checksum:
+            raise ValidationError({"error": "Checksum mismatch; abort the upload and start again."})
+
+        chunks = chunk_count(session)
+        session.blob_name = get_blob_storage().save_hashed(
+            part_path(session), session.checksum, session.size, session.filename, parts=chunks if chunks > 1 else None,
+        )
+        session.status = 'complete'
+        session.save(update_fields=['blob_name', 'status', 'updated_at'])
+    return session
+
+
+def abort_upload(session):
+    path = part_path(session)
+    if session.status == 'open' and os.path.exists(path):
+        os.unlink(path)
+    session.delete()
+
+
+def resolve_upload(upload_id, user):
+    """
+    Blob name of a completed upload owned by `user`, for assigning to a FileField.
+    """
+    try:
+        session = UploadSession.objects.filter(pk=uuid.UUID(str(upload_id)), owner=user, status='complete').only('blob_name').first()
+    except ValueError:
+        session = None
+    if session is None:
+        raise ValidationError("No completed upload with this id.")
+    return session.blob_name
+
+
+def clear_stale_sessions(ttl_hours=SESSION_TTL_HOURS):
+    """
+    Delete sessions untouched for `ttl_hours`, with the part files of unfinished ones. Blobs of completed
+    but never attached uploads are left to the blob garbage collector. Returns the number deleted.
+    """
+    stale = UploadSession.objects.filter(updated_at__lt=timezone.now() - timedelta(hours=ttl_hours))
+    for session in stale.filter(status='open').only('id', 'status').iterator():
+        path = part_path(session)
+        if os.path.exists(path):
+            os.unlink(path)
+    deleted, _ = stale.delete()
+    return deleted
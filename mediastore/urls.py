@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import ImageVariantView, UploadSessionCompleteView, UploadSessionCreateView, UploadSessionDetailView
+
+app_name = "mediastore"
+
+urlpatterns = [
+    path('uploads/', UploadSessionCreateView.as_view(), name='upload-session-create'),
+    path('uploads/<uuid:upload_id>/', UploadSessionDetailView.as_view(), name='upload-session-detail'),
+    path('uploads/<uuid:upload_id>/complete/', UploadSessionCompleteView.as_view(), name='upload-session-complete'),
+    path('images/<slug:kind>/<slug:variant>/<path:name>', ImageVariantView.as_view(), name='image-variant'),
+]
@@ -0,0 +1,99 @@
+import re
+
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.views.static import serve
+from rest_framework import generics, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .images import (
+    IMAGE_VARIANTS, build_derivatives, derivative_name, get_image_model_field, has_derivatives, is_public_media,
+)
+from .models import UploadSession
+from .refs import get_blob_storage
+from .serializers import UploadSessionSerializer
+from .uploads import abort_upload, complete_upload, write_chunk
+
+_CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+# Start a resumable upload: POST {filename, size[, chunk_size]}
+class UploadSessionCreateView(generics.CreateAPIView):
+    serializer_class = UploadSessionSerializer
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+
+class UploadSessionMixin:
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_session(self, request, upload_id):
+        # Someone else's upload is indistinguishable from a missing one
+        return get_object_or_404(UploadSession, pk=upload_id, owner=request.user)
+
+
+# GET: progress (resume from `received`); PUT: raw chunk bytes with `Content-Range: bytes start-end/size`; DELETE: abort
+class UploadSessionDetailView(UploadSessionMixin, APIView):
+
+    def get(self, request, upload_id):
+        return Response(UploadSessionSerializer(self.get_session(request, upload_id)).data)
+
+    def put(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        match = _CONTENT_RANGE_RE.match(request.headers.get('Content-Range', ''))
+        if not match:
+            return Response({"error": "Content-Range: bytes <start>-<end>/<size> is required."}, status=status.HTTP_400_BAD_REQUEST)
+        start, end, total = map(int, match.groups())
+        if total != session.size or end < start:
+            return Response({"error": "Content-Range does not match this upload."}, status=status.HTTP_400_BAD_REQUEST)
+        # The body is read straight from the request stream; DRF's parsers are never involved
+        session = write_chunk(session, start, end - start + 1, request.stream)
+        return Response(UploadSessionSerializer(session).data)
+
+    def delete(self, request, upload_id):
+        abort_upload(self.get_session(request, upload_id))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# Finish the upload: POST [{checksum}]. The returned id is then sent in place of the file to the
+# video, course section or assignment submission endpoints.
+class UploadSessionCompleteView(UploadSessionMixin, APIView):
+
+    def post(self, request, upload_id):
+        session = complete_upload(self.get_session(request, upload_id), checksum=request.data.get('checksum'))
+        return Response(UploadSessionSerializer(session).data)
+
+
+# Lazy image variant: built on first request if the worker pool has not got to it yet, then redirected to
+class ImageVariantView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, kind, variant, name):
+        spec = IMAGE_VARIANTS.get(kind)
+        if spec is None or variant not in spec['sizes']:
+            raise Http404
+        model, field_name = get_image_model_field(kind)
+        # Only images stored in that kind's field are ever processed
+        if not model._base_manager.filter(**{field_name: name}).exists():
+            raise Http404
+        storage = get_blob_storage()
+        if not has_derivatives(kind, name) and not build_derivatives(kind, name):
+            return HttpResponseRedirect(storage.url(name))
+        return HttpResponseRedirect(storage.url(derivative_name(name, variant)))
+
+
+def public_media(request, path, document_root=None):
+    # Development stand-in for the front proxy's /media/ location (mounted only with DEBUG): image
+    # derivatives and public images only, so protected files cannot bypass their views
+    if not is_public_media(path):
+        raise Http404
+    return serve(request, path, document_root=document_root)
@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.conf import settings
 from accounts.models import CustomUser
 from course.models import Enrollment
+from mediastore.serializers import ImageVariantsField, UploadedFileField
 
 from .models import (
     ContactInfo, WorkExperience, Education,
@@ -16,6 +17,7 @@ User = settings.AUTH_USER_MODEL
 class UserProfileSerializer(serializers.ModelSerializer):
     profile_completion = serializers.SerializerMethodField()
     courses = serializers.SerializerMethodField()
+    profile_image = ImageVariantsField('profile-image', required=False, allow_null=True)
 
     class Meta:
         model = CustomUser
@@ -128,6 +130,7 @@ class AdditionalLinkSerializer(serializers.ModelSerializer):
 
 class AdditionalInfoSerializer(serializers.ModelSerializer):
     links = AdditionalLinkSerializer(many=True, read_only=True)
+    resume = UploadedFileField(url_name="additional-info-resume", required=False, allow_null=True)
 
     class Meta:
         model = AdditionalInfo
@@ -5,7 +5,7 @@ from .views import (
     EducationListCreateView, EducationDetailView,
     BadgeListCreateView, BadgeDetailView,
     WorkPreferenceView,
-    AdditionalInfoView, AdditionalLinkListCreateView, AdditionalLinkDetailView
+    AdditionalInfoView, ResumeFileView, AdditionalLinkListCreateView, AdditionalLinkDetailView
 )
 
 urlpatterns = [
@@ -26,6 +26,7 @@ urlpatterns = [
     path("work-preference/", WorkPreferenceView.as_view(), name="work-preference"),
 
     path("additional-info/", AdditionalInfoView.as_view(), name="additional-info"),
+    path("additional-info/<int:pk>/resume/", ResumeFileView.as_view(), name="additional-info-resume"),
     path("additional-links/", AdditionalLinkListCreateView.as_view(), name="additional-links"),
     path("additional-links/<int:pk>/", AdditionalLinkDetailView.as_view(), name="additional-link-detail"),
 ]
@@ -1,5 +1,6 @@
 # Create your views here.
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
@@ -17,6 +18,7 @@ from .serializers import (
     AdditionalInfoSerializer, AdditionalLinkSerializer
 )
 from .permissions import IsOwnerOrReadOnly, IsAdmin, IsStaffOrAdmin
+from lms.media import serve_media
 
 User = settings.AUTH_USER_MODEL
 class MyProfileView(APIView):
@@ -146,18 +148,31 @@ class AdditionalInfoView(APIView):
 
     def get(self, request):
         info, _ = AdditionalInfo.objects.get_or_create(user=request.user)
-        serializer = AdditionalInfoSerializer(info)
+        serializer = AdditionalInfoSerializer(info, context={"request": request})
         return Response(serializer.data)
 
     def patch(self, request):
         info, _ = AdditionalInfo.objects.get_or_create(user=request.user)
-        serializer = AdditionalInfoSerializer(info, data=request.data, partial=True)
+        serializer = AdditionalInfoSerializer(info, data=request.data, partial=True, context={"request": request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
 
 
+class ResumeFileView(APIView):
+    # Uploaded resume, for its owner and for staff / admins
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        info = get_object_or_404(AdditionalInfo.objects.only("id", "user_id", "resume"), pk=pk)
+        if info.user_id != request.user.id and request.user.role not in ["staff", "admin"]:
+            raise PermissionDenied("You cannot access this resume.")
+        if not info.resume:
+            return Response({"error": "No resume uploaded."}, status=404)
+        return serve_media(request, info.resume)
+
+
 class AdditionalLinkListCreateView(generics.ListCreateAPIView):
     serializer_class = AdditionalLinkSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -9,6 +9,7 @@ from .serializers import (
     SendNotificationSerializer
 )
 from accounts.permissions import IsAdmin, IsStaff
+from lms.mixins import SparseFieldsetMixin
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.conf import settings
@@ -16,9 +17,10 @@ from django.conf import settings
 User = get_user_model()
 
 # 1. List Notifications for Logged-in User
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user).order_by('-created_at')
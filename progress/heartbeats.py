@@ -0,0 +1,196 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from content.models import Video
+from .models import VideoProgress
+from .rollups import record_video_completion_changes
+from .utils import bump_learner_progress_versions
+from .watchlog import record_watch_events
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background flushes; 0 writes every heartbeat through immediately
+FLUSH_INTERVAL = getattr(settings, 'VIDEO_HEARTBEAT_FLUSH_INTERVAL', 5)
+# Bound on distinct (student, video) pairs held in memory; past it, heartbeats are rejected (429)
+MAX_PENDING = getattr(settings, 'VIDEO_HEARTBEAT_MAX_PENDING', 10000)
+# A flush starts early once the buffer is this full
+HIGH_WATER_MARK = 0.8
+COMPLETION_RATIO = 0.9
+UPSERT_BATCH_SIZE = 500
+VIDEO_DURATION_CACHE_TIMEOUT = 600
+
+
+def get_video_duration(video_id):
+    """
+    Cached duration lookup so heartbeats don't hit the video table; None if the video doesn't exist.
+    """
+    key = f'video_duration:{video_id}'
+    duration = cache.get(key)
+    if duration is None:
+        duration = Video.objects.filter(pk=video_id).values_list('duration', flat=True).first()
+        if duration is not None:
+            cache.set(key, duration, VIDEO_DURATION_CACHE_TIMEOUT)
+    return duration
+
+
+def reached_completion(watched_seconds, duration):
+    return watched_seconds >= int(duration * COMPLETION_RATIO)
+
+
+def upsert_video_progress(entries, durations=None):
+    """
+    Write {(student_id, video_id): watched_seconds} in one transaction and return the rows written.
+    watched_seconds never decreases and is_completed stays set once reached; rows that become
+    completed move the syllabus/course completion rollups, and the progress made is appended to the watch log.
+    `durations` ({video_id: seconds}) saves the video lookup when the caller already has it.
+
+    Missing rows are inserted first and every row is then read locked, so concurrent writers of the same
+    (student, video) (other workers' buffers, the batch endpoint) serialize on it: each one sees what the
+    other wrote, and a completion or a watched second is never counted twice.
+    """
+    video_ids = {video_id for _, video_id in entries}
+    if durations is None:
+        durations = dict(Video.objects.filter(pk__in=video_ids).values_list('id', 'duration'))
+    entries = {key: watched_seconds for key, watched_seconds in entries.items() if key[1] in durations}
+    if not entries:
+        return []    # Videos deleted since the heartbeats were accepted
+    student_ids = {student_id for student_id, _ in entries}
+
+    now = timezone.now()
+    rows, completions, watched = [], [], []
+    with transaction.atomic():
+        VideoProgress.objects.bulk_create(
+            [VideoProgress(student_id=student_id, video_id=video_id) for student_id, video_id in entries],
+            batch_size=UPSERT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        existing = {
+            (row.student_id, row.video_id): row
+            for row in VideoProgress.objects.select_for_update()
+            .filter(student_id__in=student_ids, video_id__in={video_id for _, video_id in entries})
+            .only('id', 'student_id', 'video_id', 'watched_seconds', 'is_completed')
+        }
+
+        for (student_id, video_id), watched_seconds in entries.items():
+            row = existing[(student_id, video_id)]
+            watched_seconds = max(watched_seconds, row.watched_seconds)
+            watched.append((student_id, video_id, watched_seconds - row.watched_seconds))
+            if not row.is_completed and reached_completion(watched_seconds, durations[video_id]):
+                row.is_completed = True
+                completions.append((student_id, video_id, True))
+            row.watched_seconds, row.last_watched_on = watched_seconds, now
+            rows.append(row)
+
+        VideoProgress.objects.bulk_update(
+            rows, ['watched_seconds', 'is_completed', 'last_watched_on'], batch_size=UPSERT_BATCH_SIZE,
+        )
+        record_video_completion_changes(completions)
+        record_watch_events(watched, occurred_at=now)
+        bump_learner_progress_versions(row.student_id for row in rows)
+    return rows
+
+
+class HeartbeatBuffer:
+    """
+    In-process write-behind buffer for video watch heartbeats.
+
+    Heartbeats are coalesced per (student_id, video_id), keeping the max watched_seconds, and written
+    by a background thread in one batched write per flush. Completion is evaluated at flush time against
+    the stored row, so it stays set once reached. Entries of a failed flush are merged back and retried,
+    and a final flush runs at interpreter shutdown.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, max_pending=MAX_PENDING):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, student_id, video_id, watched_seconds):
+        """
+        Queue a heartbeat. Returns False when the buffer is full and the caller should back off.
+        """
+        if self.flush_interval <= 0:
+            upsert_video_progress({(student_id, video_id): watched_seconds})
+            return True
+
+        key = (student_id, video_id)
+        with self._lock:
+            if key not in self._pending and len(self._pending) >= self.max_pending:
+                self._wake.set()
+                return False
+            self._pending[key] = max(self._pending.get(key, 0), watched_seconds)
+            size = len(self._pending)
+
+        self._ensure_started()
+        if size >= self.max_pending * HIGH_WATER_MARK:
+            self._wake.set()
+        return True
+
+    def _merge(self, entries):
+        with self._lock:
+            for key, watched_seconds in entries.items():
+                self._pending[key] = max(self._pending.get(key, 0), watched_seconds)
+
+    def flush(self):
+        """
+        Write everything buffered so far. Returns the number of progress rows upserted.
+        """
+        with self._flush_lock:
+            with self._lock:
+                entries, self._pending = self._pending, {}
+            if not entries:
+                return 0
+            try:
+                return len(upsert_video_progress(entries))
+            except Exception:
+                # Keep the heartbeats for the next attempt rather than dropping them
+                self._merge(entries)
+                raise
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='video-heartbeat-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Video heartbeat flush failed; %d pending entries kept for retry', len(self))
+                time.sleep(self.flush_interval)
+            finally:
+                close_old_connections()
+
+    def shutdown(self):
+        self._stopped.set()
+        self._wake.set()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Final video heartbeat flush failed; %d entries lost', len(self))
+
+
+heartbeat_buffer = HeartbeatBuffer()
+atexit.register(heartbeat_buffer.shutdown)
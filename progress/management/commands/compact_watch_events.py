@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from progress.watchlog import RETENTION_DAYS, compact_watch_events
+
+
+class Command(BaseCommand):
+    help = "Roll the raw video watch events into daily per-video and per-student aggregates, then prune old events."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=RETENTION_DAYS,
+                            help=f"Whole days of raw events to keep (default {RETENTION_DAYS}).")
+
+    def handle(self, *args, **options):
+        if options['retention_days'] < 1:
+            raise CommandError("--retention-days must be at least 1.")
+        written, pruned = compact_watch_events(retention_days=options['retention_days'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily aggregate row(s); pruned {pruned} raw event(s)."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from progress.rollups import rebuild_progress_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the video/syllabus completion rollups and Enrollment.progress_percent with set-based queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', dest='course_ids',
+                            help="Only rebuild this course (repeatable).")
+
+    def handle(self, *args, **options):
+        changed = rebuild_progress_rollups(course_ids=options['course_ids'])
+        scope = f"{len(options['course_ids'])} course(s)" if options['course_ids'] else "all courses"
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt progress rollups for {scope}; {changed} enrollment(s) changed progress."))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:28
+
+from django.db import migrations, models
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf, Round
+
+
+def count_of(queryset):
+    return Coalesce(Subquery(queryset.values(group=Value(1)).annotate(count=Count('*')).values('count')[:1]), 0)
+
+
+def backfill_progress_rollups(apps, schema_editor):
+    # Same computation as progress.rollups.rebuild_progress_rollups, on the historical models
+    Syllabus = apps.get_model('content', 'Syllabus')
+    Video = apps.get_model('content', 'Video')
+    Course = apps.get_model('course', 'Course')
+    Enrollment = apps.get_model('course', 'Enrollment')
+    SyllabusProgress = apps.get_model('progress', 'SyllabusProgress')
+    VideoProgress = apps.get_model('progress', 'VideoProgress')
+
+    Syllabus.objects.update(video_count=count_of(Video.objects.filter(syllabus_id=OuterRef('pk'))))
+    Course.objects.update(syllabus_count=count_of(Syllabus.objects.filter(course_id=OuterRef('pk'))))
+
+    pairs = (
+        VideoProgress.objects.filter(is_completed=True, video__syllabus__isnull=False)
+        .values_list('student_id', 'video__syllabus_id').distinct().order_by()
+    )
+    SyllabusProgress.objects.bulk_create(
+        [SyllabusProgress(student_id=student_id, syllabus_id=syllabus_id) for student_id, syllabus_id in pairs],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    SyllabusProgress.objects.update(completed_videos=count_of(
+        VideoProgress.objects.filter(student_id=OuterRef('student_id'), video__syllabus_id=OuterRef('syllabus_id'), is_completed=True)
+    ))
+
+    Enrollment.objects.update(completed_syllabi=count_of(
+        SyllabusProgress.objects.filter(student_id=OuterRef('user_id'), syllabus__course_id=OuterRef('course_id'), is_completed=True)
+    ))
+    total = Subquery(Course.objects.filter(pk=OuterRef('course_id')).values('syllabus_count')[:1])
+    Enrollment.objects.update(progress_percent=Coalesce(
+        Round(F('completed_syllabi') * Value(100.0) / NullIf(total, Value(0)), 2), Value(0.0), output_field=FloatField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0001_initial'),
+        ('content', '0004_syllabus_video_count'),
+        ('course', '0014_course_syllabus_count_enrollment_completed_syllabi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syllabusprogress',
+            name='completed_videos',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_progress_rollups, migrations.RunPython.noop),
+    ]
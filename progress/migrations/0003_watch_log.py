@@ -0,0 +1,56 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0004_syllabus_video_count'),
+        ('course', '0014_course_syllabus_count_enrollment_completed_syllabi'),
+        ('progress', '0002_syllabusprogress_completed_videos'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoWatchEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seconds', models.PositiveIntegerField()),
+                ('occurred_at', models.DateTimeField(db_index=True)),
+                ('student', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('video', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='content.video')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyStudentWatchTime',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('watch_seconds', models.PositiveBigIntegerField(default=0)),
+                ('videos', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('student', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyVideoWatchTime',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('watch_seconds', models.PositiveBigIntegerField(default=0)),
+                ('viewers', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='course.course')),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='content.video')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course', 'date'], name='progress_da_course__9f1646_idx')],
+                'unique_together': {('video', 'date')},
+            },
+        ),
+    ]
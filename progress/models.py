@@ -20,9 +20,48 @@ class SyllabusProgress(models.Model):
     syllabus = models.ForeignKey(Syllabus, on_delete=models.CASCADE)
     is_completed = models.BooleanField(default=False)
     completed_on = models.DateTimeField(null=True, blank=True)
+    completed_videos = models.PositiveIntegerField(default=0)      # Rollup counter, kept by progress.rollups
 
     class Meta:
         unique_together = ['student', 'syllabus']
 
     def __str__(self):
-        return f"{self.student} - {self.syllabus.title} - {'Completed' if self.is_completed else 'In Progress'}"
\ No newline at end of file
+        return f"{self.student} - {self.syllabus.title} - {'Completed' if self.is_completed else 'In Progress'}"
+
+# Append-only watch log, written in bulk with the progress upserts (see progress/heartbeats.py) and
+# compacted into the daily tables below by progress.watchlog.compact_watch_events. Only the
+# occurred_at index is kept so inserts stay cheap.
+class VideoWatchEvent(models.Model):
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, db_index=False)
+    seconds = models.PositiveIntegerField()     # Playback progress credited by this write
+    occurred_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.student_id} - {self.video_id} - {self.seconds}s @ {self.occurred_at}"
+
+class DailyVideoWatchTime(models.Model):
+    course = models.ForeignKey('course.Course', on_delete=models.CASCADE)
+    video = models.ForeignKey(Video, on_delete=models.CASCADE)
+    date = models.DateField()
+    watch_seconds = models.PositiveBigIntegerField(default=0)
+    viewers = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['video', 'date']
+        indexes = [models.Index(fields=['course', 'date'])]
+
+    def __str__(self):
+        return f"{self.video_id} on {self.date}: {self.watch_seconds}s"
+
+class DailyStudentWatchTime(models.Model):
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    date = models.DateField()
+    watch_seconds = models.PositiveBigIntegerField(default=0)
+    videos = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['student', 'date']
+
+    def __str__(self):
+        return f"{self.student_id} on {self.date}: {self.watch_seconds}s"
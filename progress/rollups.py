@@ -0,0 +1,184 @@
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf, Round
+from django.utils import timezone
+
+from content.models import Syllabus, Video
+from course.models import Course, Enrollment
+from .models import SyllabusProgress, VideoProgress
+
+# Completion rollups, maintained incrementally:
+#
+#     Syllabus.video_count                     videos in the syllabus
+#     Course.syllabus_count                    syllabus topics in the course
+#     SyllabusProgress.completed_videos        completed videos per (student, syllabus)
+#     Enrollment.completed_syllabi             completed syllabi per (student, course)
+#     Enrollment.progress_percent              completed_syllabi / syllabus_count
+#
+# Only completion flips touch them, with a couple of indexed reads and bulk writes.
+# Drift and content changes are repaired by rebuild_progress_rollups() (`manage.py rebuild_progress_rollups`).
+
+
+def completion_percent(completed, total):
+    return round(min(completed, total) / total * 100, 2) if total else 0.0
+
+
+@transaction.atomic
+def apply_syllabus_completion_changes(changes):
+    """
+    `changes` maps (student_id, course_id) to the net number of syllabi that became completed (negative
+    when un-completed). Updates the enrollment counters and progress_percent.
+    """
+    changes = {key: delta for key, delta in changes.items() if delta}
+    if not changes:
+        return
+    student_ids = {student_id for student_id, _ in changes}
+    course_ids = {course_id for _, course_id in changes}
+    totals = dict(Course.objects.filter(pk__in=course_ids).values_list('id', 'syllabus_count'))
+
+    enrollments = []
+    for enrollment in Enrollment.objects.select_for_update().filter(user_id__in=student_ids, course_id__in=course_ids):
+        delta = changes.get((enrollment.user_id, enrollment.course_id))
+        if delta is None:
+            continue
+        enrollment.completed_syllabi = max(enrollment.completed_syllabi + delta, 0)
+        enrollment.progress_percent = completion_percent(enrollment.completed_syllabi, totals.get(enrollment.course_id, 0))
+        enrollments.append(enrollment)
+    Enrollment.objects.bulk_update(enrollments, ['completed_syllabi', 'progress_percent'])
+
+
+@transaction.atomic
+def record_video_completion_changes(changes):
+    """
+    `changes` is an iterable of (student_id, video_id, completed) for VideoProgress rows whose
+    is_completed flag flipped. Moves the syllabus and course counters by one per flip.
+    """
+    deltas = defaultdict(int)
+    videos = {}
+    changes = list(changes)
+    if not changes:
+        return
+    for video in Video.objects.filter(pk__in={video_id for _, video_id, _ in changes}, syllabus__isnull=False).only('id', 'syllabus_id'):
+        videos[video.id] = video.syllabus_id
+    for student_id, video_id, completed in changes:
+        if video_id in videos:
+            deltas[(student_id, videos[video_id])] += 1 if completed else -1
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    syllabi = {
+        syllabus.id: syllabus
+        for syllabus in Syllabus.objects.filter(pk__in={syllabus_id for _, syllabus_id in deltas}).only('id', 'course_id', 'video_count')
+    }
+    existing = {
+        (row.student_id, row.syllabus_id): row
+        for row in SyllabusProgress.objects.select_for_update().filter(
+            student_id__in={student_id for student_id, _ in deltas}, syllabus_id__in=syllabi.keys()
+        )
+    }
+
+    now = timezone.now()
+    to_create, to_update = [], []
+    course_changes = defaultdict(int)
+    for (student_id, syllabus_id), delta in deltas.items():
+        syllabus = syllabi[syllabus_id]
+        progress = existing.get((student_id, syllabus_id))
+        if progress is None:
+            progress = SyllabusProgress(student_id=student_id, syllabus_id=syllabus_id)
+            to_create.append(progress)
+        else:
+            to_update.append(progress)
+        before = progress.completed_videos
+        progress.completed_videos = max(before + delta, 0)
+
+        # Only crossing the video total flips the syllabus, so a hand-completed syllabus
+        # (UpdateSyllabusProgressView) stays completed while its videos are being watched
+        total = syllabus.video_count
+        if total and before < total <= progress.completed_videos and not progress.is_completed:
+            progress.is_completed, progress.completed_on = True, now
+            course_changes[(student_id, syllabus.course_id)] += 1
+        elif total and progress.completed_videos < total <= before and progress.is_completed:
+            progress.is_completed, progress.completed_on = False, None
+            course_changes[(student_id, syllabus.course_id)] -= 1
+
+    SyllabusProgress.objects.bulk_create(to_create)
+    SyllabusProgress.objects.bulk_update(to_update, ['completed_videos', 'is_completed', 'completed_on'])
+    apply_syllabus_completion_changes(course_changes)
+
+
+def rebuild_progress_rollups(course_ids=None):
+    """
+    Set-based recomputation of every rollup counter, for backfills and after videos or syllabi are
+    added, removed or moved. Limited to `course_ids` when given.
+    Returns the number of enrollments whose progress_percent changed.
+    """
+    syllabi = Syllabus.objects.all()
+    courses = Course.objects.all()
+    progress_rows = SyllabusProgress.objects.all()
+    enrollments = Enrollment.objects.all()
+    completed_videos = VideoProgress.objects.filter(is_completed=True, video__syllabus__isnull=False)
+    if course_ids is not None:
+        syllabi = syllabi.filter(course_id__in=course_ids)
+        courses = courses.filter(pk__in=course_ids)
+        progress_rows = progress_rows.filter(syllabus__course_id__in=course_ids)
+        enrollments = enrollments.filter(course_id__in=course_ids)
+        completed_videos = completed_videos.filter(video__course_id__in=course_ids)
+
+    def count_of(queryset):
+        return Coalesce(Subquery(queryset.values(group=Value(1)).annotate(count=Count('*')).values('count')[:1]), 0)
+
+    with transaction.atomic():
+        syllabi.update(video_count=count_of(Video.objects.filter(syllabus_id=OuterRef('pk'))))
+        courses.update(syllabus_count=count_of(Syllabus.objects.filter(course_id=OuterRef('pk'))))
+
+        # Every (student, syllabus) pair with a completed video needs a row to hold its counter
+        pairs = completed_videos.values_list('student_id', 'video__syllabus_id').distinct().order_by()
+        SyllabusProgress.objects.bulk_create(
+            [SyllabusProgress(student_id=student_id, syllabus_id=syllabus_id) for student_id, syllabus_id in pairs.iterator()],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        progress_rows.update(completed_videos=count_of(
+            VideoProgress.objects.filter(student_id=OuterRef('student_id'), video__syllabus_id=OuterRef('syllabus_id'), is_completed=True)
+        ))
+        # Rows are never un-completed: a syllabus completed by hand (UpdateSyllabusProgressView) or before a
+        # video was added stays completed, as in record_video_completion_changes()
+        progress_rows.filter(
+            is_completed=False, syllabus__video_count__gt=0, completed_videos__gte=F('syllabus__video_count')
+        ).update(is_completed=True, completed_on=timezone.now())
+
+        enrollments.update(completed_syllabi=count_of(
+            SyllabusProgress.objects.filter(student_id=OuterRef('user_id'), syllabus__course_id=OuterRef('course_id'), is_completed=True)
+        ))
+        total = Subquery(Course.objects.filter(pk=OuterRef('course_id')).values('syllabus_count')[:1])
+        percent = Coalesce(
+            Round(F('completed_syllabi') * Value(100.0) / NullIf(total, Value(0)), 2),
+            Value(0.0),
+            output_field=FloatField(),
+        )
+        return enrollments.alias(expected=percent).exclude(progress_percent=F('expected')).update(progress_percent=percent)
+
+
+_scheduled = threading.local()
+
+
+def schedule_rollup_rebuild(course_id):
+    """
+    Rebuild one course's rollups once the current transaction commits; repeated calls for the
+    same course within a transaction (e.g. adding many videos) rebuild it once.
+    """
+    if not hasattr(_scheduled, 'course_ids'):
+        _scheduled.course_ids = set()
+    _scheduled.course_ids.add(course_id)
+    transaction.on_commit(_run_scheduled_rebuilds)
+
+
+def _run_scheduled_rebuilds():
+    # The first callback after commit rebuilds every scheduled course; the rest find nothing to do
+    course_ids, _scheduled.course_ids = getattr(_scheduled, 'course_ids', set()), set()
+    if course_ids:
+        rebuild_progress_rollups(course_ids=course_ids)
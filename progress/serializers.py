@@ -1,8 +1,10 @@
-from django.utils import timezone
+from django.db import transaction
 from rest_framework import serializers
 
 from course.models import Enrollment
 from .models import VideoProgress, SyllabusProgress
+from .rollups import record_video_completion_changes
+from .utils import bump_learner_progress_versions
 from content.models import Video, Syllabus
 
 class VideoProgressSerializer(serializers.ModelSerializer):
@@ -24,41 +26,24 @@ class SyllabusProgressSerializer(serializers.ModelSerializer):
         read_only_fields = ['student', 'syllabus_title', 'completed_on']
 
     def get_progress_percent(self, obj):
-        total_videos = obj.syllabus.videos.count()
+        # Rollup counters (see progress/rollups.py) instead of two COUNTs per row
+        total_videos = obj.syllabus.video_count
         if total_videos == 0:
             return 0
-        completed_videos = obj.syllabus.videos.filter(
-            videoprogress__student=obj.student,
-            videoprogress__is_completed=True
-        ).count()
-        return int((completed_videos / total_videos) * 100)
+        return int((min(obj.completed_videos, total_videos) / total_videos) * 100)
 
 class SyllabusProgressDetailSerializer(serializers.ModelSerializer):
-    is_completed = serializers.SerializerMethodField()
+    is_completed = serializers.BooleanField(read_only=True)
     progress_percent = serializers.SerializerMethodField()
 
+    # Expects rows from progress.utils.annotate_syllabus_progress (total_videos, completed_videos, is_completed)
     class Meta:
         model = Syllabus
         fields = ['id', 'title', 'order', 'is_completed', 'progress_percent']
 
-    def get_is_completed(self, syllabus):
-        student = self.context['request'].user
-        return SyllabusProgress.objects.filter(
-            student=student,
-            syllabus=syllabus,
-            is_completed=True
-        ).exists()
-
     def get_progress_percent(self, syllabus):
-        student = self.context['request'].user
-        total_videos = syllabus.videos.count()
-        completed_videos = VideoProgress.objects.filter(
-            student=student,
-            video__syllabus=syllabus,
-            is_completed=True
-        ).count()
-
-        return int((completed_videos / total_videos) * 100) if total_videos > 0 else 0
+        total_videos = syllabus.total_videos
+        return int((syllabus.completed_videos / total_videos) * 100) if total_videos > 0 else 0
 
 class VideoProgressUpdateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -76,59 +61,29 @@ class VideoProgressUpdateSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         # Update watched_seconds and is_completed
+        was_completed = instance.is_completed
         instance.watched_seconds = validated_data.get('watched_seconds', instance.watched_seconds)
         instance.is_completed = validated_data.get('is_completed', instance.is_completed)
-        instance.save()
-
-        # Handle syllabus completion only if video is completed.
-        if instance.is_completed:
-            video = instance.video
-            syllabus = getattr(video, 'syllabus', None)
-
-            if syllabus:
-                student = instance.student
-
-                # Get all videos in this syllabus
-                syllabus_videos = Video.objects.filter(syllabus=syllabus)
-
-                # Get how many videos are completed by this student
-                completed_count = VideoProgress.objects.filter(
-                    student=student,
-                    video__in=syllabus_videos,
-                    is_completed=True
-                ).count()
-
-                # If all videos are completed, mark syllabus as completed
-                if completed_count == syllabus_videos.count():
-                    SyllabusProgress.objects.update_or_create(
-                        student=student,
-                        syllabus=syllabus,
-                        defaults={
-                            'is_completed': True,
-                            'completed_on': timezone.now()
-                        }
-                    )
-
-                    course = syllabus.course
-                    # Count all syllabus in this course
-                    total_syllabus = Syllabus.objects.filter(course=course).count()
-
-                    # Count how many are completed by this student
-                    completed_syllabus = SyllabusProgress.objects.filter(
-                        student=student,
-                        syllabus__course=course,
-                        is_completed=True
-                    ).count()
-
-                    # Calculate progress percentage
-                    progress_percent = int((completed_syllabus / total_syllabus) * 100) if total_syllabus > 0 else 0
-
-                    Enrollment.objects.filter(
-                        user=student,
-                        course=course
-                    ).update(
-                        progress_percent=progress_percent,
-                        last_watched_video=instance.video
-                    )
-
-        return instance
\ No newline at end of file
+
+        with transaction.atomic():
+            instance.save()
+
+            # Syllabus / course completion are counters moved by completion flips, not recounted
+            if instance.is_completed != was_completed:
+                record_video_completion_changes([(instance.student_id, instance.video_id, instance.is_completed)])
+
+            if instance.is_completed:
+                Enrollment.objects.filter(
+                    user_id=instance.student_id,
+                    course_id=instance.video.course_id
+                ).update(last_watched_video=instance.video)
+            bump_learner_progress_versions([instance.student_id])
+
+        return instance
+
+
+# One event of a batched progress upload (offline / mobile players)
+class VideoProgressEventSerializer(serializers.Serializer):
+    video_id = serializers.IntegerField(min_value=1)
+    watched_seconds = serializers.IntegerField(min_value=0)
+    client_ts = serializers.DateTimeField(required=False)
@@ -1,3 +1,244 @@
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from content.models import Syllabus, Video
+from course.models import Author, Category, Course, Enrollment
+from .heartbeats import HeartbeatBuffer, reached_completion, upsert_video_progress
+from .models import DailyStudentWatchTime, DailyVideoWatchTime, SyllabusProgress, VideoProgress, VideoWatchEvent
+from .rollups import rebuild_progress_rollups
+from .watchlog import compact_watch_events, record_watch_events
+
+
+class ProgressTestCase(TestCase):
+    """
+    A course with one two-video syllabus and an enrolled student, rollup totals in place.
+    """
+
+    def setUp(self):
+        category = Category.objects.create(name='Programming')
+        author = Author.objects.create(name='Ada')
+        self.course = Course.objects.create(category=category, author=author, title='Python', duration='10h')
+        self.syllabus = Syllabus.objects.create(course=self.course, title='Basics', order=1)
+        self.video = Video.objects.create(course=self.course, syllabus=self.syllabus, title='Intro', video_file='videos/intro.mp4', duration=100)
+        self.other_video = Video.objects.create(course=self.course, syllabus=self.syllabus, title='Variables', video_file='videos/variables.mp4', duration=200)
+        self.student = CustomUser.objects.create_user(email='student@example.com', password='x', role='student', is_active=True)
+        self.enrollment = Enrollment.objects.create(user=self.student, course=self.course)
+        rebuild_progress_rollups()
+
+    def progress(self, video=None):
+        return VideoProgress.objects.get(student=self.student, video=video or self.video)
+
+
+class UpsertVideoProgressTests(ProgressTestCase):
+    def test_inserts_then_keeps_the_max(self):
+        upsert_video_progress({(self.student.id, self.video.id): 30})
+        upsert_video_progress({(self.student.id, self.video.id): 10})
+        self.assertEqual(self.progress().watched_seconds, 30)
+        self.assertEqual(VideoProgress.objects.count(), 1)
+
+    def test_completion_counted_once(self):
+        self.assertFalse(reached_completion(89, 100))
+        self.assertTrue(reached_completion(90, 100))
+
+        upsert_video_progress({(self.student.id, self.video.id): 95})
+        upsert_video_progress({(self.student.id, self.video.id): 100})
+        self.assertTrue(self.progress().is_completed)
+        self.assertEqual(SyllabusProgress.objects.get(student=self.student, syllabus=self.syllabus).completed_videos, 1)
+
+    def test_unknown_videos_are_skipped(self):
+        self.assertEqual(upsert_video_progress({(self.student.id, 999999): 10}), [])
+        self.assertFalse(VideoProgress.objects.exists())
+
+    def test_progress_made_is_logged(self):
+        upsert_video_progress({(self.student.id, self.video.id): 30})
+        upsert_video_progress({(self.student.id, self.video.id): 50})
+        upsert_video_progress({(self.student.id, self.video.id): 40})
+        self.assertEqual(list(VideoWatchEvent.objects.order_by('id').values_list('seconds', flat=True)), [30, 20])
+
+
+@mock.patch.object(HeartbeatBuffer, '_ensure_started')
+class HeartbeatBufferTests(ProgressTestCase):
+    def test_heartbeats_coalesce_to_the_max(self, ensure_started):
+        buffer = HeartbeatBuffer(flush_interval=60, max_pending=10)
+        for watched_seconds in (10, 40, 20):
+            self.assertTrue(buffer.add(self.student.id, self.video.id, watched_seconds))
+        self.assertEqual(len(buffer), 1)
+
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(self.progress().watched_seconds, 40)
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_full_buffer_rejects_new_keys(self, ensure_started):
+        buffer = HeartbeatBuffer(flush_interval=60, max_pending=1)
+        self.assertTrue(buffer.add(self.student.id, self.video.id, 10))
+        self.assertFalse(buffer.add(self.student.id, self.other_video.id, 10))
+        # A key already buffered still coalesces
+        self.assertTrue(buffer.add(self.student.id, self.video.id, 20))
+
+    def test_failed_flush_keeps_entries(self, ensure_started):
+        buffer = HeartbeatBuffer(flush_interval=60, max_pending=10)
+        buffer.add(self.student.id, self.video.id, 30)
+        with mock.patch('progress.heartbeats.upsert_video_progress', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                buffer.flush()
+        self.assertEqual(len(buffer), 1)
+        buffer.flush()
+        self.assertEqual(self.progress().watched_seconds, 30)
+
+    def test_zero_interval_writes_through(self, ensure_started):
+        buffer = HeartbeatBuffer(flush_interval=0)
+        buffer.add(self.student.id, self.video.id, 25)
+        self.assertEqual(self.progress().watched_seconds, 25)
+        ensure_started.assert_not_called()
+
+
+class VideoProgressBatchTests(ProgressTestCase):
+    url = '/progress/video/batch/'
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def post(self, events):
+        response = self.client.post(self.url, {'events': events}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [event['status'] for event in response.data['events']], response.data
+
+    def test_event_statuses(self):
+        upsert_video_progress({(self.student.id, self.other_video.id): 150})
+        statuses, data = self.post([
+            {'video_id': self.video.id, 'watched_seconds': 40, 'client_ts': '2026-01-01T10:00:00Z'},
+            {'video_id': self.video.id, 'watched_seconds': 95, 'client_ts': '2026-01-01T10:01:00Z'},
+            {'video_id': self.other_video.id, 'watched_seconds': 60, 'client_ts': '2026-01-01T10:02:00Z'},
+            {'video_id': 999999, 'watched_seconds': 10, 'client_ts': '2026-01-01T10:03:00Z'},
+            {'video_id': self.video.id, 'watched_seconds': -1, 'client_ts': '2026-01-01T10:04:00Z'},
+        ])
+        self.assertEqual(statuses, ['coalesced', 'applied', 'stale', 'not_found', 'invalid'])
+        self.assertEqual(data['events'][1]['watched_seconds'], 95)
+        self.assertTrue(data['events'][1]['is_completed'])
+        self.assertEqual(data['events'][2]['watched_seconds'], 150)
+        self.assertEqual(self.progress().watched_seconds, 95)
+        self.assertEqual(data['syllabi'], [{'syllabus_id': self.syllabus.id, 'progress_percent': 50.0}])
+
+    def test_replay_is_idempotent(self):
+        events = [{'video_id': self.video.id, 'watched_seconds': 95, 'client_ts': '2026-01-01T10:00:00Z'}]
+        self.post(events)
+        statuses, _ = self.post(events)
+        self.assertEqual(statuses, ['applied'])
+        self.assertEqual(SyllabusProgress.objects.get(student=self.student, syllabus=self.syllabus).completed_videos, 1)
+
+    def test_rejects_empty_and_oversized_batches(self):
+        self.assertEqual(self.client.post(self.url, {'events': []}, format='json').status_code, 400)
+        events = [{'video_id': self.video.id, 'watched_seconds': 1, 'client_ts': '2026-01-01T10:00:00Z'}] * 501
+        self.assertEqual(self.client.post(self.url, events, format='json').status_code, 400)
+
+
+class ProgressRollupTests(ProgressTestCase):
+    def complete_by_hand(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        response = client.post('/progress/update-syllabus-progress/', {'syllabus_id': self.syllabus.id, 'is_completed': True}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def syllabus_progress(self):
+        return SyllabusProgress.objects.get(student=self.student, syllabus=self.syllabus)
+
+    def test_watching_every_video_completes_syllabus_and_course(self):
+        upsert_video_progress({(self.student.id, self.video.id): 100, (self.student.id, self.other_video.id): 200})
+        self.assertTrue(self.syllabus_progress().is_completed)
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_syllabi, self.enrollment.progress_percent), (1, 100.0))
+
+    def test_rebuild_matches_incremental_counters(self):
+        upsert_video_progress({(self.student.id, self.video.id): 100, (self.student.id, self.other_video.id): 200})
+        self.enrollment.refresh_from_db()
+        before = (self.syllabus_progress().completed_videos, self.enrollment.completed_syllabi, self.enrollment.progress_percent)
+
+        self.assertEqual(rebuild_progress_rollups(), 0)
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.syllabus_progress().completed_videos, self.enrollment.completed_syllabi, self.enrollment.progress_percent), before)
+
+    def test_rebuild_never_uncompletes_a_manual_completion(self):
+        self.complete_by_hand()
+        self.assertEqual(self.syllabus_progress().completed_videos, 0)
+
+        rebuild_progress_rollups(course_ids=[self.course.id])
+        self.assertTrue(self.syllabus_progress().is_completed)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.progress_percent, 100.0)
+
+    def test_watching_videos_keeps_a_manual_completion(self):
+        self.complete_by_hand()
+        upsert_video_progress({(self.student.id, self.video.id): 100})
+        self.assertTrue(self.syllabus_progress().is_completed)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.completed_syllabi, 1)
+
+    def test_adding_a_video_rebuilds_totals(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Video.objects.create(course=self.course, syllabus=self.syllabus, title='Loops', video_file='videos/loops.mp4', duration=50)
+        self.syllabus.refresh_from_db()
+        self.assertEqual(self.syllabus.video_count, 3)
+
+    def test_renaming_a_video_does_not_rebuild(self):
+        video = Video.objects.get(pk=self.video.pk)
+        video.title = 'Introduction'
+        with mock.patch('progress.rollups.rebuild_progress_rollups') as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                video.save()
+        rebuild.assert_not_called()
+
+        video.syllabus = None
+        with mock.patch('progress.rollups.rebuild_progress_rollups') as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                video.save()
+        rebuild.assert_called_once_with(course_ids={self.course.id})
+
+
+class WatchLogCompactionTests(ProgressTestCase):
+    def setUp(self):
+        super().setUp()
+        self.classmate = CustomUser.objects.create_user(email='classmate@example.com', password='x', role='student', is_active=True)
+        self.today = timezone.now()
+        self.old = self.today - timedelta(days=30)
+        record_watch_events([(self.student.id, self.video.id, 30), (self.classmate.id, self.video.id, 20)], occurred_at=self.today)
+        record_watch_events([(self.student.id, self.video.id, 10), (self.student.id, self.other_video.id, 0)], occurred_at=self.today)
+        record_watch_events([(self.student.id, self.other_video.id, 50)], occurred_at=self.old)
+
+    def test_zero_second_events_are_dropped(self):
+        self.assertEqual(VideoWatchEvent.objects.count(), 4)
+
+    def test_aggregates_and_prunes_expired_days(self):
+        written, pruned = compact_watch_events(retention_days=7)
+        self.assertEqual((written, pruned), (5, 1))
+
+        today = timezone.localdate(self.today)
+        daily = DailyVideoWatchTime.objects.get(video=self.video, date=today)
+        self.assertEqual((daily.course_id, daily.watch_seconds, daily.viewers), (self.course.id, 60, 2))
+        student = DailyStudentWatchTime.objects.get(student=self.student, date=today)
+        self.assertEqual((student.watch_seconds, student.videos), (40, 1))
+        # The pruned day keeps its aggregate
+        self.assertEqual(DailyVideoWatchTime.objects.get(video=self.other_video).watch_seconds, 50)
+        self.assertFalse(VideoWatchEvent.objects.filter(occurred_at__lt=self.today - timedelta(days=7)).exists())
+
+    def test_rerun_is_idempotent(self):
+        compact_watch_events(retention_days=7)
+        snapshot = list(DailyVideoWatchTime.objects.order_by('id').values_list('video_id', 'date', 'watch_seconds', 'viewers'))
+
+        self.assertEqual(compact_watch_events(retention_days=7), (3, 0))
+        self.assertEqual(list(DailyVideoWatchTime.objects.order_by('id').values_list('video_id', 'date', 'watch_seconds', 'viewers')), snapshot)
+        self.assertEqual(DailyStudentWatchTime.objects.get(student=self.student, date=timezone.localdate(self.today)).watch_seconds, 40)
 
-# Create your tests here.
+    def test_late_events_recompute_the_whole_day(self):
+        compact_watch_events(retention_days=7)
+        record_watch_events([(self.classmate.id, self.video.id, 5)], occurred_at=self.today)
+        compact_watch_events(retention_days=7)
+        daily = DailyVideoWatchTime.objects.get(video=self.video, date=timezone.localdate(self.today))
+        self.assertEqual((daily.watch_seconds, daily.viewers), (65, 2))
@@ -1,5 +1,12 @@
-from progress.models import SyllabusProgress
-from content.models import Syllabus
+import time
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from progress.models import SyllabusProgress, VideoProgress
+from content.models import Syllabus, Video
+from course.cache import get_catalog_cache
 
 def calculate_course_progress_percent(user, course):
     total_syllabus = Syllabus.objects.filter(course=course).count()
@@ -11,4 +18,99 @@ def calculate_course_progress_percent(user, course):
         syllabus__course = course,
         is_completed = True
     ).count()
-    return round((completed/total_syllabus)*100,2)
\ No newline at end of file
+    return round((completed/total_syllabus)*100,2)
+
+def bulk_course_progress_percent(pairs):
+    """
+    Same as calculate_course_progress_percent for many (user_id, course_id) pairs at once,
+    in two grouped queries. Returns {(user_id, course_id): percent}.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    user_ids = {user_id for user_id, _ in pairs}
+    course_ids = {course_id for _, course_id in pairs}
+
+    totals = dict(
+        Syllabus.objects.filter(course_id__in=course_ids)
+        .values('course_id').annotate(total=Count('id')).order_by()
+        .values_list('course_id', 'total')
+    )
+    completed = {
+        (row['student_id'], row['syllabus__course_id']): row['completed']
+        for row in SyllabusProgress.objects.filter(
+            student_id__in=user_ids, syllabus__course_id__in=course_ids, is_completed=True
+        ).values('student_id', 'syllabus__course_id').annotate(completed=Count('id')).order_by()
+    }
+
+    progress = {}
+    for user_id, course_id in pairs:
+        total = totals.get(course_id, 0)
+        progress[(user_id, course_id)] = round((completed.get((user_id, course_id), 0)/total)*100,2) if total else 0.0
+    return progress
+
+def bulk_syllabus_progress_percent(user_id, syllabus_ids):
+    """
+    Video-completion percent per syllabus for one student (as in SyllabusProgressDetailSerializer),
+    in one grouped query. Returns {syllabus_id: percent}.
+    """
+    rows = (
+        Video.objects.filter(syllabus_id__in=syllabus_ids)
+        .values('syllabus_id')
+        .annotate(
+            total=Count('id', distinct=True),
+            completed=Count('videoprogress', filter=Q(videoprogress__student_id=user_id, videoprogress__is_completed=True)),
+        )
+        .order_by()
+    )
+    progress = dict.fromkeys(syllabus_ids, 0)
+    for row in rows:
+        progress[row['syllabus_id']] = int((row['completed'] / row['total']) * 100) if row['total'] else 0
+    return progress
+
+def _count_of(queryset):
+    return Coalesce(Subquery(queryset.values(group=Value(1)).annotate(count=Count('*')).values('count')[:1]), 0)
+
+def annotate_syllabus_progress(queryset, user):
+    """
+    Attach total_videos, completed_videos and is_completed for `user` to every syllabus in `queryset`
+    as subquery annotations, so an outline costs one query whatever its length.
+    """
+    return queryset.annotate(
+        total_videos=_count_of(Video.objects.filter(syllabus_id=OuterRef('pk'))),
+        completed_videos=_count_of(
+            VideoProgress.objects.filter(student_id=user.pk, video__syllabus_id=OuterRef('pk'), is_completed=True)
+        ),
+        is_completed=Exists(SyllabusProgress.objects.filter(student_id=user.pk, syllabus_id=OuterRef('pk'), is_completed=True)),
+    )
+
+def _learner_version_key(user_id):
+    return f'progress:learner:{user_id}:version'
+
+def get_learner_progress_version(user_id):
+    """
+    Per-learner counter moved by every progress write; caches of learner-specific progress
+    (e.g. course.dashboard) put it in their keys. It lives in the catalog cache, which every worker
+    shares, so a write in one process invalidates what the others cached.
+    """
+    cache = get_catalog_cache()
+    key = _learner_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never rolls back to an older value
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+def bump_learner_progress_versions(user_ids):
+    # After commit, so a concurrent reader can't cache pre-commit rows under the new version
+    user_ids = set(user_ids)
+
+    def bump():
+        cache = get_catalog_cache()
+        for user_id in user_ids:
+            try:
+                cache.incr(_learner_version_key(user_id))
+            except ValueError:
+                cache.add(_learner_version_key(user_id), int(time.time() * 1000), None)
+    transaction.on_commit(bump)
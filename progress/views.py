@@ -2,27 +2,41 @@ from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
+from django.db import transaction
+from django.db.models import Sum
 from django.utils import timezone
+from datetime import timedelta
 
+from accounts.permissions import IsAdmin
 from batch.models import Batch
+from lms.mixins import SparseFieldsetMixin
 from content.serializers import VideoSerializer
 from course.models import Course, Enrollment
-from .models import VideoProgress, SyllabusProgress
+from .heartbeats import get_video_duration, heartbeat_buffer, upsert_video_progress
+from .models import VideoProgress, SyllabusProgress, DailyStudentWatchTime, DailyVideoWatchTime
+from .rollups import apply_syllabus_completion_changes
 from content.models import Video, Syllabus
-from .serializers import VideoProgressSerializer, SyllabusProgressSerializer, SyllabusProgressDetailSerializer
+from content.playback import get_playback_index
+from .serializers import VideoProgressSerializer, SyllabusProgressSerializer, SyllabusProgressDetailSerializer, \
+    VideoProgressEventSerializer
+from .utils import annotate_syllabus_progress, bulk_course_progress_percent, bulk_syllabus_progress_percent, \
+    bump_learner_progress_versions
 
 
-class VideoProgressListView(generics.ListAPIView):
+class VideoProgressListView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = VideoProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ('-last_watched_on', '-id')
 
     def get_queryset(self):
-        return VideoProgress.objects.filter(student=self.request.user)
+        return VideoProgress.objects.filter(student=self.request.user).select_related('video')
 
 class UpdateVideoProgressView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    # Player heartbeat: buffered and written in bulk by progress.heartbeats, not per request
     def post(self, request):
         user = request.user
         video_id = request.data.get("video_id")
@@ -32,32 +46,103 @@ class UpdateVideoProgressView(APIView):
             return Response({"error": "Missing video_id or watched_seconds."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            video = Video.objects.get(id=video_id)
-        except Video.DoesNotExist:
+            video_id = int(video_id)
+            watched_seconds = max(int(watched_seconds), 0)
+        except (TypeError, ValueError):
+            return Response({"error": "video_id and watched_seconds must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if get_video_duration(video_id) is None:
             return Response({"error": "Video not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        progress, created = VideoProgress.objects.get_or_create(
-            student=user,
-            video=video,
-            defaults={'watched_seconds': watched_seconds}
-        )
+        if not heartbeat_buffer.add(user.id, video_id, watched_seconds):
+            response = Response({"error": "Too many pending progress updates, retry shortly."}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(max(int(heartbeat_buffer.flush_interval), 1))
+            return response
+
+        return Response({"message": "Progress updated successfully."}, status=status.HTTP_200_OK)
 
-        if not created:
-            progress.watched_seconds = max(progress.watched_seconds, int(watched_seconds))
-            progress.last_watched_on = timezone.now()
+class VideoProgressBatchView(APIView):
+    """
+    Replay of buffered heartbeats from an offline player: a list of {video_id, watched_seconds, client_ts}
+    (or {"events": [...]}). Events are resolved per video by max watched_seconds and written in one upsert.
+    Each event gets a status: applied, coalesced (a larger event for the same video won), stale (stored
+    progress was already ahead), not_found or invalid.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_events = 500
 
-        if progress.watched_seconds >= int(video.duration * 0.9):
-            progress.is_completed = True
+    def post(self, request):
+        events = request.data.get("events") if isinstance(request.data, dict) else request.data
+        if not isinstance(events, list) or not events:
+            return Response({"error": "Expected a non-empty list of events."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(events) > self.max_events:
+            return Response({"error": f"At most {self.max_events} events per batch."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results, valid = [], []
+        for index, event in enumerate(events):
+            serializer = VideoProgressEventSerializer(data=event if isinstance(event, dict) else {})
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+                results.append({"index": index, "video_id": serializer.validated_data["video_id"]})
+            else:
+                results.append({"index": index, "status": "invalid", "errors": serializer.errors})
+
+        videos = Video.objects.only('id', 'duration', 'course_id', 'syllabus_id').in_bulk(
+            {event["video_id"] for _, event in valid}
+        )
 
-        progress.save()
-        return Response({"message": "Progress updated successfully."}, status=status.HTTP_200_OK)
+        # Per video, the (first) event with the highest watched_seconds wins: {video_id: (index, watched_seconds)}
+        winners = {}
+        for index, event in valid:
+            video_id = event["video_id"]
+            if video_id not in videos:
+                results[index]["status"] = "not_found"
+            elif video_id not in winners or event["watched_seconds"] > winners[video_id][1]:
+                winners[video_id] = (index, event["watched_seconds"])
+
+        with transaction.atomic():
+            rows = upsert_video_progress(
+                {(request.user.id, video_id): watched_seconds for video_id, (_, watched_seconds) in winners.items()},
+                durations={video_id: videos[video_id].duration for video_id in winners},
+            )
+        stored = {row.video_id: row for row in rows}
+
+        for index, event in valid:
+            row = stored.get(event["video_id"])
+            if row is None:
+                continue
+            if winners[event["video_id"]][0] != index:
+                results[index]["status"] = "coalesced"
+            elif row.watched_seconds > event["watched_seconds"]:
+                results[index]["status"] = "stale"
+            else:
+                results[index]["status"] = "applied"
+            results[index].update(watched_seconds=row.watched_seconds, is_completed=row.is_completed)
+
+        written = [videos[video_id] for video_id in stored]
+        syllabus_ids = {video.syllabus_id for video in written if video.syllabus_id}
+        course_ids = {video.course_id for video in written}
+        syllabus_progress = bulk_syllabus_progress_percent(request.user.id, syllabus_ids)
+        course_progress = bulk_course_progress_percent((request.user.id, course_id) for course_id in course_ids)
+
+        return Response({
+            "events": results,
+            "syllabi": [
+                {"syllabus_id": syllabus_id, "progress_percent": percent}
+                for syllabus_id, percent in sorted(syllabus_progress.items())
+            ],
+            "courses": [
+                {"course_id": course_id, "progress_percent": course_progress[(request.user.id, course_id)]}
+                for course_id in sorted(course_ids)
+            ],
+        }, status=status.HTTP_200_OK)
 
 class SyllabusProgressListView(generics.ListAPIView):
     serializer_class = SyllabusProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return SyllabusProgress.objects.filter(student=self.request.user)
+        return SyllabusProgress.objects.filter(student=self.request.user).select_related('syllabus')
 
 class CourseSyllabusProgressListView(generics.ListAPIView):
     serializer_class = SyllabusProgressDetailSerializer
@@ -67,7 +152,7 @@ class CourseSyllabusProgressListView(generics.ListAPIView):
         course_id = self.request.query_params.get('course_id')
         if not course_id:
             return Syllabus.objects.none()
-        return Syllabus.objects.filter(course_id=course_id).order_by('order')
+        return annotate_syllabus_progress(Syllabus.objects.filter(course_id=course_id).order_by('order'), self.request.user)
 
 class UpdateSyllabusProgressView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -85,36 +170,37 @@ class UpdateSyllabusProgressView(APIView):
         except Syllabus.DoesNotExist:
             return Response({"error": "Syllabus not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        progress, created = SyllabusProgress.objects.get_or_create(
-            student=user,
-            syllabus=syllabus,
-        )
-
-        # Auto calculate progress percent based on video completion
-        total_videos = syllabus.videos.count()
-        if total_videos > 0:
-            completed_videos = syllabus.videos.filter(
-                videoprogress__student=user,
-                videoprogress__is_completed=True
-            ).count()
-            progress.progress_percent = int((completed_videos / total_videos) * 100)
-        else:
-            progress.progress_percent = 0
-
-        # Mark syllabus complete if all videos are done
-        if progress.progress_percent == 100 or is_completed in [True, 'true', 'True', 1, '1']:
-            progress.is_completed = True
-            progress.completed_on = timezone.now()
-            progress.progress_percent = 100
-        else:
-            progress.is_completed = False
-            progress.completed_on = None
-
-        progress.save()
+        with transaction.atomic():
+            progress, created = SyllabusProgress.objects.select_for_update().get_or_create(
+                student=user,
+                syllabus=syllabus,
+            )
+            was_completed = progress.is_completed
+
+            # Progress percent based on video completion, from the rollup counters
+            total_videos = syllabus.video_count
+            if total_videos > 0:
+                progress_percent = int((min(progress.completed_videos, total_videos) / total_videos) * 100)
+            else:
+                progress_percent = 0
+
+            # Mark syllabus complete if all videos are done
+            if progress_percent == 100 or is_completed in [True, 'true', 'True', 1, '1']:
+                progress.is_completed = True
+                progress.completed_on = progress.completed_on if was_completed else timezone.now()
+                progress_percent = 100
+            else:
+                progress.is_completed = False
+                progress.completed_on = None
+
+            progress.save(update_fields=['is_completed', 'completed_on'])
+            if progress.is_completed != was_completed:
+                apply_syllabus_completion_changes({(user.id, syllabus.course_id): 1 if progress.is_completed else -1})
+            bump_learner_progress_versions([user.id])
 
         return Response({
             "message": "Syllabus progress updated.",
-            "progress_percent": progress.progress_percent,
+            "progress_percent": progress_percent,
             "is_completed": progress.is_completed
         }, status=status.HTTP_200_OK)
 
@@ -131,17 +217,19 @@ class NextVideoView(APIView):
         except Enrollment.DoesNotExist:
             return Response({'detail': 'Not enrolled in this course.'}, status=status.HTTP_403_FORBIDDEN)
 
-        # Fetch all videos in order
-        videos = Video.objects.filter(course=course).order_by('id')
-
-        for video in videos:
-            progress = VideoProgress.objects.filter(student=user, video=video).first()
-            if not progress or not progress.is_completed:
-                serializer = VideoSerializer(video)
-                return Response({
-                    "next_video": serializer.data,
-                    "video_id": video.id,
-                })
+        # First video in playback order outside the learner's completed set: one query for the set
+        index = get_playback_index(course)
+        completed_ids = set(
+            VideoProgress.objects.filter(student=user, video__course=course, is_completed=True).values_list('video_id', flat=True)
+        )
+        video_id = index.first_unwatched(completed_ids)
+        video = Video.objects.select_related('module').filter(pk=video_id).first() if video_id is not None else None
+        if video is not None:
+            serializer = VideoSerializer(video)
+            return Response({
+                "next_video": serializer.data,
+                "video_id": video.id,
+            })
 
         return Response({"detail": "You've completed all videos in this course."}, status=status.HTTP_200_OK)
 
@@ -158,13 +246,11 @@ class PreviousVideoView(APIView):
         except Enrollment.DoesNotExist:
             return Response({'detail': 'Not enrolled in this course.'}, status=status.HTTP_403_FORBIDDEN)
 
-        last_video = enrollment.last_watched_video
-
-        if not last_video:
+        if not enrollment.last_watched_video_id:
             return Response({'detail': 'No previous video available.'}, status=status.HTTP_404_NOT_FOUND)
 
-        all_videos = Video.objects.filter(course=course).order_by('id')
-        previous_video = all_videos.filter(id__lt=last_video.id).last()
+        previous_id = get_playback_index(course).previous(enrollment.last_watched_video_id)
+        previous_video = Video.objects.select_related('module').filter(pk=previous_id).first() if previous_id is not None else None
 
         if not previous_video:
             return Response({'detail': 'No previous video available.'}, status=status.HTTP_404_NOT_FOUND)
@@ -180,7 +266,7 @@ class CurrentVideoView(APIView):
         course = get_object_or_404(Course, id=course_id)
 
         try:
-            enrollment = Enrollment.objects.get(user=user, course=course)
+            enrollment = Enrollment.objects.select_related('last_watched_video__module').get(user=user, course=course)
         except Enrollment.DoesNotExist:
             return Response({'detail': 'Not enrolled in this course.'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -208,5 +294,57 @@ class BatchSyllabusProgressListView(generics.ListAPIView):
         except Batch.DoesNotExist:
             return Syllabus.objects.none()
 
-        return Syllabus.objects.filter(course=batch.batch_specific_course).order_by('order')
+        return annotate_syllabus_progress(
+            Syllabus.objects.filter(course=batch.batch_specific_course).order_by('order'), self.request.user
+        )
+
+
+# Watch-time reports. Read only the daily aggregates written by progress.watchlog.compact_watch_events,
+# never the raw event log, so they lag the log by one compaction run.
+class WatchTimeReportMixin:
+    default_days = 30
+    max_days = 366
 
+    def get_since(self):
+        try:
+            days = int(self.request.query_params.get('days', self.default_days))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= self.max_days:
+            raise ValidationError({"days": f"Must be an integer between 1 and {self.max_days}."})
+        return timezone.localdate() - timedelta(days=days - 1)
+
+class MyWatchTimeView(WatchTimeReportMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        rows = list(
+            DailyStudentWatchTime.objects.filter(student=request.user, date__gte=self.get_since())
+            .order_by('date').values('date', 'watch_seconds', 'videos')
+        )
+        return Response({
+            "total_seconds": sum(row['watch_seconds'] for row in rows),
+            "days": rows,
+        })
+
+class CourseWatchTimeView(WatchTimeReportMixin, APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request, course_id):
+        course = get_object_or_404(Course, id=course_id)
+        daily = DailyVideoWatchTime.objects.filter(course=course, date__gte=self.get_since()).order_by()
+        # views: (student, video) pairs watched that day
+        days = list(daily.values('date').annotate(watch_seconds=Sum('watch_seconds'), views=Sum('viewers')).order_by('date'))
+        videos = list(
+            daily.values('video_id', 'video__title').annotate(watch_seconds=Sum('watch_seconds'))
+            .order_by('-watch_seconds', 'video_id')
+        )
+        return Response({
+            "course_id": course.id,
+            "total_seconds": sum(row['watch_seconds'] for row in days),
+            "days": days,
+            "videos": [
+                {"video_id": row['video_id'], "title": row['video__title'], "watch_seconds": row['watch_seconds']}
+                for row in videos
+            ],
+        })
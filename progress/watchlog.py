@@ -0,0 +1,72 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyStudentWatchTime, DailyVideoWatchTime, VideoWatchEvent
+
+# Raw events are kept this many whole days (today included) before being pruned; the daily tables keep everything
+RETENTION_DAYS = getattr(settings, 'WATCH_EVENT_RETENTION_DAYS', 7)
+BATCH_SIZE = 500
+
+
+def record_watch_events(events, occurred_at=None):
+    """
+    Append (student_id, video_id, seconds) events in one bulk insert; zero-second events are dropped.
+    """
+    occurred_at = occurred_at or timezone.now()
+    VideoWatchEvent.objects.bulk_create(
+        [
+            VideoWatchEvent(student_id=student_id, video_id=video_id, seconds=seconds, occurred_at=occurred_at)
+            for student_id, video_id, seconds in events if seconds > 0
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def retention_cutoff(retention_days=RETENTION_DAYS):
+    # Start of the oldest retained day; pruning on day boundaries keeps every retained day complete
+    oldest_day = timezone.localdate() - timedelta(days=retention_days - 1)
+    return timezone.make_aware(datetime.combine(oldest_day, time.min))
+
+
+@transaction.atomic
+def compact_watch_events(retention_days=RETENTION_DAYS):
+    """
+    Recompute the (video, date) and (student, date) aggregates of every day still in the raw log, then
+    prune the days past the retention window. Days are recomputed whole, so re-running is idempotent.
+    Returns (aggregate rows written, events pruned).
+    """
+    events = VideoWatchEvent.objects.annotate(date=TruncDate('occurred_at')).order_by()
+
+    video_rows = [
+        DailyVideoWatchTime(
+            course_id=row['video__course_id'], video_id=row['video_id'], date=row['date'],
+            watch_seconds=row['watch_seconds'], viewers=row['viewers'],
+        )
+        for row in events.values('video_id', 'video__course_id', 'date').annotate(
+            watch_seconds=Sum('seconds'), viewers=Count('student_id', distinct=True)
+        )
+    ]
+    student_rows = [
+        DailyStudentWatchTime(
+            student_id=row['student_id'], date=row['date'], watch_seconds=row['watch_seconds'], videos=row['videos'],
+        )
+        for row in events.values('student_id', 'date').annotate(
+            watch_seconds=Sum('seconds'), videos=Count('video_id', distinct=True)
+        )
+    ]
+
+    DailyVideoWatchTime.objects.bulk_create(
+        video_rows, batch_size=BATCH_SIZE, update_conflicts=True,
+        unique_fields=['video', 'date'], update_fields=['course', 'watch_seconds', 'viewers'],
+    )
+    DailyStudentWatchTime.objects.bulk_create(
+        student_rows, batch_size=BATCH_SIZE, update_conflicts=True,
+        unique_fields=['student', 'date'], update_fields=['watch_seconds', 'videos'],
+    )
+    pruned, _ = VideoWatchEvent.objects.filter(occurred_at__lt=retention_cutoff(retention_days)).delete()
+    return len(video_rows) + len(student_rows), pruned
@@ -1,5 +1,7 @@
 from django.contrib import admin
 from .models import Quiz, QuizQuestion, QuizOption, QuizAttempt, QuizAnswer
+from .serializers import QUIZ_ATTEMPT_EXPORT_FIELDS
+from lms.exports import export_admin_action
 
 
 class QuizOptionInline(admin.TabularInline):
@@ -11,10 +13,17 @@ class QuizQuestionAdmin(admin.ModelAdmin):
     inlines = [QuizOptionInline]
 
 
+class QuizAttemptAdmin(admin.ModelAdmin):
+    list_display = ('quiz', 'student', 'score', 'completed', 'attempted_at')
+    list_filter = ('completed',)
+    search_fields = ('quiz__title', 'student__email')
+    actions = [export_admin_action(QUIZ_ATTEMPT_EXPORT_FIELDS, 'quiz-attempts')]
+
+
 # Register models (only once each)
 admin.site.register(Quiz)
 admin.site.register(QuizQuestion, QuizQuestionAdmin)
 admin.site.register(QuizOption)
-admin.site.register(QuizAttempt)
+admin.site.register(QuizAttempt, QuizAttemptAdmin)
 admin.site.register(QuizAnswer)
 
@@ -53,3 +53,17 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
         attempt.completed = True
         attempt.save()
         return attempt
+
+# Column -> lookup projection for the streamed attempt export (lms/exports.py)
+QUIZ_ATTEMPT_EXPORT_FIELDS = {
+    "id": "id",
+    "quiz_id": "quiz_id",
+    "quiz_title": "quiz__title",
+    "course_id": "quiz__course_id",
+    "student_id": "student_id",
+    "email": "student__email",
+    "score": "score",
+    "passing_marks": "quiz__passing_marks",
+    "completed": "completed",
+    "attempted_at": "attempted_at",
+}
@@ -3,7 +3,8 @@ from .views import (
     QuizListCreateView, QuizRetrieveUpdateDeleteView,
     QuizQuestionCRUDView, QuizQuestionDetailCRUDView,
     QuizOptionCRUDView, QuizOptionDetailCRUDView,
-    StudentQuizListView, StudentQuizDetailView, StudentQuizAttemptView
+    StudentQuizListView, StudentQuizDetailView, StudentQuizAttemptView,
+    QuizAttemptExportView
 )
 
 urlpatterns = [
@@ -17,6 +18,8 @@ urlpatterns = [
     path("admin/options/", QuizOptionCRUDView.as_view(), name="option-list-create"),
     path("admin/options/<int:pk>/", QuizOptionDetailCRUDView.as_view(), name="option-detail"),
 
+    path("admin/attempts/export/", QuizAttemptExportView.as_view(), name="quiz-attempt-export"),
+
     # Student
     path("student/quizzes/", StudentQuizListView.as_view(), name="student-quiz-list"),
     path("student/quizzes/<int:pk>/", StudentQuizDetailView.as_view(), name="student-quiz-detail"),
@@ -1,8 +1,10 @@
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
 from .models import Quiz, QuizQuestion, QuizOption, QuizAttempt
-from .serializers import QuizSerializer, QuizAttemptSerializer, QuizQuestionSerializer, QuizOptionSerializer
+from .serializers import QuizSerializer, QuizAttemptSerializer, QuizQuestionSerializer, QuizOptionSerializer, \
+    QUIZ_ATTEMPT_EXPORT_FIELDS
 from course.models import Enrollment
+from lms.exports import StreamingExportView
 
 # ADMIN CRUD VIEWS
 class QuizListCreateView(generics.ListCreateAPIView):
@@ -67,3 +69,20 @@ class StudentQuizAttemptView(generics.CreateAPIView):
             raise PermissionDenied("You are not enrolled in this course.")
 
         serializer.save(student=user)
+
+# ADMIN EXPORT
+# Streams attempts as CSV (or ?export=ndjson); ?quiz=<id> / ?course=<id> narrow it
+class QuizAttemptExportView(StreamingExportView):
+    permission_classes = [permissions.IsAdminUser]
+    export_filename = "quiz-attempts"
+    export_fields = QUIZ_ATTEMPT_EXPORT_FIELDS
+
+    def get_queryset(self):
+        queryset = QuizAttempt.objects.order_by("id")
+        quiz_id = self.request.query_params.get("quiz")
+        course_id = self.request.query_params.get("course")
+        if quiz_id:
+            queryset = queryset.filter(quiz_id=quiz_id)
+        if course_id:
+            queryset = queryset.filter(quiz__course_id=course_id)
+        return queryset